@@ -1,9 +1,19 @@
+import asyncio
 import logging
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, BackgroundTasks, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
-from app.schemas.request import ProcessRequest
-from app.schemas.response import ProcessResponse
+from app.config import settings
+from app.exceptions.handlers import CatalogNotReadyError
+from app.schemas.request import ProcessRequest, RecommendRequest
+from app.schemas.response import JobStatusResponse, ProcessResponse, RecommendResponse
+from app.services.bulk_service import NDJSON_MEDIA_TYPE, bulk_batcher, open_bulk_stream, parse_bulk_body
+from app.services.job_manager import Job, JobState, job_manager
+from app.services.online_service import online_recommender
 from app.services.process_service import run_recommendation_process
 
 router = APIRouter(prefix="/engine", tags=["engine"])
@@ -15,11 +25,82 @@ logger = logging.getLogger(__name__)
     response_model=ProcessResponse,
     status_code=status.HTTP_202_ACCEPTED,
 )
-async def process(
-    request: ProcessRequest,
-    background_tasks: BackgroundTasks,
-) -> ProcessResponse:
-    """추천 연산을 트리거한다. 즉시 202를 반환하고 백그라운드에서 처리한다."""
+async def process(request: ProcessRequest) -> ProcessResponse:
+    """추천 연산을 트리거한다. 즉시 202를 반환하고 작업 대기열에서 처리한다.
+
+    같은 batch_id의 작업이 대기·실행 중이거나 이미 성공했다면 새로 실행하지 않고 기존 상태를 돌려준다.
+    """
     logger.info("Received process request: batch_id=%s", request.batch_id)
-    background_tasks.add_task(run_recommendation_process, request)
-    return ProcessResponse(batch_id=request.batch_id)
+    job, created = job_manager.submit(request, run_recommendation_process)
+    if created:
+        return ProcessResponse(batch_id=request.batch_id)
+    return ProcessResponse(
+        batch_id=request.batch_id,
+        status=job.state.value,
+        message="Duplicate batch_id; existing job returned",
+    )
+
+
+@router.post("/recommend", response_model=RecommendResponse)
+def recommend(request: RecommendRequest) -> RecommendResponse:
+    """사용자 한 명의 프로필로 미리 로드한 강의 카탈로그에서 바로 추천을 계산한다.
+
+    희소 행렬 연산·레벨 보정이 이벤트 루프를 막지 않도록 일반 함수로 두어 스레드풀에서 실행한다.
+    카탈로그가 아직 로드되지 않았으면 503을 반환한다.
+    """
+    return online_recommender.recommend(request)
+
+
+@router.post("/recommend/bulk", response_class=StreamingResponse)
+async def recommend_bulk(
+    request: Request,
+    top_k: int = Query(default=settings.DEFAULT_TOP_K, ge=1, le=100, description="사용자당 추천 개수"),
+) -> StreamingResponse:
+    """사용자 수백~수천 명의 추천을 계산해 사용자별 한 줄씩 NDJSON으로 흘려보낸다.
+
+    본문은 BulkRecommendRequest JSON이나 Arrow IPC stream(application/vnd.apache.arrow.stream,
+    배치 사용자 파일과 같은 컬럼)이다. 동시에 들어온 요청은 micro-batch로 묶여 함께 계산된다.
+    카탈로그가 아직 로드되지 않았으면 503, 첫 조각 계산이 실패하면 500을 반환한다.
+    스트림 도중 실패하면 남은 사용자 id를 담은 에러 줄로 끝난다.
+    """
+    if bulk_batcher.recommender.snapshot is None:
+        raise CatalogNotReadyError("Online course catalog is not loaded yet")
+
+    body = await request.body()
+    try:
+        users = await asyncio.to_thread(parse_bulk_body, body, request.headers.get("content-type", ""))
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from e
+
+    logger.info("Received bulk recommend request: %d users", users.num_rows)
+    return StreamingResponse(await open_bulk_stream(bulk_batcher, users, top_k), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/jobs/{batch_id}", response_model=JobStatusResponse)
+async def job_status(batch_id: str) -> JobStatusResponse:
+    """배치 작업의 상태·진행 단계·소요 시간을 조회한다."""
+    job = job_manager.get(batch_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found: {batch_id}")
+    return _job_status(job)
+
+
+def _job_status(job: Job) -> JobStatusResponse:
+    now = datetime.now(timezone.utc)
+    queued_until = job.started_at or job.finished_at or now
+    run_seconds = None
+    if job.started_at is not None:
+        run_seconds = ((job.finished_at or now) - job.started_at).total_seconds()
+    return JobStatusResponse(
+        batch_id=job.batch_id,
+        state=job.state.value,
+        stage=job.stage,
+        queue_position=job_manager.queue_position(job.batch_id) if job.state == JobState.QUEUED else None,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        queued_seconds=(queued_until - job.created_at).total_seconds(),
+        run_seconds=run_seconds,
+        result_file_path=job.result_file_path,
+        error_message=job.error_message,
+    )
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import tempfile
 from pathlib import Path
 
+import pandas as pd
 from fastapi import APIRouter, File, Query, UploadFile
 from fastapi.responses import JSONResponse
 
@@ -11,6 +13,7 @@ from app.core.filter import ExclusionFilter
 from app.core.pipeline import RecommendationPipeline
 from app.core.scorer import TfidfScorer
 from app.infra.loader import DatasetLoader
+from app.services.executor import get_pipeline_executor
 
 router = APIRouter(prefix="/engine", tags=["engine-test"])
 logger = logging.getLogger(__name__)
@@ -23,8 +26,6 @@ async def test_pipeline(
     top_k: int = Query(default=settings.DEFAULT_TOP_K, description="사용자당 추천 개수"),
 ):
     """R2 없이 파일을 직접 업로드하여 추천 결과를 확인하는 테스트 엔드포인트."""
-    loader = DatasetLoader()
-
     with tempfile.TemporaryDirectory() as tmp_dir:
         tmp_path = Path(tmp_dir)
 
@@ -34,15 +35,10 @@ async def test_pipeline(
         courses_path = tmp_path / courses_file.filename
         courses_path.write_bytes(await courses_file.read())
 
-        users_df = loader.load_users(users_path)
-        courses_df = loader.load_courses(courses_path)
-
-        pipeline = RecommendationPipeline(
-            scorer=TfidfScorer(),
-            filter_=ExclusionFilter(),
-            adjuster=LevelWeightAdjuster(settings.PENALTY_WEIGHTS),
+        loop = asyncio.get_running_loop()
+        result_df = await loop.run_in_executor(
+            get_pipeline_executor(), run_test_pipeline, users_path, courses_path, top_k
         )
-        result_df = pipeline.run(users_df, courses_df, top_k=top_k)
 
     recommendations = result_df.to_dict(orient="records")
 
@@ -52,3 +48,29 @@ async def test_pipeline(
         "top_k": top_k,
         "recommendations": recommendations,
     })
+
+
+def run_test_pipeline(users_path: Path, courses_path: Path, top_k: int) -> pd.DataFrame:
+    """파일을 로드해 파이프라인을 실행한다. 파이프라인 전용 프로세스에서 실행된다."""
+    loader = DatasetLoader(
+        arrow_lists=settings.LOADER_ARROW_LISTS,
+        compact_dtypes=settings.LOADER_COMPACT_DTYPES,
+    )
+    users_df = loader.load_users(users_path)
+    courses_df = loader.load_courses(courses_path)
+
+    adjuster = LevelWeightAdjuster(settings.PENALTY_WEIGHTS)
+    pipeline = RecommendationPipeline(
+        scorer=TfidfScorer(
+            top_n=settings.SCORER_TOP_N,
+            block_size=settings.SCORER_BLOCK_SIZE,
+            use_index=settings.SCORER_USE_INDEX,
+            rank_adjuster=adjuster,
+        ),
+        filter_=ExclusionFilter(),
+        adjuster=adjuster,
+        workers=settings.PIPELINE_WORKERS,
+        memory_budget_bytes=settings.pipeline_memory_budget_bytes,
+        overfetch=settings.PIPELINE_OVERFETCH,
+    )
+    return pipeline.run(users_df, courses_df, top_k=top_k)
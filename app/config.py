@@ -15,10 +15,62 @@ class Settings(BaseSettings):
     # 추천 엔진 설정
     PENALTY_WEIGHTS: list[float] = [0.00, 0.15, 0.50, 0.85]
     DEFAULT_TOP_K: int = 10
+    # 사용자당 유지할 스코어링 후보 수 (None이면 전체 쌍 계산). 제외 강의를 뺀 뒤 레벨 보정 후 점수 순으로
+    # 고르므로 top_k 이상이면 결과가 전체 계산과 같다
+    SCORER_TOP_N: int | None = None
+    SCORER_BLOCK_SIZE: int = 1_024
+    # top_n 후보를 태그 역색인 + max-score 가지치기로 찾는다 (SCORER_TOP_N 필요, 대형 카탈로그용)
+    SCORER_USE_INDEX: bool = False
+    # 사용자당 top_k + 제외 강의 수만큼만 후보를 받아 필터·보정한다 (보정으로 순위가 바뀔 수 있으면 자동으로 창을 넓힘)
+    PIPELINE_OVERFETCH: bool = False
+    # 카탈로그 버전별 IDF·강의 행렬 캐시 디렉토리 (None이면 배치마다 사용자+강의로 학습)
+    COURSE_MODEL_CACHE_DIR: str | None = None
+    COURSE_MODEL_CACHE_MAX_ENTRIES: int = 8
+    # 배치 로드·파이프라인·결과 업로드를 실행하는 전용 프로세스 수 (API 이벤트 루프와 분리)
+    PIPELINE_EXECUTOR_PROCESSES: int = 1
+    # 파싱된 입력 데이터셋 캐시 디렉토리 (R2 키 + ETag 기준, None이면 매번 다운로드·파싱)
+    DATASET_CACHE_DIR: str | None = None
+    DATASET_CACHE_MAX_MB: int = 4_096
+    DATASET_CACHE_MEMORY_ENTRIES: int = 4
+    # 온라인 추천(/engine/recommend)에 올려 둘 강의 카탈로그 R2 키 (None이면 온라인 추천 비활성)
+    ONLINE_CATALOG_KEY: str | None = None
+    # 온라인 카탈로그 ETag 확인 주기(초). 바뀌면 새 카탈로그로 역색인을 다시 만든다
+    ONLINE_CATALOG_POLL_SEC: float = 60.0
+    # bulk 추천(/engine/recommend/bulk) 요청을 micro-batch로 모으는 최대 대기 시간(ms)
+    BULK_MAX_WAIT_MS: float = 5.0
+    # micro-batch 하나의 최대 사용자 수 (더 큰 요청은 조각으로 나눠 처리)
+    BULK_MAX_BATCH_USERS: int = 4_096
+    # 청크 병렬 처리 워커 프로세스 수 (1이면 순차 처리)
+    PIPELINE_WORKERS: int = 1
+    # 파이프라인 메모리 예산(MB). 지정하면 강의 수·태그 밀도로 청크 크기를 정한다 (None이면 고정 청크)
+    PIPELINE_MEMORY_BUDGET_MB: int | None = None
+    # 리스트 컬럼을 Python list 대신 Arrow ListArray(ArrowDtype)로 로드
+    LOADER_ARROW_LISTS: bool = True
+    # id 컬럼을 categorical로, level을 int8로 줄여서 로드
+    LOADER_COMPACT_DTYPES: bool = True
+
+    # R2 전송 설정 (이 크기 이상이면 part 단위 multipart 전송, part별 동시 요청 수)
+    STORAGE_MULTIPART_CHUNK_MB: int = 8
+    STORAGE_MAX_CONCURRENCY: int = 10
+    # 동시에 받는 파일 수 (users + courses, 증분 실행이면 이전 users + 이전 결과까지 4개)
+    STORAGE_MAX_CONCURRENT_FILES: int = 4
+    # 프로세스 공유 S3 클라이언트의 커넥션 풀 크기 (동시 작업 수 × 파일 수 × part 동시 요청 수 이상 권장)
+    STORAGE_MAX_POOL_CONNECTIONS: int = 50
+    # 시작 시 버킷에 HEAD 요청을 보내 연결을 미리 맺을지 여부
+    STORAGE_PRECONNECT: bool = False
+
+    # 동시에 실행할 최대 배치 작업 수 (초과분은 FIFO 대기열), 보관할 종료 작업 이력 수
+    JOB_MAX_CONCURRENT: int = 1
+    JOB_HISTORY_SIZE: int = 1_000
 
     # 운영 설정
     LOG_LEVEL: str = "INFO"
+    # 콜백 시도 1회 타임아웃과 재시도 대기를 포함한 전체 예산
     CALLBACK_TIMEOUT_SEC: int = 30
+    CALLBACK_TOTAL_TIMEOUT_SEC: int = 90
+    # 콜백 공유 HTTP 클라이언트의 커넥션 풀 크기와 keep-alive 유지 시간
+    CALLBACK_MAX_CONNECTIONS: int = 20
+    CALLBACK_KEEPALIVE_SEC: float = 60.0
 
     @field_validator("PENALTY_WEIGHTS", mode="before")
     @classmethod
@@ -28,6 +80,23 @@ class Settings(BaseSettings):
             return json.loads(v)
         return v
 
+    @property
+    def pipeline_memory_budget_bytes(self) -> int | None:
+        """PIPELINE_MEMORY_BUDGET_MB를 바이트로 환산한다."""
+        if self.PIPELINE_MEMORY_BUDGET_MB is None:
+            return None
+        return self.PIPELINE_MEMORY_BUDGET_MB * 1024 * 1024
+
+    @property
+    def dataset_cache_max_bytes(self) -> int:
+        """DATASET_CACHE_MAX_MB를 바이트로 환산한다."""
+        return self.DATASET_CACHE_MAX_MB * 1024 * 1024
+
+    @property
+    def storage_multipart_chunk_bytes(self) -> int:
+        """STORAGE_MULTIPART_CHUNK_MB를 바이트로 환산한다."""
+        return self.STORAGE_MULTIPART_CHUNK_MB * 1024 * 1024
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
 from app.core.interfaces import BaseAdjuster
@@ -7,6 +8,27 @@ from app.core.interfaces import BaseAdjuster
 logger = logging.getLogger(__name__)
 
 DEFAULT_PENALTY_WEIGHTS = [0.00, 0.15, 0.50, 0.85]
+NUM_LEVELS = 4
+# 레벨은 int8 배열로 다루므로 표현할 수 있는 최댓값
+MAX_LEVEL = int(np.iinfo(np.int8).max)
+
+
+def level_codes(frame: pd.DataFrame) -> np.ndarray:
+    """level 컬럼을 행 위치에 정렬된 int8 배열로 반환한다.
+
+    Raises:
+        ValueError: level에 결측값이 있거나 int8 범위를 벗어난 값이 있을 때
+    """
+    levels = frame["level"]
+    if levels.dtype == np.int8:
+        return levels.to_numpy()
+    if levels.isna().any():
+        raise ValueError("level column has missing values")
+    values = levels.to_numpy()
+    info = np.iinfo(np.int8)
+    if len(values) and (values.min() < info.min or values.max() > info.max):
+        raise ValueError(f"level out of int8 range: [{values.min()}, {values.max()}]")
+    return values.astype(np.int8)
 
 
 class LevelWeightAdjuster(BaseAdjuster):
@@ -15,10 +37,31 @@ class LevelWeightAdjuster(BaseAdjuster):
     사용자 레벨과 강의 난이도의 차이에 따라 점수를 감점한다.
     diff 0 → 0.00, diff 1 → 0.15, diff 2 → 0.50, diff 3 → 0.85
     adjusted_score = raw_score * (1.0 - penalty)
+
+    (user_level, course_level) → (1.0 - penalty) 조회표를 미리 만들어 두고
+    int8 레벨 배열로 fancy indexing하여 적용한다.
     """
 
     def __init__(self, penalty_weights: list[float] | None = None) -> None:
         self._penalty_weights = penalty_weights or DEFAULT_PENALTY_WEIGHTS
+        self._multipliers = self._build_multipliers(NUM_LEVELS)
+
+    def _build_multipliers(self, num_levels: int) -> np.ndarray:
+        """num_levels × num_levels 크기의 (1.0 - penalty) 조회표를 만든다."""
+        weights = np.asarray(self._penalty_weights, dtype=np.float64)
+        levels = np.arange(num_levels)
+        level_diff = np.minimum(np.abs(levels[:, None] - levels[None, :]), len(weights) - 1)
+        return 1.0 - weights[level_diff]
+
+    def _multipliers_for(self, user_levels: np.ndarray, course_levels: np.ndarray) -> np.ndarray:
+        """레벨 배열을 모두 담을 수 있는 조회표를 반환한다."""
+        min_level = min(user_levels.min(initial=0), course_levels.min(initial=0))
+        if min_level < 0:
+            raise ValueError(f"level must be non-negative: {min_level}")
+        max_level = int(max(user_levels.max(initial=0), course_levels.max(initial=0)))
+        if max_level < len(self._multipliers):
+            return self._multipliers
+        return self._build_multipliers(max_level + 1)
 
     def adjust(
         self,
@@ -36,19 +79,55 @@ class LevelWeightAdjuster(BaseAdjuster):
         Returns:
             보정된 DataFrame[user_id, course_id, score]
         """
-        user_levels = users[["id", "level"]].rename(columns={"id": "user_id", "level": "user_level"})
-        course_levels = courses[["id", "level"]].rename(columns={"id": "course_id", "level": "course_level"})
-
-        merged = scores.merge(user_levels, on="user_id").merge(course_levels, on="course_id")
-        merged["level_diff"] = (merged["user_level"] - merged["course_level"]).abs()
+        user_idx = pd.Index(users["id"]).get_indexer(scores["user_id"])
+        course_idx = pd.Index(courses["id"]).get_indexer(scores["course_id"])
+        known = (user_idx >= 0) & (course_idx >= 0)
 
-        max_diff = len(self._penalty_weights) - 1
-        merged["level_diff"] = merged["level_diff"].clip(upper=max_diff)
-        merged["penalty"] = merged["level_diff"].map(
-            {i: w for i, w in enumerate(self._penalty_weights)}
+        adjusted = scores.loc[known, ["user_id", "course_id"]]
+        adjusted["score"] = self.apply_penalty(
+            scores["score"].to_numpy(dtype=np.float64)[known],
+            user_idx[known],
+            course_idx[known],
+            level_codes(users),
+            level_codes(courses),
         )
-        merged["score"] = merged["score"] * (1.0 - merged["penalty"])
-
-        adjusted = merged[["user_id", "course_id", "score"]]
         logger.info("LevelWeightAdjuster applied: %d pairs adjusted", len(adjusted))
         return adjusted.reset_index(drop=True)
+
+    def adjust_arrays(
+        self,
+        scores: np.ndarray,
+        user_idx: np.ndarray,
+        course_idx: np.ndarray,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+    ) -> np.ndarray:
+        """행 위치 인덱스로 레벨을 조회해 점수를 벡터 연산으로 보정한다.
+
+        Returns:
+            user_idx/course_idx와 같은 순서의 보정된 점수 배열
+        """
+        return self.apply_penalty(scores, user_idx, course_idx, level_codes(users), level_codes(courses))
+
+    def apply_penalty(
+        self,
+        scores: np.ndarray,
+        user_idx: np.ndarray,
+        course_idx: np.ndarray,
+        user_levels: np.ndarray,
+        course_levels: np.ndarray,
+    ) -> np.ndarray:
+        """multipliers[user_levels[user_idx], course_levels[course_idx]]를 점수에 곱한다.
+
+        Args:
+            scores: 쌍별 원점수
+            user_idx: 쌍별 사용자 행 위치
+            course_idx: 쌍별 강의 행 위치
+            user_levels: 사용자 행 위치에 정렬된 int8 레벨 배열
+            course_levels: 강의 행 위치에 정렬된 int8 레벨 배열
+
+        Returns:
+            보정된 점수 배열
+        """
+        multipliers = self._multipliers_for(user_levels, course_levels)
+        return scores * multipliers[user_levels[user_idx], course_levels[course_idx]]
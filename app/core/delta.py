@@ -0,0 +1,56 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.core.lists import to_list_array
+
+logger = logging.getLogger(__name__)
+
+# 추천 결과에 영향을 주는 사용자 프로필 컬럼
+PROFILE_COLUMNS = ["interest_tags", "level", "purchased_course_ids", "created_course_ids"]
+PROFILE_LIST_COLUMNS = ["interest_tags", "purchased_course_ids", "created_course_ids"]
+
+
+def profile_hashes(users: pd.DataFrame) -> np.ndarray:
+    """사용자 행마다 프로필 컬럼의 64비트 해시를 계산한다.
+
+    리스트 컬럼은 Python list·ArrowDtype 어느 쪽이든 원소를 이어 붙인 문자열로 바꿔 해시하므로
+    로더 설정(arrow_lists/compact_dtypes)이 달라도 같은 프로필이면 같은 값이 나온다.
+    원소 순서가 다르면 다른 프로필로 본다. 없는 컬럼은 빈 값으로 취급한다.
+    """
+    columns = {}
+    for col in PROFILE_COLUMNS:
+        if col not in users.columns:
+            columns[col] = np.full(len(users), "", dtype=object)
+        elif col in PROFILE_LIST_COLUMNS:
+            joined = pc.binary_join(to_list_array(users[col]).cast(pa.list_(pa.string())), ",")
+            columns[col] = pc.fill_null(joined, "").to_numpy(zero_copy_only=False)
+        else:
+            columns[col] = users[col].to_numpy().astype(np.int64)
+    return pd.util.hash_pandas_object(pd.DataFrame(columns), index=False).to_numpy()
+
+
+def changed_user_mask(users: pd.DataFrame, previous_users: pd.DataFrame) -> np.ndarray:
+    """이전 사용자 데이터와 비교해 다시 계산해야 하는 사용자 행을 표시한다.
+
+    Args:
+        users: 이번 배치 사용자 DataFrame
+        previous_users: 이전 결과를 만들 때 쓴 사용자 DataFrame
+
+    Returns:
+        users 행 위치에 정렬된 bool 배열 — 새로 생겼거나 프로필이 바뀐 사용자면 True
+    """
+    previous_pos = pd.Index(np.asarray(previous_users["id"], dtype=object)).get_indexer(
+        np.asarray(users["id"], dtype=object)
+    )
+    changed = previous_pos < 0
+    known = ~changed
+    if known.any():
+        current = profile_hashes(users)
+        previous = profile_hashes(previous_users)
+        changed[known] = current[known] != previous[previous_pos[known]]
+    logger.info("Delta: %d of %d users changed (%d new)", int(changed.sum()), len(users), int((previous_pos < 0).sum()))
+    return changed
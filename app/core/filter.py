@@ -1,11 +1,77 @@
 import logging
 
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 from app.core.interfaces import BaseFilter
+from app.core.lists import explode_list_column
 
 logger = logging.getLogger(__name__)
 
+EXCLUSION_COLUMNS = ["purchased_course_ids", "created_course_ids"]
+
+
+def build_exclusion_matrix(users: pd.DataFrame, course_ids: np.ndarray | pd.Index) -> sp.csr_matrix:
+    """purchased_course_ids + created_course_ids 리스트 컬럼으로 users × courses 제외 행렬을 만든다.
+
+    행은 users의 행 위치, 열은 course_ids의 위치다. 카탈로그에 없는 강의 id는 무시한다.
+    pd.Index를 넘기면 그 Index의 해시 테이블을 다시 만들지 않고 그대로 쓴다.
+
+    Returns:
+        제외 대상이면 True인 bool CSR 행렬 (열 인덱스 정렬, 중복 없음)
+    """
+    course_index = course_ids if isinstance(course_ids, pd.Index) else pd.Index(course_ids)
+    rows, cols = [], []
+    for col in EXCLUSION_COLUMNS:
+        if col not in users.columns:
+            continue
+        row_idx, values = explode_list_column(users[col])
+        positions = course_index.get_indexer(values)
+        known = positions >= 0
+        rows.append(row_idx[known])
+        cols.append(positions[known])
+
+    shape = (len(users), len(course_index))
+    if not rows:
+        return sp.csr_matrix(shape, dtype=bool)
+
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    matrix = sp.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=shape)
+    matrix.sum_duplicates()
+    return matrix
+
+
+def exclusion_keys(exclusions: sp.csr_matrix) -> np.ndarray:
+    """제외 행렬을 정렬된 row * num_courses + col 키 배열로 변환한다."""
+    exclusions.sort_indices()
+    rows = np.repeat(np.arange(exclusions.shape[0], dtype=np.int64), np.diff(exclusions.indptr))
+    return rows * exclusions.shape[1] + exclusions.indices
+
+
+def is_excluded(exclusions: sp.csr_matrix, user_idx: np.ndarray, course_idx: np.ndarray) -> np.ndarray:
+    """(user_idx, course_idx) 쌍이 제외 행렬에 포함되는지 이진 탐색으로 판정한다."""
+    keys = exclusion_keys(exclusions)
+    if len(keys) == 0:
+        return np.zeros(len(user_idx), dtype=bool)
+    pair_keys = np.asarray(user_idx, dtype=np.int64) * exclusions.shape[1] + course_idx
+    pos = np.minimum(np.searchsorted(keys, pair_keys), len(keys) - 1)
+    return keys[pos] == pair_keys
+
+
+def mask_block(block: np.ndarray, exclusions: sp.csr_matrix, row_start: int, fill_value: float = 0.0) -> None:
+    """dense 점수 블록에서 제외 대상 칸을 fill_value로 덮어쓴다 (in-place).
+
+    Args:
+        block: users[row_start:row_start + len(block)] × courses 점수 블록
+        exclusions: users × courses 제외 행렬
+        row_start: block 첫 행의 사용자 위치
+        fill_value: 제외 칸에 채울 값
+    """
+    sub = exclusions[row_start:row_start + block.shape[0]]
+    rows = np.repeat(np.arange(sub.shape[0]), np.diff(sub.indptr))
+    block[rows, sub.indices] = fill_value
+
 
 class ExclusionFilter(BaseFilter):
     """이미 구매했거나 본인이 만든 강의를 추천 후보에서 제거한다."""
@@ -20,29 +86,41 @@ class ExclusionFilter(BaseFilter):
         Returns:
             필터링된 DataFrame[user_id, course_id, score]
         """
-        exclusion_rows = []
-        for _, user in users.iterrows():
-            user_id = user["id"]
-            purchased = user.get("purchased_course_ids")
-            if purchased is None or (isinstance(purchased, float) and pd.isna(purchased)):
-                purchased = []
-            purchased = list(purchased)
-
-            created = user.get("created_course_ids")
-            if created is None or (isinstance(created, float) and pd.isna(created)):
-                created = []
-            created = list(created)
-            excluded = set(purchased) | set(created)
-            for course_id in excluded:
-                exclusion_rows.append({"user_id": user_id, "course_id": course_id})
-
-        if not exclusion_rows:
+        course_ids = pd.Index(scores["course_id"].unique())
+        exclusions = build_exclusion_matrix(users, course_ids)
+        if exclusions.nnz == 0:
             return scores
 
-        exclusion_df = pd.DataFrame(exclusion_rows)
-        merged = scores.merge(exclusion_df, on=["user_id", "course_id"], how="left", indicator=True)
-        filtered = merged[merged["_merge"] == "left_only"].drop(columns=["_merge"])
+        user_idx = pd.Index(users["id"]).get_indexer(scores["user_id"])
+        course_idx = course_ids.get_indexer(scores["course_id"])
+        known = user_idx >= 0
+        excluded = np.zeros(len(scores), dtype=bool)
+        excluded[known] = is_excluded(exclusions, user_idx[known], course_idx[known])
 
-        removed_count = len(scores) - len(filtered)
-        logger.info("ExclusionFilter removed %d pairs", removed_count)
+        filtered = scores[~excluded]
+        logger.info("ExclusionFilter removed %d pairs", int(excluded.sum()))
         return filtered.reset_index(drop=True)
+
+    def exclusion_matrix(self, users: pd.DataFrame, courses: pd.DataFrame) -> sp.csr_matrix:
+        """users × courses 제외 행렬을 만든다."""
+        return build_exclusion_matrix(users, courses["id"])
+
+    def mask(
+        self,
+        user_idx: np.ndarray,
+        course_idx: np.ndarray,
+        scores: np.ndarray,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> np.ndarray:
+        """제외 행렬에 포함된 (user, course) 쌍을 마스킹한다.
+
+        Returns:
+            유지할 쌍이면 True인 bool 배열
+        """
+        if exclusions is None:
+            exclusions = self.exclusion_matrix(users, courses)
+        keep = ~is_excluded(exclusions, user_idx, course_idx)
+        logger.info("ExclusionFilter masked %d pairs", len(keep) - int(keep.sum()))
+        return keep
@@ -0,0 +1,244 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+
+from app.core.filter import is_excluded
+
+logger = logging.getLogger(__name__)
+
+# (원점수, user_idx, course_idx) → 보정 점수. 점수를 키우지 않는(배수 ≤ 1) 보정만 허용한다.
+ScoreAdjust = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+# 부동소수점 오차로 경계 강의를 잘못 건너뛰지 않도록 임계값을 이만큼 낮춰 잡는다.
+_BOUND_EPSILON = 1e-9
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """[starts[i], ends[i]) 구간들을 펼쳐 (구간 번호, 위치) 배열로 반환한다."""
+    lengths = np.maximum(ends - starts, 0)
+    owner = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, starts[owner] + offsets
+
+
+@dataclass(frozen=True)
+class TagIndex:
+    """태그(어휘 열) → 강의 역색인.
+
+    태그마다 그 태그를 가진 강의의 posting을 TF-IDF 가중치 내림차순으로 저장하고,
+    태그별 최대 가중치(첫 posting)를 점수 상한 계산에 쓴다. 강의 행렬 nnz에 비례하는
+    크기라 카탈로그 버전마다 한 번 만들어 재사용한다.
+    """
+
+    indptr: np.ndarray
+    courses: np.ndarray
+    weights: np.ndarray
+    max_weights: np.ndarray
+    # 후보 쌍 정확 점수 계산용: 정렬된 course * num_terms + term 키와 그 가중치
+    course_keys: np.ndarray
+    course_weights: np.ndarray
+    num_courses: int
+
+    @property
+    def num_terms(self) -> int:
+        return len(self.indptr) - 1
+
+    @classmethod
+    def build(cls, course_matrix: sp.csr_matrix) -> "TagIndex":
+        """L2 정규화된 강의 × 태그 TF-IDF 행렬로 역색인을 만든다."""
+        course_matrix = course_matrix.tocsr()
+        if not course_matrix.has_sorted_indices:
+            course_matrix = course_matrix.sorted_indices()
+        num_courses, num_terms = course_matrix.shape
+
+        course_rows = np.repeat(np.arange(num_courses, dtype=np.int64), np.diff(course_matrix.indptr))
+        terms = course_matrix.indices.astype(np.int64)
+        order = np.lexsort((course_rows, -course_matrix.data, terms))
+
+        indptr = np.zeros(num_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=num_terms), out=indptr[1:])
+        weights = course_matrix.data[order]
+        max_weights = np.zeros(num_terms, dtype=np.float64)
+        nonempty = indptr[1:] > indptr[:-1]
+        max_weights[nonempty] = weights[indptr[:-1][nonempty]]
+
+        logger.info("Tag index built: %d tags, %d postings", num_terms, len(weights))
+        return cls(
+            indptr=indptr,
+            courses=course_rows[order],
+            weights=weights,
+            max_weights=max_weights,
+            course_keys=course_rows * num_terms + terms,
+            course_weights=course_matrix.data,
+            num_courses=num_courses,
+        )
+
+    def pair_scores(self, user_vectors: sp.csr_matrix, user_idx: np.ndarray, course_idx: np.ndarray) -> np.ndarray:
+        """(user_idx, course_idx) 쌍의 TF-IDF 내적(= 코사인 유사도)을 계산한다.
+
+        user_idx는 user_vectors의 행 위치다. 사용자 태그마다 강의 행렬 키를 이진 탐색한다.
+        """
+        pair, pos = _expand_ranges(user_vectors.indptr[user_idx], user_vectors.indptr[user_idx + 1])
+        if len(self.course_keys) == 0 or len(pair) == 0:
+            return np.zeros(len(user_idx), dtype=np.float64)
+        keys = course_idx[pair].astype(np.int64) * self.num_terms + user_vectors.indices[pos]
+        loc = np.minimum(np.searchsorted(self.course_keys, keys), len(self.course_keys) - 1)
+        hit = self.course_keys[loc] == keys
+        contrib = np.where(hit, user_vectors.data[pos] * self.course_weights[loc], 0.0)
+        return np.bincount(pair, weights=contrib, minlength=len(user_idx))
+
+    def search(
+        self,
+        user_vectors: sp.csr_matrix,
+        top_n: int | np.ndarray,
+        exclusions: sp.csr_matrix | None = None,
+        adjust: ScoreAdjust | None = None,
+        block_size: int = 1_024,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자마다 (보정 후) 점수 상위 top_n 강의를 max-score 가지치기로 찾는다.
+
+        1. 사용자 태그별 posting 앞부분 top_n개로 초기 후보를 만들고, 제외·보정을 적용한
+           top_n번째 점수를 임계값 θ로 삼는다 (실제 top_n번째 점수 이하이므로 안전하다).
+        2. 태그 t의 기여는 q_t * w(t, c), 나머지 태그 기여의 상한은 Σ_{s≠t} q_s * max_w(s)다.
+           q_t * w(t, c) + 나머지 상한 < θ인 posting은 그 태그로는 top_n에 들 수 없으므로,
+           가중치 내림차순 posting에서 이 조건을 만족하기 전까지의 앞부분만 후보로 모은다.
+           레벨 보정은 점수를 줄이기만 하므로 보정 후 θ와 비교해도 빠지는 정답은 없다.
+        3. 모은 후보의 정확한 점수를 계산해 보정 점수 기준 상위 top_n을 고른다.
+
+        Args:
+            user_vectors: L2 정규화된 사용자 × 태그 TF-IDF 행렬 (같은 어휘)
+            top_n: 사용자당 남길 후보 수. 배열이면 사용자별 후보 수로 보고, 0인 사용자는 건너뛴다.
+            exclusions: users × courses 제외 행렬 (제외 쌍은 후보에서 뺀다)
+            adjust: 후보 선정에 쓸 점수 보정 함수 (None이면 원점수 기준)
+            block_size: 한 번에 처리할 사용자 수
+
+        Returns:
+            (user_idx, course_idx, score) — 원점수(코사인 유사도), 양수 점수 쌍만 포함
+        """
+        user_vectors = user_vectors.tocsr()
+        num_users = user_vectors.shape[0]
+        limits = np.broadcast_to(np.asarray(top_n, dtype=np.int64), (num_users,))
+        user_parts, course_parts, score_parts = [], [], []
+        for start in range(0, num_users, block_size):
+            block = user_vectors[start:start + block_size]
+            block_limits = limits[start:start + block_size]
+            block_exclusions = exclusions[start:start + block_size] if exclusions is not None else None
+            rows = np.repeat(np.arange(block.shape[0]), np.diff(block.indptr))
+            terms, q = block.indices, block.data
+            upper = q * self.max_weights[terms]
+            rest = np.bincount(rows, weights=upper, minlength=block.shape[0])[rows] - upper
+
+            starts = self.indptr[terms]
+            seed_ends = np.minimum(starts + block_limits[rows], self.indptr[terms + 1])
+            seed = self._candidates(block, rows, starts, seed_ends, start, block_exclusions, adjust)
+            theta = self._nth_score(seed[0], seed[3], block.shape[0], block_limits)
+
+            # q * w ≥ θ - rest 를 만족하는 posting 앞부분의 끝 위치
+            required = (theta[rows] - rest) / q - _BOUND_EPSILON
+            ends = self.indptr[terms + 1].copy()
+            pruned = required > 0
+            ends[pruned] = self._prefix_end(terms[pruned], required[pruned])
+            ends[block_limits[rows] == 0] = starts[block_limits[rows] == 0]
+
+            cand_rows, cand_courses, cand_scores, cand_adjusted = self._candidates(
+                block, rows, self.indptr[terms], ends, start, block_exclusions, adjust
+            )
+            logger.debug("Tag index block %d: %d seed, %d candidates of %d postings",
+                         start, len(seed[0]), len(cand_rows), int(np.sum(self.indptr[terms + 1] - self.indptr[terms])))
+
+            # θ 미만 후보는 top_n에 들 수 없으므로 정렬 전에 버린다.
+            above = cand_adjusted >= theta[cand_rows]
+            cand_rows, cand_courses = cand_rows[above], cand_courses[above]
+            cand_scores, cand_adjusted = cand_scores[above], cand_adjusted[above]
+            order = np.lexsort((-cand_adjusted, cand_rows))
+            cand_rows, cand_courses, cand_scores = cand_rows[order], cand_courses[order], cand_scores[order]
+            keep = self._rank_in_group(cand_rows) < block_limits[cand_rows]
+            user_parts.append(cand_rows[keep] + start)
+            course_parts.append(cand_courses[keep])
+            score_parts.append(cand_scores[keep])
+
+        if not user_parts:
+            empty = np.array([], dtype=np.intp)
+            return empty, empty, np.array([], dtype=np.float64)
+        return np.concatenate(user_parts), np.concatenate(course_parts), np.concatenate(score_parts)
+
+    def _prefix_end(self, terms: np.ndarray, required: np.ndarray) -> np.ndarray:
+        """태그별 posting에서 가중치 ≥ required인 앞부분의 끝 위치를 이진 탐색한다."""
+        ends = np.empty(len(terms), dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        unique_terms, group_starts = np.unique(terms[order], return_index=True)
+        for term, sel in zip(unique_terms, np.split(order, group_starts[1:])):
+            lo, hi = self.indptr[term], self.indptr[term + 1]
+            # 내림차순 가중치를 뒤집은 -w는 오름차순이므로 -w ≤ -required 의 개수가 앞부분 길이다.
+            ends[sel] = lo + np.searchsorted(-self.weights[lo:hi], -required[sel], side="right")
+        return ends
+
+    def _candidates(
+        self,
+        block: sp.csr_matrix,
+        rows: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        offset: int,
+        exclusions: sp.csr_matrix | None,
+        adjust: ScoreAdjust | None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """posting 구간들의 기여를 (블록 행, 강의)별로 누적해 후보와 점수를 만든다.
+
+        사용자 태그의 posting을 끝까지 모두 읽은 행은 누적값이 곧 정확한 점수이고,
+        잘린 posting이 있는 행의 후보만 강의 행렬을 조회해 정확한 점수로 다시 계산한다.
+        exclusions는 블록 행 기준으로 잘라 둔 제외 행렬이고, offset은 블록의 첫 사용자 위치다.
+
+        Returns:
+            (블록 행, 강의, 원점수, 보정 점수)
+        """
+        owner, pos = _expand_ranges(starts, ends)
+        # COO → CSR 변환이 같은 (행, 강의)의 기여를 합치면서 중복을 없앤다.
+        accumulated = sp.csr_matrix(
+            (block.data[owner] * self.weights[pos], (rows[owner], self.courses[pos])),
+            shape=(block.shape[0], self.num_courses),
+        )
+        accumulated.sum_duplicates()
+        cand_rows = np.repeat(np.arange(block.shape[0]), np.diff(accumulated.indptr))
+        cand_courses = accumulated.indices.astype(np.int64)
+        scores = accumulated.data
+        if exclusions is not None and len(scores):
+            allowed = ~is_excluded(exclusions, cand_rows, cand_courses)
+            cand_rows, cand_courses, scores = cand_rows[allowed], cand_courses[allowed], scores[allowed]
+
+        truncated = np.zeros(block.shape[0], dtype=bool)
+        truncated[rows[ends < self.indptr[block.indices + 1]]] = True
+        partial = truncated[cand_rows]
+        if partial.any():
+            scores = scores.copy()
+            scores[partial] = self.pair_scores(block, cand_rows[partial], cand_courses[partial])
+
+        adjusted = scores
+        if adjust is not None and len(scores):
+            adjusted = adjust(scores, cand_rows + offset, cand_courses)
+            if np.any(adjusted > scores + _BOUND_EPSILON):
+                raise ValueError("Tag index search requires an adjustment that never increases scores")
+        return cand_rows, cand_courses, scores, adjusted
+
+    @classmethod
+    def _nth_score(cls, rows: np.ndarray, scores: np.ndarray, num_rows: int, n: int | np.ndarray) -> np.ndarray:
+        """행별 n번째로 큰 점수 (n이 배열이면 행별 순번). 후보가 n개 미만인 행은 0."""
+        theta = np.zeros(num_rows, dtype=np.float64)
+        order = np.lexsort((-scores, rows))
+        rows, scores = rows[order], scores[order]
+        nth = cls._rank_in_group(rows) == np.broadcast_to(n, (num_rows,))[rows] - 1
+        theta[rows[nth]] = scores[nth]
+        return theta
+
+    @staticmethod
+    def _rank_in_group(sorted_rows: np.ndarray) -> np.ndarray:
+        """정렬된 행 배열에서 각 원소의 행 안 순번(0부터)."""
+        if len(sorted_rows) == 0:
+            return np.array([], dtype=np.int64)
+        is_start = np.ones(len(sorted_rows), dtype=bool)
+        is_start[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        starts = np.flatnonzero(is_start)
+        return np.arange(len(sorted_rows)) - np.repeat(starts, np.diff(np.append(starts, len(sorted_rows))))
@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
+
+
+def _pair_index(user_ids: np.ndarray, course_ids: np.ndarray) -> pd.MultiIndex:
+    """(user_id, course_id) 쌍을 MultiIndex로 만든다."""
+    return pd.MultiIndex.from_arrays([user_ids, course_ids], names=["user_id", "course_id"])
 
 
 class BaseScorer(ABC):
@@ -19,6 +26,25 @@ class BaseScorer(ABC):
         """
         ...
 
+    def score_arrays(
+        self,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """유사도 점수를 행 위치 인덱스 배열로 계산한다.
+
+        기본 구현은 score() 결과의 id를 users/courses의 행 위치로 변환하며 exclusions는 무시한다.
+        exclusions를 지원하는 구현은 제외 쌍을 후보 선택 전에 마스킹할 수 있다.
+
+        Returns:
+            (user_idx, course_idx, score) — users/courses의 행 위치 기준
+        """
+        scores = self.score(users, courses)
+        user_idx = pd.Index(users["id"]).get_indexer(scores["user_id"])
+        course_idx = pd.Index(courses["id"]).get_indexer(scores["course_id"])
+        return user_idx, course_idx, scores["score"].to_numpy(dtype=np.float64)
+
 
 class BaseFilter(ABC):
     """추천 후보에서 제거해야 할 항목을 필터링하는 인터페이스."""
@@ -36,6 +62,33 @@ class BaseFilter(ABC):
         """
         ...
 
+    def exclusion_matrix(self, users: pd.DataFrame, courses: pd.DataFrame) -> sp.csr_matrix | None:
+        """users × courses 제외 행렬을 반환한다. 쌍 단위로 표현할 수 없는 필터는 None을 반환한다."""
+        return None
+
+    def mask(
+        self,
+        user_idx: np.ndarray,
+        course_idx: np.ndarray,
+        scores: np.ndarray,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> np.ndarray:
+        """행 위치 인덱스 배열에 하드 필터를 적용한다.
+
+        기본 구현은 apply() 결과에 남은 쌍을 다시 표시한다.
+        exclusions는 exclusion_matrix()로 미리 만든 행렬이다.
+
+        Returns:
+            유지할 쌍이면 True인 bool 배열
+        """
+        user_ids = users["id"].to_numpy()[user_idx]
+        course_ids = courses["id"].to_numpy()[course_idx]
+        frame = pd.DataFrame({"user_id": user_ids, "course_id": course_ids, "score": scores})
+        kept = self.apply(frame, users)
+        return _pair_index(user_ids, course_ids).isin(_pair_index(kept["user_id"], kept["course_id"]))
+
 
 class BaseAdjuster(ABC):
     """비즈니스 룰에 따라 점수를 보정하는 인터페이스."""
@@ -58,3 +111,31 @@ class BaseAdjuster(ABC):
             보정된 DataFrame[user_id, course_id, score]
         """
         ...
+
+    def adjust_arrays(
+        self,
+        scores: np.ndarray,
+        user_idx: np.ndarray,
+        course_idx: np.ndarray,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+    ) -> np.ndarray:
+        """행 위치 인덱스 배열 기준으로 점수를 보정한다.
+
+        기본 구현은 adjust() 결과를 원래 쌍 순서로 다시 정렬한다.
+        adjust()가 결과에서 뺀 쌍은 NaN으로 돌려주며, 파이프라인은 그 쌍을 후보에서 버린다.
+
+        Returns:
+            user_idx/course_idx와 같은 순서의 보정된 점수 배열
+        """
+        user_ids = users["id"].to_numpy()[user_idx]
+        course_ids = courses["id"].to_numpy()[course_idx]
+        frame = pd.DataFrame({"user_id": user_ids, "course_id": course_ids, "score": scores})
+        adjusted = self.adjust(frame, users, courses)
+        position = _pair_index(adjusted["user_id"], adjusted["course_id"]).get_indexer(
+            _pair_index(user_ids, course_ids)
+        )
+        result = np.full(len(position), np.nan)
+        found = position >= 0
+        result[found] = adjusted["score"].to_numpy(dtype=np.float64)[position[found]]
+        return result
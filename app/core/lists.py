@@ -0,0 +1,150 @@
+import ast
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def to_list_array(values: pd.Series | pa.Array | pa.ChunkedArray) -> pa.Array:
+    """리스트 컬럼을 Arrow ListArray로 변환한다. None/NaN 셀은 null로 취급한다."""
+    if isinstance(values, pa.ChunkedArray):
+        return values.combine_chunks()
+    if isinstance(values, pa.Array):
+        return values
+    array = pa.array(values, from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    if not is_list_type(array.type) and array.null_count == len(array):
+        # 값이 전부 비어 있는 컬럼(예: CSV의 빈 컬럼)은 null 리스트 컬럼으로 본다.
+        return pa.nulls(len(array), _EMPTY_LIST_TYPE)
+    return array
+
+
+def list_offsets_values(values: pd.Series | pa.Array | pa.ChunkedArray) -> tuple[np.ndarray, np.ndarray]:
+    """리스트 컬럼을 (offsets, flat_values) 배열로 분해한다. null 행은 빈 리스트로 취급한다.
+
+    Returns:
+        (offsets, flat_values) — offsets는 길이 n+1의 int64 배열
+    """
+    array = to_list_array(values)
+    lengths = pc.fill_null(pc.list_value_length(array), 0).to_numpy().astype(np.int64)
+    offsets = np.zeros(len(array) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets, pc.list_flatten(array).to_numpy(zero_copy_only=False)
+
+
+def explode_list_column(values: pd.Series | pa.Array | pa.ChunkedArray) -> tuple[np.ndarray, np.ndarray]:
+    """리스트 컬럼을 (행 위치, 원소) 평탄 배열 쌍으로 펼친다.
+
+    Returns:
+        (row_idx, flat_values) — 빈 리스트와 null 행은 원소를 만들지 않는다
+    """
+    array = to_list_array(values)
+    row_idx = pc.list_parent_indices(array).to_numpy().astype(np.int64)
+    flat_values = pc.list_flatten(array).to_numpy(zero_copy_only=False)
+    return row_idx, flat_values
+
+
+def is_list_type(data_type: pa.DataType) -> bool:
+    """Arrow 리스트 계열 타입인지 확인한다."""
+    return pa.types.is_list(data_type) or pa.types.is_large_list(data_type)
+
+
+def to_arrow_list_series(values: pd.Series) -> pd.Series:
+    """리스트 컬럼을 Arrow ListArray를 그대로 감싼 ArrowDtype Series로 변환한다."""
+    array = to_list_array(values)
+    return pd.Series(array, index=values.index, name=values.name, dtype=pd.ArrowDtype(array.type))
+
+
+_LIST_ELEMENT = r"""(?:-?\d+|'[^'",\\]*'|"[^'",\\]*")"""
+LIST_LITERAL_PATTERN = rf"^\[\s*(?:{_LIST_ELEMENT}\s*(?:,\s*{_LIST_ELEMENT}\s*)*,?\s*)?\]$"
+MAX_REPORTED_ROWS = 10
+_EMPTY_LIST_TYPE = pa.list_(pa.null())
+
+
+def parse_list_literals(values: pd.Series) -> pa.Array:
+    """`[1, 2]` / `['a', 'b']` 형식의 리스트 리터럴 문자열 컬럼을 Arrow ListArray로 파싱한다.
+
+    정수 또는 따옴표 문자열 원소만 있는 일반적인 셀은 Arrow compute로 한 번에 분리·변환하고,
+    패턴에 맞지 않는 셀(원소 안의 쉼표·이스케이프 등)만 ast.literal_eval로 따로 처리한다.
+    정수 리스트는 list<int64>, 문자열 리스트는 list<string>이 되며 None/NaN 셀은 null이다.
+
+    Raises:
+        ValueError: 리스트로 해석되지 않거나 원소 타입이 다른 행들과 다른 셀이 있을 때
+            (해당 행들을 모아서 한 번에 보고)
+    """
+    strings = pc.utf8_trim_whitespace(pa.array(values, type=pa.string(), from_pandas=True))
+    valid = strings.is_valid().to_numpy(zero_copy_only=False)
+    fast = pc.fill_null(pc.match_substring_regex(strings, LIST_LITERAL_PATTERN), False)
+    fast = fast.to_numpy(zero_copy_only=False)
+    fast_rows, slow_rows = np.flatnonzero(fast), np.flatnonzero(valid & ~fast)
+
+    parsed, bad = _split_list_literals(strings.take(pa.array(fast_rows, type=pa.int64())))
+    malformed = fast_rows[bad].tolist()
+
+    slow_values = []
+    for row in slow_rows:
+        try:
+            value = ast.literal_eval(strings[int(row)].as_py())
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            value = None
+        if isinstance(value, (list, tuple)):
+            slow_values.append(list(value))
+        else:
+            malformed.append(row)
+    slow = pa.array(slow_values) if slow_values else None
+
+    if slow is not None and slow.type != parsed.type:
+        if parsed.type == _EMPTY_LIST_TYPE or len(parsed) == 0:
+            parsed = parsed.cast(slow.type)
+        elif slow.type == _EMPTY_LIST_TYPE:
+            slow = slow.cast(parsed.type)
+        else:
+            malformed.extend(slow_rows)
+
+    if malformed:
+        labels = values.index[np.sort(malformed)[:MAX_REPORTED_ROWS]].tolist()
+        raise ValueError(f"{len(malformed)} malformed list literal rows (first rows: {labels})")
+
+    parts, order = [parsed], [fast_rows]
+    if slow is not None:
+        parts.append(slow)
+        order.append(slow_rows)
+    null_rows = np.flatnonzero(~valid)
+    parts.append(pa.nulls(len(null_rows), parsed.type))
+    order.append(null_rows)
+
+    positions = np.argsort(np.concatenate(order), kind="stable")
+    return pa.concat_arrays(parts).take(pa.array(positions))
+
+
+def _split_list_literals(strings: pa.Array) -> tuple[pa.Array, np.ndarray]:
+    """패턴 검증을 통과한 리스트 리터럴을 분리·변환한다.
+
+    Returns:
+        (ListArray, 다수와 다른 원소 타입이 섞인 행 위치 배열)
+    """
+    items = pc.split_pattern(pc.utf8_slice_codeunits(strings, 1, -1), ",")
+    offsets = items.offsets.to_numpy()
+    flat = pc.utf8_trim_whitespace(items.values)
+
+    # "[]"와 끝의 쉼표가 만드는 빈 원소는 버린다.
+    non_empty = pc.greater(pc.utf8_length(flat), 0).to_numpy(zero_copy_only=False)
+    offsets = np.concatenate([[0], np.cumsum(non_empty)])[offsets]
+    flat = flat.filter(pa.array(non_empty))
+    list_offsets = pa.array(offsets, type=pa.int32())
+
+    if len(flat) == 0:
+        return pa.ListArray.from_arrays(list_offsets, pa.nulls(0)), np.array([], dtype=np.int64)
+
+    quoted = pc.or_(pc.starts_with(flat, "'"), pc.starts_with(flat, '"')).to_numpy(zero_copy_only=False)
+    as_strings = quoted.sum() * 2 >= len(flat)
+    minority = ~quoted if as_strings else quoted
+    if minority.any():
+        rows = np.repeat(np.arange(len(strings)), np.diff(offsets))
+        bad = np.unique(rows[minority])
+        return pa.ListArray.from_arrays(list_offsets, pa.nulls(len(flat))), bad
+
+    flat = pc.utf8_slice_codeunits(flat, 1, -1) if as_strings else flat.cast(pa.int64())
+    return pa.ListArray.from_arrays(list_offsets, flat), np.array([], dtype=np.int64)
@@ -0,0 +1,135 @@
+import logging
+import resource
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.lists import list_offsets_values
+
+logger = logging.getLogger(__name__)
+
+MIN_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 200_000
+DENSE_SCORE_BYTES = 8
+PAIR_BYTES = 64
+USER_OVERHEAD_BYTES = 2_048
+SAFETY_FACTOR = 1.5
+ESTIMATE_SAMPLE_USERS = 10_000
+
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def current_rss_bytes() -> int:
+    """현재 프로세스의 RSS(바이트). /proc이 없으면 최대 RSS로 대신한다."""
+    value = _read_proc_status("VmRSS")
+    return value if value is not None else peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """마지막 reset_peak_rss() 이후 프로세스의 최대 RSS(바이트)."""
+    value = _read_proc_status("VmHWM")
+    if value is not None:
+        return value
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위다.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def reset_peak_rss() -> None:
+    """가능하면(Linux) 최대 RSS 기록을 현재 값으로 초기화한다."""
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        pass
+
+
+def _read_proc_status(field: str) -> int | None:
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def estimate_bytes_per_user(users: pd.DataFrame, courses: pd.DataFrame) -> int:
+    """강의 수와 태그 밀도로 사용자 한 명을 처리하는 데 필요한 메모리를 추정한다.
+
+    사용자 한 명당 강의 수만큼의 dense 점수 행과, 태그가 하나라도 겹칠 확률만큼의
+    (user_idx, course_idx, score) 후보 쌍 배열을 잡는다.
+    """
+    num_courses = len(courses)
+    if num_courses == 0:
+        return USER_OVERHEAD_BYTES
+
+    course_offsets, course_tags = list_offsets_values(courses["tags"])
+    sample = users["interest_tags"].iloc[:ESTIMATE_SAMPLE_USERS]
+    user_offsets, _ = list_offsets_values(sample)
+    vocab_size = len(np.unique(course_tags))
+    if vocab_size == 0:
+        overlap = 0.0
+    else:
+        course_density = min(course_offsets[-1] / num_courses / vocab_size, 1.0)
+        user_tags = user_offsets[-1] / max(len(sample), 1)
+        overlap = 1.0 - (1.0 - course_density) ** user_tags
+
+    per_user = num_courses * (DENSE_SCORE_BYTES + overlap * PAIR_BYTES) + USER_OVERHEAD_BYTES
+    return int(per_user * SAFETY_FACTOR)
+
+
+class ChunkSizer:
+    """메모리 예산 안에서 청크 크기를 정하고, 실측 RSS가 추정보다 크면 줄인다.
+
+    workers가 2 이상이면 예산을 워커 수로 나눠 워커 하나의 청크 크기를 정한다.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        workers: int = 1,
+        min_chunk_size: int = MIN_CHUNK_SIZE,
+        max_chunk_size: int = MAX_CHUNK_SIZE,
+    ) -> None:
+        if budget_bytes <= 0:
+            raise ValueError(f"budget_bytes must be positive: {budget_bytes}")
+        self._budget_bytes = budget_bytes
+        self._workers = max(workers, 1)
+        self._min_chunk_size = min_chunk_size
+        self._max_chunk_size = max_chunk_size
+        self._bytes_per_user = 0
+        self._available_bytes = 0
+        self.chunk_size = min_chunk_size
+
+    def plan(self, users: pd.DataFrame, courses: pd.DataFrame) -> int:
+        """현재 RSS를 제외한 예산과 사용자당 추정치로 초기 청크 크기를 정한다."""
+        self._bytes_per_user = estimate_bytes_per_user(users, courses)
+        self._available_bytes = (self._budget_bytes - current_rss_bytes()) // self._workers
+        if self._available_bytes <= 0:
+            logger.warning("Memory budget %d bytes is already used by the process; using minimum chunk size",
+                           self._budget_bytes)
+        self.chunk_size = self._fit(self._bytes_per_user)
+        logger.info("Chunk size planned: %d users (%d bytes/user estimated, %d bytes available per worker)",
+                    self.chunk_size, self._bytes_per_user, self._available_bytes)
+        return self.chunk_size
+
+    def observe(self, chunk_users: int, peak_delta_bytes: int) -> int:
+        """청크 하나의 실측 최대 RSS 증가량을 반영해 다음 청크 크기를 반환한다."""
+        if chunk_users <= 0:
+            return self.chunk_size
+        observed = peak_delta_bytes // chunk_users
+        if observed > self._bytes_per_user:
+            self._bytes_per_user = observed
+            new_size = self._fit(observed)
+            if new_size < self.chunk_size:
+                logger.warning("Peak RSS over estimate (%d bytes/user); shrinking chunk size %d -> %d",
+                               observed, self.chunk_size, new_size)
+                self.chunk_size = new_size
+        return self.chunk_size
+
+    def _fit(self, bytes_per_user: int) -> int:
+        size = self._available_bytes // max(bytes_per_user, 1)
+        return int(min(max(size, self._min_chunk_size), self._max_chunk_size))
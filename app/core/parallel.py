@@ -0,0 +1,228 @@
+import logging
+import multiprocessing
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy.sparse as sp
+
+from app.core.lists import list_offsets_values
+from app.core.vectorizer import CourseModel
+
+if TYPE_CHECKING:
+    from app.core.pipeline import RecommendationPipeline
+
+logger = logging.getLogger(__name__)
+
+ALIGNMENT = 64
+IN_FLIGHT_PER_WORKER = 2
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """공유 메모리 블록 안의 배열 하나의 위치·형태."""
+
+    dtype: str
+    shape: tuple[int, ...]
+    offset: int
+
+
+class SharedArrays:
+    """여러 NumPy 배열을 하나의 SharedMemory 블록에 담아 프로세스 간에 복사 없이 공유한다."""
+
+    def __init__(self, shm: SharedMemory, specs: dict[str, SharedArraySpec], owner: bool) -> None:
+        self._shm = shm
+        self._specs = specs
+        self._owner = owner
+
+    @classmethod
+    def create(cls, arrays: dict[str, np.ndarray]) -> "SharedArrays":
+        """배열들을 새 공유 메모리 블록에 복사한다. 생성한 프로세스가 unlink 책임을 진다."""
+        specs, offset = {}, 0
+        for key, array in arrays.items():
+            specs[key] = SharedArraySpec(array.dtype.str, array.shape, offset)
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+        shm = SharedMemory(create=True, size=max(offset, 1))
+        shared = cls(shm, specs, owner=True)
+        for key, array in arrays.items():
+            shared[key][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor: tuple[str, dict[str, SharedArraySpec]]) -> "SharedArrays":
+        """다른 프로세스가 만든 블록에 연결한다."""
+        name, specs = descriptor
+        # multiprocessing으로 띄운 워커는 부모의 resource_tracker를 공유하므로 별도 등록 해제가 필요 없다.
+        return cls(SharedMemory(name=name), specs, owner=False)
+
+    @property
+    def descriptor(self) -> tuple[str, dict[str, SharedArraySpec]]:
+        return self._shm.name, self._specs
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._specs
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        spec = self._specs[key]
+        return np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=self._shm.buf, offset=spec.offset)
+
+    def close(self) -> None:
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _ids_ipc(ids: pd.Series) -> np.ndarray:
+    """id 컬럼을 원래 타입 그대로 Arrow IPC stream 바이트로 직렬화한다."""
+    table = pa.Table.from_pandas(ids.to_frame("id"), preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return np.frombuffer(sink.getvalue(), dtype=np.uint8)
+
+
+def _string_as_arrow(data_type: pa.DataType) -> pd.ArrowDtype | None:
+    """문자열 id는 공유 메모리 버퍼를 그대로 감싸고, 나머지 타입은 pandas 메타데이터대로 복원한다."""
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return pd.ArrowDtype(data_type)
+    return None
+
+
+def share_courses(courses: pd.DataFrame, course_model: CourseModel | None) -> SharedArrays:
+    """강의 id·tags·level과 (있으면) CourseModel을 공유 메모리에 올린다.
+
+    id는 정수·categorical 등 원래 타입을 유지하도록 Arrow IPC로 담아, 병렬 결과의 course_id가
+    순차 실행 결과와 같은 값·타입이 되게 한다.
+    """
+    tag_offsets, tag_values = list_offsets_values(courses["tags"])
+
+    arrays = {
+        "ids": _ids_ipc(courses["id"]),
+        "tag_offsets": tag_offsets,
+        "tag_values": tag_values.astype(np.int64) if len(tag_values) else np.array([], dtype=np.int64),
+        "level": courses["level"].to_numpy().astype(np.int8),
+    }
+    if course_model is not None:
+        arrays.update({
+            "vocabulary": course_model.vocabulary,
+            "idf": course_model.idf,
+            "matrix_data": course_model.course_matrix.data,
+            "matrix_indices": course_model.course_matrix.indices,
+            "matrix_indptr": course_model.course_matrix.indptr,
+        })
+    return SharedArrays.create(arrays)
+
+
+def courses_from_shared(shared: SharedArrays, fingerprint: str | None) -> tuple[pd.DataFrame, CourseModel | None]:
+    """공유 메모리 블록에서 강의 DataFrame(Arrow 기반)과 CourseModel을 복사 없이 복원한다."""
+    ids = pa.ipc.open_stream(pa.py_buffer(shared["ids"])).read_all().to_pandas(types_mapper=_string_as_arrow)["id"]
+    num_courses = len(ids)
+    tags = pa.LargeListArray.from_arrays(pa.array(shared["tag_offsets"]), pa.array(shared["tag_values"]))
+    courses = pd.DataFrame({
+        "id": ids,
+        "tags": pd.Series(tags, dtype=pd.ArrowDtype(tags.type)),
+        "level": shared["level"],
+    })
+
+    course_model = None
+    if "matrix_data" in shared:
+        course_matrix = sp.csr_matrix(
+            (shared["matrix_data"], shared["matrix_indices"], shared["matrix_indptr"]),
+            shape=(num_courses, len(shared["vocabulary"])),
+            copy=False,
+        )
+        course_model = CourseModel(
+            fingerprint=fingerprint or "",
+            vocabulary=shared["vocabulary"],
+            idf=shared["idf"],
+            course_matrix=course_matrix,
+        )
+    return courses, course_model
+
+
+_worker_state: dict = {}
+
+
+def _init_worker(pipeline: "RecommendationPipeline", descriptor: tuple, fingerprint: str | None) -> None:
+    """워커 시작 시 공유 강의 데이터에 한 번 연결해 둔다."""
+    shared = SharedArrays.attach(descriptor)
+    courses, course_model = courses_from_shared(shared, fingerprint)
+    if course_model is not None:
+        pipeline = pipeline.with_course_model(course_model)
+    _worker_state.update(pipeline=pipeline, courses=courses, shared=shared)
+
+
+def _trim_categories(users: pd.DataFrame) -> pd.DataFrame:
+    """categorical 컬럼에서 청크에 쓰이지 않는 category를 뺀다.
+
+    users.iloc 슬라이스는 전체 category 사전을 그대로 들고 있어, 그대로 제출하면 태스크마다
+    전체 사용자 id가 pickle된다. remove_unused_categories는 사전 크기에 비례해 일하므로
+    청크의 codes만 보고 새 사전을 만든다.
+    """
+    trimmed = {}
+    for col in users.columns:
+        dtype = users[col].dtype
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        codes = users[col].cat.codes.to_numpy()
+        used = np.unique(codes[codes >= 0])
+        new_codes = np.where(codes >= 0, np.searchsorted(used, codes), -1)
+        trimmed[col] = pd.Categorical.from_codes(
+            new_codes, dtype=pd.CategoricalDtype(dtype.categories.take(used), ordered=dtype.ordered),
+        )
+    return users.assign(**trimmed) if trimmed else users
+
+
+def _run_chunk(users: pd.DataFrame, top_k: int) -> pd.DataFrame:
+    """워커에서 사용자 청크 하나를 처리한다."""
+    return _worker_state["pipeline"]._run_single(users, _worker_state["courses"], top_k)
+
+
+class ParallelChunkExecutor:
+    """사용자 청크를 프로세스 풀에서 병렬로 처리하고 결과를 청크 순서대로 돌려준다.
+
+    강의 데이터와 CourseModel은 공유 메모리로 한 번만 전달하고, 태스크마다
+    전달하는 것은 (쓰이는 category만 남긴) 사용자 청크뿐이다. 메모리 상한을 위해 워커당 최대
+    IN_FLIGHT_PER_WORKER개의 청크만 동시에 제출한다.
+    """
+
+    def __init__(self, workers: int) -> None:
+        if workers <= 0:
+            raise ValueError(f"workers must be positive: {workers}")
+        self._workers = workers
+
+    def run(
+        self,
+        pipeline: "RecommendationPipeline",
+        user_chunks: Iterator[pd.DataFrame],
+        courses: pd.DataFrame,
+        top_k: int,
+    ) -> Iterator[pd.DataFrame]:
+        """청크별 결과 DataFrame을 입력 순서대로 yield한다."""
+        course_model = pipeline.course_model
+        shared = share_courses(courses, course_model)
+        fingerprint = course_model.fingerprint if course_model is not None else None
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(pipeline.with_course_model(None), shared.descriptor, fingerprint),
+            ) as executor:
+                pending: deque[Future] = deque()
+                max_in_flight = self._workers * IN_FLIGHT_PER_WORKER
+                for chunk in user_chunks:
+                    pending.append(executor.submit(_run_chunk, _trim_categories(chunk), top_k))
+                    if len(pending) >= max_in_flight:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        finally:
+            shared.close()
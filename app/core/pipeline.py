@@ -1,19 +1,103 @@
 import gc
 import logging
+from collections.abc import Iterator
 
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
+from app.core.filter import build_exclusion_matrix
 from app.core.interfaces import BaseScorer, BaseFilter, BaseAdjuster
+from app.core.lists import explode_list_column
+from app.core.memory import ChunkSizer, current_rss_bytes, peak_rss_bytes, reset_peak_rss
+from app.core.parallel import ParallelChunkExecutor
+from app.core.vectorizer import CourseModel
 
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 50_000
+FALLBACK_BLOCK_SIZE = 65_536
+
+
+def top_k_per_user(
+    user_idx: np.ndarray,
+    course_idx: np.ndarray,
+    scores: np.ndarray,
+    top_k: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """사용자별 점수 내림차순 상위 top_k 쌍과 rank(1부터)를 반환한다.
+
+    결과는 user_idx 오름차순, 같은 사용자 안에서는 rank 순으로 정렬된다.
+    """
+    order = np.lexsort((-scores, user_idx))
+    user_idx, course_idx, scores = user_idx[order], course_idx[order], scores[order]
+
+    is_start = np.ones(len(user_idx), dtype=bool)
+    is_start[1:] = user_idx[1:] != user_idx[:-1]
+    starts = np.flatnonzero(is_start)
+    group_start = np.repeat(starts, np.diff(np.append(starts, len(user_idx))))
+    rank = np.arange(len(user_idx)) - group_start + 1
+
+    keep = rank <= top_k
+    return user_idx[keep], course_idx[keep], scores[keep], rank[keep]
+
+
+def first_open_slots(
+    blocked_counts: np.ndarray,
+    blocked_slots: np.ndarray,
+    need: np.ndarray,
+    num_slots: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """행마다 막히지 않은 슬롯(0, 1, 2, ...)을 앞에서부터 need개 고른다.
+
+    행 r의 답은 항상 앞쪽 need[r] + (막힌 슬롯 수)개 안에 있으므로, 행마다 그 길이의 창만
+    CSR처럼 offsets로 이어 붙인 평탄 배열에 펼친다. 막힌 슬롯이 많은 행이 있어도
+    다른 행의 창은 커지지 않아 메모리가 Σ(need + 막힌 슬롯 수)에 비례한다.
+
+    Args:
+        blocked_counts: 행별 막힌 슬롯 수 (blocked_slots를 행 순서로 나누는 길이)
+        blocked_slots: 행 순서로 이어 붙인 막힌 슬롯 위치
+        need: 행별로 고를 슬롯 수
+        num_slots: 전체 슬롯 수
+
+    Returns:
+        (row, slot, order) — order는 행 안에서 1부터 매긴 순번
+    """
+    windows = np.minimum(need + blocked_counts, num_slots)
+    offsets = np.zeros(len(windows) + 1, dtype=np.int64)
+    np.cumsum(windows, out=offsets[1:])
+
+    available = np.ones(int(offsets[-1]), dtype=bool)
+    blocked_rows = np.repeat(np.arange(len(windows)), blocked_counts)
+    inside = blocked_slots < windows[blocked_rows]
+    available[offsets[blocked_rows[inside]] + blocked_slots[inside]] = False
+
+    slot_rows = np.repeat(np.arange(len(windows)), windows)
+    taken = np.cumsum(available)
+    taken_before = np.concatenate([[0], taken])[offsets[:-1]]
+    order = taken - taken_before[slot_rows]
+    picked = np.flatnonzero(available & (order <= need[slot_rows]))
+    rows = slot_rows[picked]
+    return rows, picked - offsets[rows], order[picked]
+
+
+def _drop_unadjusted(
+    user_idx: np.ndarray, course_idx: np.ndarray, scores: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """adjust_arrays가 NaN으로 돌려준(보정기가 뺀) 쌍을 버린다."""
+    kept = ~np.isnan(scores)
+    if kept.all():
+        return user_idx, course_idx, scores
+    return user_idx[kept], course_idx[kept], scores[kept]
 
 
 class RecommendationPipeline:
     """추천 파이프라인 오케스트레이터.
 
     Scorer → Filter → Adjuster → Rank & Top-K 순서로 실행한다.
+
+    overfetch를 켜면 스코어러에서 사용자당 top_k + |제외 강의|개 후보만 받아 필터·보정을 적용하고,
+    레벨 보정으로 창 밖 강의가 순위에 들 수 있는 사용자만 창을 넓혀 다시 계산한다.
     """
 
     def __init__(
@@ -21,10 +105,32 @@ class RecommendationPipeline:
         scorer: BaseScorer,
         filter_: BaseFilter,
         adjuster: BaseAdjuster | None = None,
+        workers: int = 1,
+        memory_budget_bytes: int | None = None,
+        overfetch: bool = False,
     ) -> None:
+        if overfetch and not hasattr(scorer, "score_candidates"):
+            raise ValueError(f"{type(scorer).__name__} does not support over-fetch candidates")
         self._scorer = scorer
         self._filter = filter_
         self._adjuster = adjuster
+        self._workers = workers
+        self._memory_budget_bytes = memory_budget_bytes
+        self._overfetch = overfetch
+
+    @property
+    def course_model(self) -> CourseModel | None:
+        """스코어러가 사용하는 CourseModel (지원하지 않는 스코어러면 None)."""
+        return getattr(self._scorer, "course_model", None)
+
+    def with_course_model(self, course_model: CourseModel | None) -> "RecommendationPipeline":
+        """스코어러의 CourseModel만 바꾼 단일 프로세스 파이프라인을 반환한다."""
+        scorer = self._scorer
+        if hasattr(scorer, "with_course_model"):
+            scorer = scorer.with_course_model(course_model)
+        return RecommendationPipeline(
+            scorer=scorer, filter_=self._filter, adjuster=self._adjuster, overfetch=self._overfetch
+        )
 
     def run(
         self,
@@ -42,19 +148,45 @@ class RecommendationPipeline:
         Returns:
             DataFrame[user_id, course_id, score, rank]
         """
+        result = pd.concat(list(self.iter_results(users, courses, top_k)), ignore_index=True)
+        logger.info("Pipeline complete: %d recommendations for %d users",
+                     len(result), result["user_id"].nunique())
+        return result
+
+    def iter_results(
+        self,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        top_k: int = 10,
+        popularity_users: pd.DataFrame | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """추천 파이프라인을 실행하고 청크별 결과를 순서대로 yield한다.
+
+        각 청크 결과에는 fallback까지 적용되어 있으므로 바로 저장할 수 있다.
+        인기 강의 순위는 전체 사용자 기준으로 한 번만 계산한다.
+        popularity_users를 주면 (일부 사용자만 다시 계산할 때) 그 사용자들의 구매로 인기 순위를 낸다.
+
+        Yields:
+            DataFrame[user_id, course_id, score, rank]
+        """
         logger.info("Pipeline started: %d users, %d courses, top_k=%d", len(users), len(courses), top_k)
 
-        if len(users) > CHUNK_SIZE:
-            result = self._run_chunked(users, courses, top_k)
-        else:
-            result = self._run_single(users, courses, top_k)
+        sizer = None
+        chunk_size = CHUNK_SIZE
+        if self._memory_budget_bytes is not None:
+            sizer = ChunkSizer(self._memory_budget_bytes, workers=self._workers)
+            chunk_size = sizer.plan(users, courses)
 
-        # Fallback: top_k 미만인 사용자에게 인기 강의로 채움
-        result = self._apply_fallback(result, users, courses, top_k)
+        if len(users) > chunk_size:
+            chunks = self._iter_chunks(users, courses, top_k, chunk_size, sizer)
+        else:
+            chunks = iter([(users, self._run_single(users, courses, top_k))])
 
-        logger.info("Pipeline complete: %d recommendations for %d users",
-                     len(result), result["user_id"].nunique())
-        return result[["user_id", "course_id", "score", "rank"]]
+        popular = self._popular_courses(users if popularity_users is None else popularity_users, courses)
+        for user_chunk, result in chunks:
+            # Fallback: top_k 미만인 사용자에게 인기 강의로 채움
+            result = self._apply_fallback(result, user_chunk, courses, top_k, popular)
+            yield result[["user_id", "course_id", "score", "rank"]]
 
     def _run_single(
         self,
@@ -62,42 +194,141 @@ class RecommendationPipeline:
         courses: pd.DataFrame,
         top_k: int,
     ) -> pd.DataFrame:
-        """단일 배치로 파이프라인을 실행한다."""
-        scores = self._scorer.score(users, courses)
-        logger.info("Scoring complete: %d pairs", len(scores))
+        """단일 배치로 파이프라인을 실행한다.
 
-        scores = self._filter.apply(scores, users)
-        logger.info("Filtering complete: %d pairs remaining", len(scores))
+        점수·필터·보정·순위 계산은 행 위치 인덱스 배열 위에서 수행하고,
+        최종 top_k 행에 대해서만 DataFrame을 만든다.
+        """
+        exclusions = self._filter.exclusion_matrix(users, courses)
 
-        if self._adjuster is not None:
-            scores = self._adjuster.adjust(scores, users, courses)
-            logger.info("Adjustment complete")
+        if self._overfetch:
+            user_idx, course_idx, scores = self._score_overfetch(users, courses, top_k, exclusions)
+        else:
+            user_idx, course_idx, scores = self._scorer.score_arrays(users, courses, exclusions=exclusions)
+            logger.info("Scoring complete: %d pairs", len(scores))
+
+            keep = self._filter.mask(user_idx, course_idx, scores, users, courses, exclusions=exclusions)
+            user_idx, course_idx, scores = user_idx[keep], course_idx[keep], scores[keep]
+            logger.info("Filtering complete: %d pairs remaining", len(scores))
+
+            if self._adjuster is not None:
+                scores = self._adjuster.adjust_arrays(scores, user_idx, course_idx, users, courses)
+                user_idx, course_idx, scores = _drop_unadjusted(user_idx, course_idx, scores)
+                logger.info("Adjustment complete")
+
+        user_idx, course_idx, scores, rank = top_k_per_user(user_idx, course_idx, scores, top_k)
+        return pd.DataFrame({
+            "user_id": users["id"].to_numpy()[user_idx],
+            "course_id": courses["id"].to_numpy()[course_idx],
+            "score": scores,
+            "rank": rank,
+        })
+
+    def _score_overfetch(
+        self,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        top_k: int,
+        exclusions: sp.csr_matrix | None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자마다 원점수 상위 top_k + |제외 강의|개만 받아 필터·보정하고, 필요한 사용자만 창을 넓힌다.
 
-        scores = scores.sort_values(["user_id", "score"], ascending=[True, False])
-        scores["rank"] = scores.groupby("user_id").cumcount() + 1
-        return scores[scores["rank"] <= top_k].reset_index(drop=True)
+        보정은 점수를 줄이기만 하므로 창 밖 강의의 보정 점수는 창 안 최저 원점수를 넘지 못한다.
+        창이 꽉 찼는데 필터·보정 후 top_k번째 점수가 그 최저 원점수보다 낮은 사용자는
+        창 밖 강의가 순위에 들 수 있으므로 창을 두 배로 넓혀 다시 계산한다.
+        필터·보정 비용은 전체 쌍이 아니라 사용자 × 창 크기에 비례한다.
 
-    def _run_chunked(
+        Returns:
+            (user_idx, course_idx, 보정된 score)
+        """
+        num_users, num_courses = len(users), len(courses)
+        limits = np.full(num_users, top_k, dtype=np.int64)
+        if exclusions is not None:
+            limits += np.diff(exclusions.indptr)
+        limits = np.minimum(limits, num_courses)
+
+        user_parts, course_parts, score_parts = [], [], []
+        rounds = 0
+        while limits.any():
+            rounds += 1
+            user_idx, course_idx, raw = self._scorer.score_candidates(users, courses, limits, exclusions=exclusions)
+            counts = np.bincount(user_idx, minlength=num_users)
+            # 창 안 최저 원점수가 창 밖 강의 점수의 상한이다.
+            # 창이 꽉 차지 않은 사용자는 양수 점수 강의를 이미 모두 받았으므로 상한이 0이다.
+            floor = np.full(num_users, np.inf)
+            np.minimum.at(floor, user_idx, raw)
+            floor[counts < limits] = 0.0
+
+            keep = self._filter.mask(user_idx, course_idx, raw, users, courses, exclusions=exclusions)
+            user_idx, course_idx, raw = user_idx[keep], course_idx[keep], raw[keep]
+            scores = raw
+            if self._adjuster is not None:
+                scores = self._adjuster.adjust_arrays(raw, user_idx, course_idx, users, courses)
+                if np.any(scores > raw + 1e-9):
+                    raise ValueError("Over-fetch requires an adjuster that never increases scores")
+                user_idx, course_idx, scores = _drop_unadjusted(user_idx, course_idx, scores)
+
+            user_idx, course_idx, scores, rank = top_k_per_user(user_idx, course_idx, scores, top_k)
+            kth = np.zeros(num_users, dtype=np.float64)
+            at_k = rank == top_k
+            kth[user_idx[at_k]] = scores[at_k]
+            widen = (limits > 0) & (limits < num_courses) & (kth < floor)
+
+            done = ~widen[user_idx]
+            user_parts.append(user_idx[done])
+            course_parts.append(course_idx[done])
+            score_parts.append(scores[done])
+            limits = np.where(widen, np.minimum(limits * 2, num_courses), 0)
+
+        logger.info("Over-fetch scoring complete in %d rounds", rounds)
+        if not user_parts:
+            empty = np.array([], dtype=np.intp)
+            return empty, empty, np.array([], dtype=np.float64)
+        return np.concatenate(user_parts), np.concatenate(course_parts), np.concatenate(score_parts)
+
+    def _iter_chunks(
         self,
         users: pd.DataFrame,
         courses: pd.DataFrame,
         top_k: int,
-    ) -> pd.DataFrame:
-        """사용자를 청크 단위로 분할하여 파이프라인을 실행한다."""
-        num_chunks = (len(users) + CHUNK_SIZE - 1) // CHUNK_SIZE
-        logger.info("Chunked processing: %d users split into %d chunks", len(users), num_chunks)
+        chunk_size: int,
+        sizer: ChunkSizer | None = None,
+    ) -> Iterator[tuple[pd.DataFrame, pd.DataFrame]]:
+        """사용자를 청크 단위로 분할하여 파이프라인을 실행하고 (사용자 청크, 결과)를 yield한다.
+
+        workers가 2 이상이면 청크를 프로세스 풀에서 병렬로 처리하고 결과는 청크 순서대로 돌려준다.
+        순차 처리에서 sizer가 주어지면 청크마다 최대 RSS를 재서 다음 청크 크기를 줄일 수 있다.
+        """
+        logger.info("Chunked processing: %d users, chunk size %d", len(users), chunk_size)
+
+        if self._workers > 1:
+            user_chunks = (users.iloc[i:i + chunk_size] for i in range(0, len(users), chunk_size))
+            executor = ParallelChunkExecutor(self._workers)
+            for n, chunk_result in enumerate(executor.run(self, user_chunks, courses, top_k)):
+                start = n * chunk_size
+                user_chunk = users.iloc[start:start + chunk_size]
+                logger.info("Chunk %d processed: %d/%d users", n + 1, start + len(user_chunk), len(users))
+                yield user_chunk, chunk_result
+            return
+
+        start, n = 0, 0
+        while start < len(users):
+            user_chunk = users.iloc[start:start + chunk_size]
+            if sizer is not None:
+                reset_peak_rss()
+                baseline = current_rss_bytes()
 
-        chunks = []
-        for i in range(0, len(users), CHUNK_SIZE):
-            user_chunk = users.iloc[i:i + CHUNK_SIZE]
             chunk_result = self._run_single(user_chunk, courses, top_k)
-            chunks.append(chunk_result)
 
+            if sizer is not None:
+                chunk_size = sizer.observe(len(user_chunk), peak_rss_bytes() - baseline)
+            start += len(user_chunk)
+            n += 1
+            logger.info("Chunk %d processed: %d/%d users", n, start, len(users))
+
+            yield user_chunk, chunk_result
             del chunk_result
             gc.collect()
-            logger.info("Chunk %d/%d processed", (i // CHUNK_SIZE) + 1, num_chunks)
-
-        return pd.concat(chunks, ignore_index=True)
 
     def _apply_fallback(
         self,
@@ -105,63 +336,71 @@ class RecommendationPipeline:
         users: pd.DataFrame,
         courses: pd.DataFrame,
         top_k: int,
+        popular: np.ndarray | None = None,
     ) -> pd.DataFrame:
-        """추천이 top_k 미만인 사용자에게 인기 강의(구매 빈도 기반)로 채운다."""
-        all_user_ids = set(users["id"])
-        users_with_recs = set(result["user_id"]) if not result.empty else set()
-        user_rec_counts = result.groupby("user_id").size().to_dict() if not result.empty else {}
+        """추천이 top_k 미만인 사용자에게 인기 강의(구매 빈도 기반)로 채운다.
 
-        users_needing_fallback = {
-            uid for uid in all_user_ids
-            if user_rec_counts.get(uid, 0) < top_k
-        }
+        인기 순위는 한 번만 배열로 계산하고, 부족한 사용자들을 블록 단위로 묶어
+        사용자별 인기 상위 후보 창(부족분 + 차단 강의 수)에서 기존 추천·제외 강의를 빼고 앞에서부터 채운다.
+        popular를 주면 (청크 단위 호출 시 전체 사용자 기준) 그 순위를 그대로 쓴다.
+        """
+        num_users, num_courses = len(users), len(courses)
+        if num_users == 0 or num_courses == 0:
+            return result
+
+        user_pos = pd.Index(users["id"]).get_indexer(result["user_id"])
+        course_pos = pd.Index(courses["id"]).get_indexer(result["course_id"])
+        rec_counts = np.bincount(user_pos, minlength=num_users)
+        need = np.clip(top_k - rec_counts, 0, None)
+        needy = np.flatnonzero(need > 0)
 
-        if not users_needing_fallback:
+        if len(needy) == 0:
             return result
 
-        # 인기 강의 목록: 전체 사용자의 purchased_course_ids 빈도순
-        all_purchased = users["purchased_course_ids"].dropna().explode()
-        if all_purchased.empty:
-            popular_courses = courses["id"].tolist()
-        else:
-            popular_courses = all_purchased.value_counts().index.tolist()
-            remaining = [c for c in courses["id"] if c not in set(popular_courses)]
-            popular_courses.extend(remaining)
-
-        fallback_rows = []
-        for uid in users_needing_fallback:
-            current_count = user_rec_counts.get(uid, 0)
-            need = top_k - current_count
-
-            existing_courses = set(
-                result.loc[result["user_id"] == uid, "course_id"]
-            ) if current_count > 0 else set()
-
-            user_row = users.loc[users["id"] == uid].iloc[0]
-            purchased = user_row.get("purchased_course_ids")
-            purchased = list(purchased) if purchased is not None and not (isinstance(purchased, float) and pd.isna(purchased)) else []
-            created = user_row.get("created_course_ids")
-            created = list(created) if created is not None and not (isinstance(created, float) and pd.isna(created)) else []
-            excluded = set(purchased) | set(created)
-
-            added = 0
-            for course_id in popular_courses:
-                if added >= need:
-                    break
-                if course_id in existing_courses or course_id in excluded:
-                    continue
-                fallback_rows.append({
-                    "user_id": uid,
-                    "course_id": course_id,
-                    "score": 0.0,
-                    "rank": current_count + added + 1,
-                })
-                added += 1
-
-        if fallback_rows:
-            fallback_df = pd.DataFrame(fallback_rows)
+        if popular is None:
+            popular = self._popular_courses(users, courses)
+        pop_rank = np.empty(num_courses, dtype=np.int64)
+        pop_rank[popular] = np.arange(num_courses)
+
+        exclusions = self._filter.exclusion_matrix(users, courses)
+        if exclusions is None:
+            exclusions = build_exclusion_matrix(users, courses["id"])
+        existing = sp.csr_matrix(
+            (np.ones(len(user_pos), dtype=bool), (user_pos, course_pos)),
+            shape=(num_users, num_courses),
+        )
+        blocked = (exclusions + existing).tocsr()
+
+        user_parts, course_parts, rank_parts = [], [], []
+        for start in range(0, len(needy), FALLBACK_BLOCK_SIZE):
+            block_users = needy[start:start + FALLBACK_BLOCK_SIZE]
+            block_blocked = blocked[block_users]
+            # 인기 순위를 슬롯으로 보고 사용자마다 기존 추천·제외 강의를 뺀 앞쪽 강의를 고른다.
+            rows, slots, order = first_open_slots(
+                np.diff(block_blocked.indptr), pop_rank[block_blocked.indices], need[block_users], num_courses,
+            )
+            user_parts.append(block_users[rows])
+            course_parts.append(popular[slots])
+            rank_parts.append(rec_counts[block_users][rows] + order)
+
+        fill_users = np.concatenate(user_parts)
+        if len(fill_users) > 0:
+            fallback_df = pd.DataFrame({
+                "user_id": users["id"].to_numpy()[fill_users],
+                "course_id": courses["id"].to_numpy()[np.concatenate(course_parts)],
+                "score": 0.0,
+                "rank": np.concatenate(rank_parts),
+            })
             result = pd.concat([result, fallback_df], ignore_index=True)
             logger.info("Fallback applied: %d rows added for %d users",
-                         len(fallback_rows), len(users_needing_fallback))
+                         len(fallback_df), len(needy))
 
         return result
+
+    @staticmethod
+    def _popular_courses(users: pd.DataFrame, courses: pd.DataFrame) -> np.ndarray:
+        """강의 행 위치를 구매 빈도 내림차순(동률은 카탈로그 순)으로 정렬해 반환한다."""
+        _, purchased = explode_list_column(users["purchased_course_ids"])
+        positions = pd.Index(courses["id"]).get_indexer(purchased)
+        popularity = np.bincount(positions[positions >= 0], minlength=len(courses))
+        return np.argsort(-popularity, kind="stable")
@@ -1,22 +1,71 @@
+import copy
 import logging
 
 import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
+import scipy.sparse as sp
 from sklearn.metrics.pairwise import cosine_similarity
 
-from app.core.interfaces import BaseScorer
+from app.core.filter import mask_block
+from app.core.index import ScoreAdjust, TagIndex
+from app.core.interfaces import BaseAdjuster, BaseScorer
+from app.core.vectorizer import CourseModel, TagTfidfVectorizer
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BLOCK_SIZE = 1_024
+
 
 class TfidfScorer(BaseScorer):
     """TF-IDF 코사인 유사도 기반 스코어러.
 
     사용자의 interest_tags와 강의의 tags를 TF-IDF 벡터로 변환한 후
     코사인 유사도를 계산하여 추천 점수를 산출한다.
+
+    top_n을 지정하면 사용자를 block_size 단위로 나눠 sparse×sparse 곱을 수행하고
+    사용자당 상위 top_n 후보만 남긴다. 메모리는 users × courses가 아니라
+    block_size × courses + users × top_n에 비례한다.
+
+    course_model을 지정하면 카탈로그 기준으로 미리 학습한 IDF와 강의 행렬을 재사용하고
+    배치마다 사용자 태그만 변환한다.
+
+    use_index를 켜면 top_n 후보를 태그 → 강의 역색인(TagIndex)에서 max-score 가지치기로 찾는다.
+    사용자와 태그를 공유하지 않거나 점수 상한이 top_n 임계값에 못 미치는 강의는 계산하지 않으므로
+    강의가 많은 카탈로그에서도 사용자당 비용이 전체 강의 수에 비례하지 않는다.
+    rank_adjuster를 주면 top_n·역색인 어느 모드든 후보를 보정(레벨 패널티) 후 점수 기준으로 고른다.
+    반환하는 점수는 두 모드 모두 보정 전 원점수다.
     """
 
+    def __init__(
+        self,
+        top_n: int | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        course_model: CourseModel | None = None,
+        use_index: bool = False,
+        rank_adjuster: BaseAdjuster | None = None,
+    ) -> None:
+        if top_n is not None and top_n <= 0:
+            raise ValueError(f"top_n must be positive: {top_n}")
+        if use_index and top_n is None:
+            raise ValueError("use_index requires top_n")
+        if block_size <= 0:
+            raise ValueError(f"block_size must be positive: {block_size}")
+        self._top_n = top_n
+        self._block_size = block_size
+        self._course_model = course_model
+        self._use_index = use_index
+        self._rank_adjuster = rank_adjuster
+
+    @property
+    def course_model(self) -> CourseModel | None:
+        return self._course_model
+
+    def with_course_model(self, course_model: CourseModel | None) -> "TfidfScorer":
+        """같은 설정에 course_model만 바꾼 스코어러를 반환한다."""
+        scorer = copy.copy(self)
+        scorer._course_model = course_model
+        return scorer
+
     def score(self, users: pd.DataFrame, courses: pd.DataFrame) -> pd.DataFrame:
         """사용자-강의 간 TF-IDF 코사인 유사도 점수를 계산한다.
 
@@ -27,23 +76,10 @@ class TfidfScorer(BaseScorer):
         Returns:
             DataFrame[user_id, course_id, score]
         """
-        user_docs = users["interest_tags"].apply(self._tags_to_text)
-        course_docs = courses["tags"].apply(self._tags_to_text)
-
-        all_docs = pd.concat([user_docs, course_docs], ignore_index=True)
-        vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(all_docs)
+        user_idx, course_idx, scores = self.score_arrays(users, courses)
 
-        user_vectors = tfidf_matrix[: len(users)]
-        course_vectors = tfidf_matrix[len(users) :]
-
-        sim_matrix = cosine_similarity(user_vectors, course_vectors)
-
-        user_ids = users["id"].values
-        course_ids = courses["id"].values
-
-        user_idx, course_idx = np.where(sim_matrix > 0)
-        scores = sim_matrix[user_idx, course_idx]
+        user_ids = users["id"].to_numpy()
+        course_ids = courses["id"].to_numpy()
 
         result = pd.DataFrame({
             "user_id": user_ids[user_idx],
@@ -54,9 +90,161 @@ class TfidfScorer(BaseScorer):
         logger.info("TF-IDF scoring complete: %d user-course pairs", len(result))
         return result
 
+    def score_arrays(
+        self,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자-강의 간 코사인 유사도 점수를 행 위치 인덱스 배열로 계산한다.
+
+        exclusions가 주어지면 제외 쌍의 점수를 0으로 덮어써 후보에서 뺀다.
+        top_n 모드에서는 top_n 자리가 제외 강의로 낭비되지 않는다.
+
+        Returns:
+            (user_idx, course_idx, score) — 양수 점수 쌍만 포함
+        """
+        user_vectors, course_vectors = self._vectorize(users, courses)
+
+        if self._top_n is None:
+            return self._score_exhaustive(user_vectors, course_vectors, exclusions)
+        if self._use_index:
+            return self._score_index(user_vectors, course_vectors, users, courses, exclusions)
+        return self._score_top_n(
+            user_vectors, course_vectors, self._top_n, exclusions, self._rank_adjust(users, courses),
+        )
+
+    def _vectorize(self, users: pd.DataFrame, courses: pd.DataFrame) -> tuple[sp.csr_matrix, sp.csr_matrix]:
+        """사용자·강의 태그를 L2 정규화된 TF-IDF 행렬로 변환한다."""
+        if self._course_model is not None:
+            if self._course_model.num_courses != len(courses):
+                raise ValueError(
+                    f"Course model has {self._course_model.num_courses} courses, got {len(courses)}"
+                )
+            user_vectors = self._course_model.vectorizer().transform(users["interest_tags"])
+            return user_vectors, self._course_model.course_matrix
+
+        user_vectors, course_vectors = TagTfidfVectorizer().fit_transform(users["interest_tags"], courses["tags"])
+        return user_vectors, course_vectors
+
     @staticmethod
-    def _tags_to_text(tags: list[int]) -> str:
-        """태그 ID 리스트를 공백 구분 문자열로 변환한다."""
-        if tags is None or (isinstance(tags, float) and np.isnan(tags)):
-            return ""
-        return " ".join(f"tag_{t}" for t in tags)
+    def _score_exhaustive(
+        user_vectors: sp.csr_matrix,
+        course_vectors: sp.csr_matrix,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """전체 users × courses 유사도 행렬에서 양수 점수 쌍을 모두 반환한다."""
+        sim_matrix = cosine_similarity(user_vectors, course_vectors)
+        if exclusions is not None:
+            mask_block(sim_matrix, exclusions, 0)
+        user_idx, course_idx = np.where(sim_matrix > 0)
+        return user_idx, course_idx, sim_matrix[user_idx, course_idx]
+
+    def _score_index(
+        self,
+        user_vectors: sp.csr_matrix,
+        course_vectors: sp.csr_matrix,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """태그 역색인에서 사용자당 상위 top_n 양수 점수 쌍을 반환한다."""
+        adjust = self._rank_adjust(users, courses)
+        return self._index(course_vectors).search(user_vectors, self._top_n, exclusions, adjust, self._block_size)
+
+    def _index(self, course_vectors: sp.csr_matrix) -> TagIndex:
+        """course_model이 있으면 카탈로그 버전마다 한 번 만든 역색인을 재사용한다."""
+        if self._course_model is not None:
+            return self._course_model.index
+        return TagIndex.build(course_vectors)
+
+    def _rank_adjust(self, users: pd.DataFrame, courses: pd.DataFrame) -> ScoreAdjust | None:
+        """rank_adjuster로 후보 선정용 점수 보정 함수를 만든다 (없으면 None)."""
+        if self._rank_adjuster is None:
+            return None
+        adjuster = self._rank_adjuster
+
+        def adjust(scores: np.ndarray, user_idx: np.ndarray, course_idx: np.ndarray) -> np.ndarray:
+            # 보정기가 뺀 쌍(NaN)은 어느 양수 쌍보다도 뒤로 보낸다. 파이프라인이 보정 단계에서 버린다.
+            return np.nan_to_num(adjuster.adjust_arrays(scores, user_idx, course_idx, users, courses), nan=-1.0)
+
+        return adjust
+
+    def score_candidates(
+        self,
+        users: pd.DataFrame,
+        courses: pd.DataFrame,
+        limits: np.ndarray,
+        exclusions: sp.csr_matrix | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자마다 원점수 상위 limits[u]개 양수 점수 쌍을 반환한다 (over-fetch 후보 생성용).
+
+        top_n 설정과 무관하게 원점수 순으로 고르므로, 돌려준 후보 중 가장 낮은 점수가
+        돌려주지 않은 강의 점수의 상한이 된다. limits가 0인 사용자는 계산하지 않는다.
+        use_index를 켜면 dense 블록 곱 대신 역색인에서 사용자별 limits개를 찾는다.
+        IDF가 사용자 구성에 따라 바뀌지 않도록 벡터화는 항상 전체 users로 한다.
+
+        Returns:
+            (user_idx, course_idx, score) — users/courses 행 위치 기준
+        """
+        user_vectors, course_vectors = self._vectorize(users, courses)
+        if self._use_index:
+            return self._index(course_vectors).search(user_vectors, np.asarray(limits), exclusions,
+                                                      block_size=self._block_size)
+        return self._score_top_n(user_vectors, course_vectors, np.asarray(limits), exclusions)
+
+    def _score_top_n(
+        self,
+        user_vectors: sp.csr_matrix,
+        course_vectors: sp.csr_matrix,
+        top_n: int | np.ndarray,
+        exclusions: sp.csr_matrix | None = None,
+        adjust: ScoreAdjust | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """사용자 블록 단위 sparse 곱으로 사용자당 상위 top_n 양수 점수 쌍을 반환한다.
+
+        TF-IDF 벡터는 이미 L2 정규화되어 있으므로 내적이 곧 코사인 유사도다.
+        top_n이 배열이면 사용자별 후보 수로 보고, 0인 사용자는 건너뛴다.
+        adjust가 있으면 양수 점수 쌍을 보정한 값으로 상위 후보를 고르고, 반환 점수는 원점수로 둔다.
+        """
+        num_users, num_courses = user_vectors.shape[0], course_vectors.shape[0]
+        course_t = course_vectors.T.tocsr()
+        limits = np.minimum(np.broadcast_to(top_n, (num_users,)), num_courses)
+        active = np.flatnonzero(limits > 0)
+
+        user_parts, course_parts, score_parts = [], [], []
+        for start in range(0, len(active), self._block_size):
+            block_users = active[start:start + self._block_size]
+            block = (user_vectors[block_users] @ course_t).toarray()
+            if exclusions is not None:
+                mask_block(block, exclusions[block_users], 0)
+            rank_block = block
+            if adjust is not None:
+                # 점수 0인 쌍이 보정 후 0이 된 양수 쌍보다 앞서지 않도록 -1로 둔다.
+                rows, cols = np.nonzero(block > 0)
+                rank_block = np.full_like(block, -1.0)
+                rank_block[rows, cols] = adjust(block[rows, cols], block_users[rows], cols)
+            block_limits = limits[block_users]
+            n = int(block_limits.max())
+            if n < num_courses:
+                cand = np.argpartition(-rank_block, n - 1, axis=1)[:, :n]
+            else:
+                cand = np.broadcast_to(np.arange(num_courses), block.shape)
+            vals = np.take_along_axis(block, cand, axis=1)
+            keep = vals > 0
+            if (block_limits < n).any():
+                # 사용자별 후보 수가 다르면 (보정) 점수 순으로 정렬해 앞에서 limits개만 남긴다.
+                order = np.argsort(-np.take_along_axis(rank_block, cand, axis=1), axis=1, kind="stable")
+                cand, vals = np.take_along_axis(cand, order, axis=1), np.take_along_axis(vals, order, axis=1)
+                keep = (vals > 0) & (np.arange(n) < block_limits[:, None])
+            rows, cols = np.nonzero(keep)
+
+            user_parts.append(block_users[rows])
+            course_parts.append(cand[rows, cols])
+            score_parts.append(vals[rows, cols])
+
+        if not user_parts:
+            empty = np.array([], dtype=np.intp)
+            return empty, empty, np.array([], dtype=np.float64)
+
+        return np.concatenate(user_parts), np.concatenate(course_parts), np.concatenate(score_parts)
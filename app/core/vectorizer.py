@@ -0,0 +1,141 @@
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from app.core.index import TagIndex
+from app.core.lists import explode_list_column
+
+logger = logging.getLogger(__name__)
+
+TagColumn = pd.Series | pa.Array | pa.ChunkedArray
+
+
+class TagTfidfVectorizer:
+    """정수 태그 ID 리스트에서 바로 TF-IDF 행렬을 만드는 벡터라이저.
+
+    태그를 "tag_1" 같은 문자열로 만들고 정규식으로 다시 토큰화하는 대신
+    Arrow 리스트 컬럼의 평탄 값 배열로 CSR 단어 빈도 행렬을 만든다.
+    sklearn TfidfVectorizer 기본값(smooth_idf=True, sublinear_tf=False, norm="l2")과
+    같은 값을 낸다. 열 순서는 태그 ID 오름차순이다.
+    """
+
+    def __init__(self) -> None:
+        self.vocabulary_: np.ndarray | None = None
+        self.idf_: np.ndarray | None = None
+
+    @classmethod
+    def from_params(cls, vocabulary: np.ndarray, idf: np.ndarray) -> "TagTfidfVectorizer":
+        """이미 학습된 어휘와 IDF로 벡터라이저를 복원한다."""
+        vectorizer = cls()
+        vectorizer.vocabulary_ = vocabulary
+        vectorizer.idf_ = idf
+        return vectorizer
+
+    def fit(self, *tag_columns: TagColumn) -> "TagTfidfVectorizer":
+        """여러 태그 컬럼을 하나의 문서 집합으로 보고 어휘와 IDF를 학습한다."""
+        self.fit_transform(*tag_columns)
+        return self
+
+    def fit_transform(self, *tag_columns: TagColumn) -> list[sp.csr_matrix]:
+        """어휘와 IDF를 학습하고 컬럼별 TF-IDF 행렬을 반환한다.
+
+        Args:
+            tag_columns: 문서 하나당 태그 ID 리스트 하나인 리스트 컬럼들
+
+        Returns:
+            입력 컬럼 순서대로 L2 정규화된 TF-IDF CSR 행렬 리스트
+        """
+        exploded = [explode_list_column(tags) for tags in tag_columns]
+        values = [self._as_int(flat) for _, flat in exploded]
+        self.vocabulary_ = np.unique(np.concatenate(values)) if values else np.array([], dtype=np.int64)
+
+        counts = [
+            self._count_matrix(row_idx, flat, len(tags))
+            for (row_idx, _), flat, tags in zip(exploded, values, tag_columns)
+        ]
+
+        num_terms = len(self.vocabulary_)
+        df = np.zeros(num_terms, dtype=np.int64)
+        for matrix in counts:
+            df += np.bincount(matrix.indices, minlength=num_terms)
+        n_samples = sum(matrix.shape[0] for matrix in counts)
+
+        # sklearn TfidfTransformer(smooth_idf=True)와 같은 식: ln((1 + n) / (1 + df)) + 1
+        self.idf_ = np.log(float(n_samples + 1) / (df + 1)) + 1.0
+        return [self._weight(matrix) for matrix in counts]
+
+    def transform(self, tags: TagColumn) -> sp.csr_matrix:
+        """학습된 어휘와 IDF로 태그 컬럼을 TF-IDF 행렬로 변환한다. 어휘에 없는 태그는 무시한다."""
+        if self.vocabulary_ is None or self.idf_ is None:
+            raise ValueError("TagTfidfVectorizer is not fitted")
+        row_idx, flat = explode_list_column(tags)
+        return self._weight(self._count_matrix(row_idx, self._as_int(flat), len(tags)))
+
+    def _count_matrix(self, row_idx: np.ndarray, flat: np.ndarray, num_docs: int) -> sp.csr_matrix:
+        """(행 위치, 태그 ID) 배열로 문서 × 어휘 빈도 CSR 행렬을 만든다."""
+        cols = np.searchsorted(self.vocabulary_, flat)
+        known = cols < len(self.vocabulary_)
+        known[known] = self.vocabulary_[cols[known]] == flat[known]
+
+        matrix = sp.csr_matrix(
+            (np.ones(int(known.sum()), dtype=np.float64), (row_idx[known], cols[known])),
+            shape=(num_docs, len(self.vocabulary_)),
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    def _weight(self, counts: sp.csr_matrix) -> sp.csr_matrix:
+        """빈도 행렬에 IDF를 곱하고 행 단위 L2 정규화한다."""
+        weighted = counts.copy()
+        weighted.data *= self.idf_[weighted.indices]
+        return normalize(weighted, norm="l2", copy=False)
+
+    @staticmethod
+    def _as_int(flat: np.ndarray) -> np.ndarray:
+        """평탄 태그 배열을 int64로 변환한다 (빈 list<null> 컬럼 포함)."""
+        if len(flat) == 0:
+            return np.array([], dtype=np.int64)
+        return flat.astype(np.int64, copy=False)
+
+
+@dataclass(frozen=True)
+class CourseModel:
+    """강의 카탈로그 한 버전에 대해 학습한 IDF와 정규화된 강의 행렬."""
+
+    fingerprint: str
+    vocabulary: np.ndarray
+    idf: np.ndarray
+    course_matrix: sp.csr_matrix
+
+    @property
+    def num_courses(self) -> int:
+        return self.course_matrix.shape[0]
+
+    def vectorizer(self) -> TagTfidfVectorizer:
+        """이 모델의 어휘·IDF로 사용자 태그를 변환하는 벡터라이저를 반환한다."""
+        return TagTfidfVectorizer.from_params(self.vocabulary, self.idf)
+
+    @cached_property
+    def index(self) -> TagIndex:
+        """강의 행렬의 태그 → 강의 역색인. 처음 접근할 때 한 번 만든다."""
+        return TagIndex.build(self.course_matrix)
+
+
+def build_course_model(courses: pd.DataFrame, fingerprint: str) -> CourseModel:
+    """강의 tags만으로 IDF를 학습해 CourseModel을 만든다. 배치 사용자 구성과 무관하다."""
+    vectorizer = TagTfidfVectorizer()
+    (course_matrix,) = vectorizer.fit_transform(courses["tags"])
+    logger.info("Course model built: fingerprint=%s, %d courses, %d tags",
+                fingerprint, course_matrix.shape[0], len(vectorizer.vocabulary_))
+    return CourseModel(
+        fingerprint=fingerprint,
+        vocabulary=vectorizer.vocabulary_,
+        idf=vectorizer.idf_,
+        course_matrix=course_matrix,
+    )
@@ -30,6 +30,10 @@ class ScoringError(Exception):
         super().__init__(message)
 
 
+class CatalogNotReadyError(Exception):
+    """온라인 추천용 강의 카탈로그가 아직 로드되지 않음."""
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     """FastAPI 앱에 커스텀 예외 핸들러를 등록한다."""
 
@@ -47,3 +51,8 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def scoring_error_handler(request: Request, exc: ScoringError) -> JSONResponse:
         logger.error("ScoringError [batch_id=%s]: %s", exc.batch_id, exc)
         return JSONResponse(status_code=500, content={"error": "SCORING_ERROR", "detail": str(exc)})
+
+    @app.exception_handler(CatalogNotReadyError)
+    async def catalog_not_ready_handler(request: Request, exc: CatalogNotReadyError) -> JSONResponse:
+        logger.warning("CatalogNotReadyError: %s", exc)
+        return JSONResponse(status_code=503, content={"error": "CATALOG_NOT_READY", "detail": str(exc)})
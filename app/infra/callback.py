@@ -1,22 +1,67 @@
 import asyncio
+import importlib.util
 import logging
+import time
 
 import httpx
 
 from app.config import Settings
+from app.infra.retry import backoff_delay
 from app.schemas.response import CallbackSuccessPayload, CallbackFailurePayload
 
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
-RETRY_DELAY_SEC = 2
+# 재시도하면 성공할 수 있는 응답 코드 (그 밖의 4xx는 바로 실패)
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# h2 패키지가 있을 때만 HTTP/2를 사용한다 (pip install "lxp-recflow[http2]").
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """콜백 전송에 함께 쓰는 keep-alive 커넥션 풀 클라이언트를 만든다."""
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        timeout=settings.CALLBACK_TIMEOUT_SEC,
+        limits=httpx.Limits(
+            max_connections=settings.CALLBACK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.CALLBACK_MAX_CONNECTIONS,
+            keepalive_expiry=settings.CALLBACK_KEEPALIVE_SEC,
+        ),
+    )
+
+
+def open_http_client(settings: Settings) -> httpx.AsyncClient:
+    """앱 lifespan 시작 시 공유 HTTP 클라이언트를 연다."""
+    global _http_client
+    if _http_client is None:
+        _http_client = create_http_client(settings)
+        logger.info("Callback HTTP client opened (http2=%s)", HTTP2_AVAILABLE)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """앱 lifespan 종료 시 공유 HTTP 클라이언트의 커넥션을 정리한다."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Callback HTTP client closed")
 
 
 class CallbackClient:
-    """Spring 콜백 호출 클라이언트."""
+    """Spring 콜백 호출 클라이언트.
+
+    lifespan에서 연 공유 HTTP 클라이언트의 커넥션 풀을 재사용한다.
+    """
 
-    def __init__(self, settings: Settings) -> None:
-        self._timeout = settings.CALLBACK_TIMEOUT_SEC
+    def __init__(self, settings: Settings, http_client: httpx.AsyncClient | None = None) -> None:
+        self._attempt_timeout = settings.CALLBACK_TIMEOUT_SEC
+        self._total_timeout = settings.CALLBACK_TOTAL_TIMEOUT_SEC
+        self._http_client = http_client or open_http_client(settings)
 
     async def send_success(self, callback_url: str, payload: CallbackSuccessPayload) -> None:
         """성공 콜백을 전송한다."""
@@ -27,19 +72,36 @@ class CallbackClient:
         await self._post(callback_url, payload.model_dump(mode="json"))
 
     async def _post(self, url: str, data: dict) -> None:
-        """HTTP POST 요청을 최대 3회 재시도하며 전송한다."""
+        """HTTP POST 요청을 최대 3회 재시도하며 전송한다.
+
+        시도마다 CALLBACK_TIMEOUT_SEC, 대기 시간을 포함한 전체는 CALLBACK_TOTAL_TIMEOUT_SEC 안에서
+        끝나도록 남은 예산으로 타임아웃을 줄이고, 재시도 사이에는 jitter가 섞인 지수 백오프로 기다린다.
+        """
+        deadline = time.monotonic() + self._total_timeout
         last_err: Exception | None = None
         for attempt in range(1, MAX_RETRIES + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                async with httpx.AsyncClient(timeout=self._timeout) as client:
-                    response = await client.post(url, json=data)
-                    response.raise_for_status()
-                    logger.info("Callback sent to %s, status=%d", url, response.status_code)
-                    return
+                response = await self._http_client.post(
+                    url, json=data, timeout=min(self._attempt_timeout, remaining)
+                )
+                response.raise_for_status()
+                logger.info("Callback sent to %s, status=%d", url, response.status_code)
+                return
+            except httpx.HTTPStatusError as e:
+                last_err = e
+                if e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    logger.error("Callback rejected by %s: status=%d", url, e.response.status_code)
+                    raise
+                logger.warning("Callback attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
             except Exception as e:
                 last_err = e
                 logger.warning("Callback attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
-                if attempt < MAX_RETRIES:
-                    await asyncio.sleep(RETRY_DELAY_SEC)
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(min(backoff_delay(attempt), max(deadline - time.monotonic(), 0.0)))
+        if last_err is None:
+            last_err = TimeoutError(f"Callback time budget {self._total_timeout}s exhausted")
         logger.error("Callback failed after %d retries: %s", MAX_RETRIES, last_err)
-        raise last_err  # type: ignore[misc]
+        raise last_err
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from app.core.lists import is_list_type
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMAT_VERSION = 1
+DEFAULT_MEMORY_ENTRIES = 4
+_ARROW_COLUMNS_KEY = b"lxp.arrow_columns"
+
+
+def dataset_cache_key(object_key: str, etag: str, variant: str) -> str:
+    """R2 오브젝트 키 + ETag + 파싱 방식(variant)으로 캐시 키를 만든다."""
+    return hashlib.sha256(f"{object_key}\0{etag}\0{variant}".encode()).hexdigest()
+
+
+class DatasetCache:
+    """파싱까지 끝난 데이터셋 DataFrame을 로컬 디스크(+메모리)에 캐시한다.
+
+    디스크에는 Arrow IPC(Feather, 비압축) 파일로 저장해 다시 읽을 때 memory map으로 바로 올리고,
+    ArrowDtype 리스트·categorical id·int8 level 같은 압축된 dtype을 그대로 복원한다.
+    디스크 사용량이 max_bytes를 넘으면 가장 오래 사용되지 않은(mtime 기준) 항목부터 지운다.
+    메모리 캐시의 DataFrame은 여러 작업이 공유하므로 읽기 전용으로 다뤄야 한다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive: {max_bytes}")
+        self._cache_dir = cache_dir
+        self._max_bytes = max_bytes
+        self._memory_entries = memory_entries
+        self._memory: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, key: str) -> bool:
+        """key가 메모리나 디스크에 있는지 확인한다 (다운로드 생략 여부 판단용)."""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self._path(key).exists()
+
+    def get_or_load(self, key: str, load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """캐시된 DataFrame을 반환하고, 없으면 load()로 만들어 저장한다."""
+        with self._lock:
+            df = self._memory.get(key)
+            if df is not None:
+                self._memory.move_to_end(key)
+                logger.info("Dataset cache hit (memory): %s", key)
+                return df
+
+        df = self._read(key)
+        if df is None:
+            df = load()
+            self._write(key, df)
+        else:
+            logger.info("Dataset cache hit (disk): %s", key)
+
+        with self._lock:
+            self._memory[key] = df
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+        return df
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / f"dataset_v{DATASET_FORMAT_VERSION}_{key}.arrow"
+
+    def _read(self, key: str) -> pd.DataFrame | None:
+        """디스크에서 DataFrame을 읽는다. 없거나 손상되었으면 None."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+            arrow_columns = set(json.loads((table.schema.metadata or {}).get(_ARROW_COLUMNS_KEY, b"[]")))
+            columns = {}
+            for name, column in zip(table.column_names, table.columns):
+                column = column.combine_chunks()
+                if name in arrow_columns:
+                    columns[name] = pd.Series(column, dtype=pd.ArrowDtype(column.type))
+                elif is_list_type(column.type):
+                    columns[name] = pd.Series(column.to_pylist(), dtype=object)
+                else:
+                    columns[name] = column.to_pandas()
+            os.utime(path)
+            return pd.DataFrame(columns)
+        except Exception as e:
+            logger.warning("Failed to read cached dataset %s: %s", path, e)
+            return None
+
+    def _write(self, key: str, df: pd.DataFrame) -> None:
+        """DataFrame을 원자적으로 저장하고 용량 상한에 맞춰 오래된 항목을 지운다."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        arrow_columns = [name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.ArrowDtype)]
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({_ARROW_COLUMNS_KEY: json.dumps(arrow_columns).encode()})
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Failed to write dataset cache %s: %s", path, e)
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """캐시 파일 총 크기가 max_bytes 이하가 될 때까지 mtime 오래된 순으로 지운다.
+
+        다른 워커·프로세스가 같은 파일을 먼저 지우거나 교체할 수 있으므로 사라진 파일은 건너뛴다.
+        """
+        entries = []
+        for path in self._cache_dir.glob(f"dataset_v{DATASET_FORMAT_VERSION}_*.arrow"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+            logger.info("Evicting cached dataset: %s", path.name)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -1,23 +1,46 @@
-import ast
 import logging
+from collections.abc import Collection
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.core.adjuster import level_codes
+from app.core.lists import is_list_type, parse_list_literals, to_arrow_list_series
 
 logger = logging.getLogger(__name__)
 
 USERS_REQUIRED_COLUMNS = {"id", "interest_tags", "level", "purchased_course_ids", "created_course_ids"}
 COURSES_REQUIRED_COLUMNS = {"id", "tags", "level"}
+ID_COLUMNS = ["id"]
+LEVEL_COLUMN = "level"
+
+
+def _arrow_list_dtype(data_type: pa.DataType) -> pd.ArrowDtype | None:
+    """Parquet 리스트 컬럼만 ArrowDtype으로 매핑한다 (나머지는 pandas 기본 변환)."""
+    return pd.ArrowDtype(data_type) if is_list_type(data_type) else None
 
 
 class DatasetLoader:
-    """Parquet/CSV 파일을 DataFrame으로 로드한다."""
+    """Parquet/CSV 파일을 DataFrame으로 로드한다.
+
+    arrow_lists=True면 리스트 컬럼을 셀마다 Python 객체로 풀지 않고
+    Arrow ListArray(offsets + 평탄 values 버퍼)를 감싼 ArrowDtype 컬럼으로 유지한다.
+    compact_dtypes=True면 id 컬럼을 categorical로, level을 int8로 줄인다.
+    """
 
-    def load(self, file_path: Path) -> pd.DataFrame:
+    def __init__(self, arrow_lists: bool = False, compact_dtypes: bool = False) -> None:
+        self._arrow_lists = arrow_lists
+        self._compact_dtypes = compact_dtypes
+
+    def load(self, file_path: Path, columns: Collection[str] | None = None) -> pd.DataFrame:
         """파일을 DataFrame으로 로드한다. Parquet 우선, 실패 시 CSV 폴백.
 
         Args:
             file_path: 로컬 파일 경로
+            columns: 읽을 컬럼 (None이면 전체). 파일에 없는 컬럼은 무시한다.
 
         Returns:
             로드된 DataFrame
@@ -30,47 +53,81 @@ class DatasetLoader:
             raise FileNotFoundError(f"File not found: {file_path}")
 
         try:
-            df = pd.read_parquet(file_path)
-            logger.info("Loaded parquet: %s (%d rows)", file_path, len(df))
+            df = self._read_parquet(file_path, columns)
+            logger.info("Loaded parquet: %s (%d rows, %d columns)", file_path, len(df), len(df.columns))
             return df
         except Exception:
             logger.warning("Parquet load failed for %s, trying CSV fallback", file_path)
 
         try:
-            df = pd.read_csv(file_path)
-            logger.info("Loaded CSV: %s (%d rows)", file_path, len(df))
+            usecols = None if columns is None else (lambda name: name in columns)
+            df = pd.read_csv(file_path, usecols=usecols)
+            logger.info("Loaded CSV: %s (%d rows, %d columns)", file_path, len(df), len(df.columns))
             return df
         except Exception as e:
             raise ValueError(f"Failed to load file {file_path}: {e}") from e
 
     def load_users(self, file_path: Path) -> pd.DataFrame:
-        """사용자 데이터를 로드하고 컬럼을 검증한다."""
-        df = self.load(file_path)
+        """사용자 데이터를 파이프라인에 필요한 컬럼만 로드하고 검증한다."""
+        df = self.load(file_path, columns=USERS_REQUIRED_COLUMNS)
         missing = USERS_REQUIRED_COLUMNS - set(df.columns)
         if missing:
             raise ValueError(f"Users file missing columns: {missing}")
         list_cols = ["interest_tags", "purchased_course_ids", "created_course_ids"]
         df = self._parse_list_columns(df, list_cols)
-        return df
+        return self._compact(df)
 
     def load_courses(self, file_path: Path) -> pd.DataFrame:
-        """강의 데이터를 로드하고 컬럼을 검증한다."""
-        df = self.load(file_path)
+        """강의 데이터를 파이프라인에 필요한 컬럼만 로드하고 검증한다."""
+        df = self.load(file_path, columns=COURSES_REQUIRED_COLUMNS)
         missing = COURSES_REQUIRED_COLUMNS - set(df.columns)
         if missing:
             raise ValueError(f"Courses file missing columns: {missing}")
         df = self._parse_list_columns(df, ["tags"])
+        return self._compact(df)
+
+    def _read_parquet(self, file_path: Path, columns: Collection[str] | None) -> pd.DataFrame:
+        """Parquet 파일에서 columns 중 실제로 있는 컬럼만 읽는다."""
+        if columns is not None:
+            names = pq.read_schema(file_path).names
+            columns = [name for name in names if name in columns]
+        types_mapper = _arrow_list_dtype if self._arrow_lists else None
+        return pq.read_table(file_path, columns=columns).to_pandas(types_mapper=types_mapper)
+
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """id 컬럼을 categorical로 dictionary 인코딩하고 level을 int8로 줄인다."""
+        if not self._compact_dtypes:
+            return df
+        for col in ID_COLUMNS:
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+        if df[LEVEL_COLUMN].dtype != np.int8:
+            df[LEVEL_COLUMN] = level_codes(df)
         return df
 
-    @staticmethod
-    def _parse_list_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
-        """CSV에서 문자열로 로드된 리스트 컬럼을 실제 list로 파싱한다."""
+    def _parse_list_columns(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        """CSV에서 문자열로 로드된 리스트 컬럼을 Arrow ListArray로 한 번에 파싱한다.
+
+        arrow_lists=False면 기존처럼 셀마다 list(비어 있으면 [])로 풀어 둔다.
+
+        Raises:
+            ValueError: 리스트 리터럴로 해석되지 않는 행이 있을 때 (컬럼별로 모아서 보고)
+        """
         for col in columns:
             if col not in df.columns:
                 continue
             sample = df[col].dropna().iloc[0] if not df[col].dropna().empty else None
             if isinstance(sample, str):
-                df[col] = df[col].apply(
-                    lambda v: ast.literal_eval(v) if isinstance(v, str) else (v if isinstance(v, list) else [])
-                )
+                try:
+                    array = parse_list_literals(df[col])
+                except ValueError as e:
+                    raise ValueError(f"Failed to parse list column {col}: {e}") from e
+                if self._arrow_lists:
+                    df[col] = pd.Series(array, index=df.index, name=col, dtype=pd.ArrowDtype(array.type))
+                else:
+                    df[col] = pd.Series(
+                        [v if v is not None else [] for v in array.to_pylist()], index=df.index, dtype=object
+                    )
+            if self._arrow_lists and not isinstance(df[col].dtype, pd.ArrowDtype):
+                df[col] = to_arrow_list_series(df[col])
         return df
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from app.core.vectorizer import CourseModel, build_course_model
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 1 << 20
+DEFAULT_MEMORY_ENTRIES = 2
+
+
+def catalog_fingerprint(file_path: Path) -> str:
+    """강의 파일 내용의 sha256 해시를 카탈로그 버전 키로 사용한다."""
+    digest = hashlib.sha256()
+    with file_path.open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CourseModelCache:
+    """카탈로그 fingerprint별 CourseModel을 로컬 디스크(+메모리)에 캐시한다.
+
+    디스크 캐시는 같은 노드의 워커들이 공유하며, max_entries를 넘으면
+    가장 오래 사용되지 않은(mtime 기준) 항목부터 지운다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._memory_entries = memory_entries
+        self._memory: OrderedDict[str, CourseModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, fingerprint: str, courses: pd.DataFrame) -> CourseModel:
+        """캐시된 CourseModel을 반환하고, 없으면 courses로 학습해 저장한다."""
+        with self._lock:
+            model = self._memory.get(fingerprint)
+            if model is not None:
+                self._memory.move_to_end(fingerprint)
+                logger.info("Course model cache hit (memory): %s", fingerprint)
+                return model
+
+        model = self._load(fingerprint)
+        if model is None:
+            model = build_course_model(courses, fingerprint)
+            self._save(model)
+        else:
+            logger.info("Course model cache hit (disk): %s", fingerprint)
+
+        with self._lock:
+            self._memory[fingerprint] = model
+            self._memory.move_to_end(fingerprint)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+        return model
+
+    def _path(self, fingerprint: str) -> Path:
+        return self._cache_dir / f"course_model_v{MODEL_FORMAT_VERSION}_{fingerprint}.npz"
+
+    def _load(self, fingerprint: str) -> CourseModel | None:
+        """디스크에서 CourseModel을 읽는다. 없거나 손상되었으면 None."""
+        path = self._path(fingerprint)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                course_matrix = sp.csr_matrix(
+                    (data["data"], data["indices"], data["indptr"]),
+                    shape=tuple(data["shape"]),
+                )
+                model = CourseModel(
+                    fingerprint=fingerprint,
+                    vocabulary=data["vocabulary"],
+                    idf=data["idf"],
+                    course_matrix=course_matrix,
+                )
+            os.utime(path)
+            return model
+        except Exception as e:
+            logger.warning("Failed to read cached course model %s: %s", path, e)
+            return None
+
+    def _save(self, model: CourseModel) -> None:
+        """CourseModel을 원자적으로 저장하고 LRU 정책으로 오래된 항목을 지운다."""
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(model.fingerprint)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                np.savez(
+                    f,
+                    vocabulary=model.vocabulary,
+                    idf=model.idf,
+                    data=model.course_matrix.data,
+                    indices=model.course_matrix.indices,
+                    indptr=model.course_matrix.indptr,
+                    shape=np.array(model.course_matrix.shape),
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Failed to write course model cache %s: %s", path, e)
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """max_entries를 넘는 캐시 파일을 mtime 오래된 순으로 지운다."""
+        entries = sorted(
+            self._cache_dir.glob(f"course_model_v{MODEL_FORMAT_VERSION}_*.npz"),
+            key=lambda p: p.stat().st_mtime,
+        )
+        for path in entries[: max(len(entries) - self._max_entries, 0)]:
+            logger.info("Evicting cached course model: %s", path.name)
+            path.unlink(missing_ok=True)
@@ -0,0 +1,17 @@
+import random
+
+RETRY_BASE_DELAY_SEC = 0.5
+RETRY_MAX_DELAY_SEC = 20.0
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = RETRY_BASE_DELAY_SEC,
+    cap: float = RETRY_MAX_DELAY_SEC,
+) -> float:
+    """attempt번째 실패 후 대기 시간을 full jitter 지수 백오프로 계산한다.
+
+    [0, min(cap, base * 2^(attempt-1))] 구간에서 균등하게 뽑아
+    여러 요청이 같은 시점에 재시도하지 않도록 한다.
+    """
+    return random.uniform(0.0, min(cap, base * 2 ** (attempt - 1)))
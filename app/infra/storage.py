@@ -1,31 +1,92 @@
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config as BotoConfig
 
 from app.config import Settings
 from app.exceptions.handlers import StorageError
+from app.infra.retry import backoff_delay
 
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
-RETRY_DELAY_SEC = 2
+# S3 multipart의 마지막 part를 제외한 최소 part 크기
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def create_s3_client(settings: Settings):
+    """R2 접속용 S3 클라이언트를 만든다. 생성된 클라이언트는 스레드 간 공유해도 안전하다."""
+    session = boto3.session.Session()
+    return session.client(
+        "s3",
+        endpoint_url=settings.R2_ENDPOINT_URL,
+        aws_access_key_id=settings.R2_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+        config=BotoConfig(
+            signature_version="s3v4",
+            # 여러 작업·파일의 part 요청들이 커넥션을 기다리지 않도록 넉넉히 잡는다.
+            max_pool_connections=settings.STORAGE_MAX_POOL_CONNECTIONS,
+        ),
+    )
+
+
+def open_s3_client(settings: Settings):
+    """프로세스 전체에서 공유할 S3 클라이언트를 (없으면 만들어) 반환한다."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = create_s3_client(settings)
+            logger.info("S3 client opened (max_pool_connections=%d)", settings.STORAGE_MAX_POOL_CONNECTIONS)
+        return _s3_client
+
+
+def close_s3_client() -> None:
+    """공유 S3 클라이언트의 커넥션 풀을 정리한다."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is not None:
+            _s3_client.close()
+            _s3_client = None
+            logger.info("S3 client closed")
+
+
+def preconnect(settings: Settings) -> None:
+    """버킷에 HEAD 요청을 보내 TLS 연결을 미리 맺어 둔다. 실패는 경고만 남긴다."""
+    try:
+        open_s3_client(settings).head_bucket(Bucket=settings.R2_BUCKET_NAME)
+        logger.info("S3 preconnect succeeded: %s", settings.R2_BUCKET_NAME)
+    except Exception as e:
+        logger.warning("S3 preconnect failed: %s", e)
 
 
 class StorageClient:
-    """Cloudflare R2(S3 호환) 업로드·다운로드 클라이언트."""
+    """Cloudflare R2(S3 호환) 업로드·다운로드 클라이언트.
 
-    def __init__(self, settings: Settings) -> None:
+    큰 파일은 TransferConfig에 따라 part 단위 ranged GET/multipart upload로 병렬 전송한다.
+    S3 클라이언트는 프로세스 전체에서 공유하므로 요청마다 새 커넥션 풀을 만들지 않는다.
+    """
+
+    def __init__(self, settings: Settings, s3_client=None) -> None:
         self._bucket = settings.R2_BUCKET_NAME
-        self._client = boto3.client(
-            "s3",
-            endpoint_url=settings.R2_ENDPOINT_URL,
-            aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-            config=BotoConfig(signature_version="s3v4"),
+        chunk_bytes = settings.storage_multipart_chunk_bytes
+        self._part_size = max(chunk_bytes, MIN_PART_SIZE)
+        self._max_concurrent_files = settings.STORAGE_MAX_CONCURRENT_FILES
+        self._transfer_config = TransferConfig(
+            multipart_threshold=chunk_bytes,
+            multipart_chunksize=chunk_bytes,
+            max_concurrency=settings.STORAGE_MAX_CONCURRENCY,
+            use_threads=True,
         )
+        self._client = s3_client or open_s3_client(settings)
 
     def download_file(self, key: str, local_path: Path) -> Path:
         """R2에서 파일을 다운로드한다.
@@ -42,15 +103,51 @@ class StorageClient:
         last_err: Exception | None = None
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                self._client.download_file(self._bucket, key, str(local_path))
+                self._client.download_file(self._bucket, key, str(local_path), Config=self._transfer_config)
                 return local_path
             except Exception as e:
                 last_err = e
                 logger.warning("Download attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
                 if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY_SEC)
+                    time.sleep(backoff_delay(attempt))
         raise StorageError(f"Download failed after {MAX_RETRIES} retries: {last_err}")
 
+    def head_etag(self, key: str) -> str:
+        """HEAD 요청으로 오브젝트의 ETag를 조회한다 (내용이 바뀌면 값도 바뀐다).
+
+        Raises:
+            StorageError: 재시도 후에도 조회에 실패했을 때
+        """
+        last_err: Exception | None = None
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                response = self._client.head_object(Bucket=self._bucket, Key=key)
+                return response["ETag"].strip('"')
+            except Exception as e:
+                last_err = e
+                logger.warning("HEAD attempt %d/%d failed for %s: %s", attempt, MAX_RETRIES, key, e)
+                if attempt < MAX_RETRIES:
+                    time.sleep(backoff_delay(attempt))
+        raise StorageError(f"HEAD failed after {MAX_RETRIES} retries: {last_err}")
+
+    def download_files(self, targets: list[tuple[str, Path]]) -> list[Path]:
+        """여러 파일을 동시에 다운로드한다 (최대 STORAGE_MAX_CONCURRENT_FILES개씩).
+
+        Args:
+            targets: (R2 오브젝트 키, 저장할 로컬 경로) 목록
+
+        Returns:
+            targets 순서대로 다운로드된 로컬 파일 경로
+
+        Raises:
+            StorageError: 하나라도 재시도 후 실패했을 때 (나머지 다운로드는 끝까지 기다린다)
+        """
+        if len(targets) <= 1:
+            return [self.download_file(key, path) for key, path in targets]
+        with ThreadPoolExecutor(max_workers=min(len(targets), self._max_concurrent_files)) as executor:
+            futures = [executor.submit(self.download_file, key, path) for key, path in targets]
+            return [future.result() for future in futures]
+
     def upload_file(self, local_path: Path, key: str) -> str:
         """로컬 파일을 R2에 업로드한다.
 
@@ -65,11 +162,145 @@ class StorageClient:
         last_err: Exception | None = None
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                self._client.upload_file(str(local_path), self._bucket, key)
+                self._client.upload_file(str(local_path), self._bucket, key, Config=self._transfer_config)
                 return key
             except Exception as e:
                 last_err = e
                 logger.warning("Upload attempt %d/%d failed: %s", attempt, MAX_RETRIES, e)
                 if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY_SEC)
+                    time.sleep(backoff_delay(attempt))
         raise StorageError(f"Upload failed after {MAX_RETRIES} retries: {last_err}")
+
+    def open_upload(self, key: str) -> "MultipartUploadStream":
+        """key로 multipart 업로드를 시작하고 쓰기 가능한 스트림을 반환한다.
+
+        스트림에 쓴 바이트는 part 크기가 찰 때마다 바로 R2로 올라가므로
+        결과 전체를 로컬 디스크나 메모리에 모을 필요가 없다.
+
+        Args:
+            key: R2 오브젝트 키
+
+        Returns:
+            with 블록이 정상 종료되면 업로드를 완료하고, 예외로 끝나면 중단(abort)하는 스트림
+        """
+        logger.info("Streaming upload -> s3://%s/%s", self._bucket, key)
+        try:
+            response = self._client.create_multipart_upload(Bucket=self._bucket, Key=key)
+        except Exception as e:
+            raise StorageError(f"Failed to start multipart upload for {key}: {e}") from e
+        return MultipartUploadStream(self._client, self._bucket, key, response["UploadId"], self._part_size)
+
+
+class MultipartUploadStream:
+    """쓰는 대로 고정 크기 part로 잘라 multipart 업로드하는 쓰기 전용 파일 객체.
+
+    R2는 마지막 part를 제외한 모든 part의 크기가 같아야 하므로 part_size 단위로만 올리고
+    나머지는 complete() 때 마지막 part로 보낸다.
+    """
+
+    def __init__(self, client, bucket: str, key: str, upload_id: str, part_size: int) -> None:
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+        self._upload_id = upload_id
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self._position = 0
+        self.closed = False
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        """data를 버퍼에 붙이고, part 크기만큼 찰 때마다 part를 업로드한다."""
+        if self.closed:
+            raise ValueError("write to closed upload stream")
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._upload_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        """part 크기를 맞춰야 하므로 버퍼는 complete() 때까지 유지한다."""
+
+    def complete(self) -> str:
+        """남은 버퍼를 마지막 part로 올리고 업로드를 완료한다.
+
+        Returns:
+            업로드된 오브젝트 키
+        """
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        try:
+            self._client.complete_multipart_upload(
+                Bucket=self._bucket,
+                Key=self._key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        except Exception as e:
+            raise StorageError(f"Failed to complete multipart upload for {self._key}: {e}") from e
+        self.closed = True
+        logger.info("Upload complete: s3://%s/%s (%d bytes, %d parts)",
+                    self._bucket, self._key, self._position, len(self._parts))
+        return self._key
+
+    def abort(self) -> None:
+        """업로드를 중단해 R2에 남은 part를 정리한다. 중단 실패는 로그만 남긴다."""
+        self.closed = True
+        self._buffer.clear()
+        try:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+            logger.warning("Upload aborted: s3://%s/%s", self._bucket, self._key)
+        except Exception as e:
+            logger.error("Failed to abort multipart upload for %s: %s", self._key, e)
+
+    def close(self) -> None:
+        """완료되지 않은 채로 닫히면 업로드를 중단한다."""
+        if not self.closed:
+            self.abort()
+
+    def _upload_part(self, body: bytes) -> None:
+        part_number = len(self._parts) + 1
+        last_err: Exception | None = None
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                response = self._client.upload_part(
+                    Bucket=self._bucket,
+                    Key=self._key,
+                    UploadId=self._upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                self._parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+                return
+            except Exception as e:
+                last_err = e
+                logger.warning("Upload part %d attempt %d/%d failed: %s", part_number, attempt, MAX_RETRIES, e)
+                if attempt < MAX_RETRIES:
+                    time.sleep(backoff_delay(attempt))
+        raise StorageError(f"Upload part {part_number} failed after {MAX_RETRIES} retries: {last_err}")
+
+    def __enter__(self) -> "MultipartUploadStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            try:
+                self.complete()
+            except Exception:
+                self.abort()
+                raise
+        else:
+            self.abort()
@@ -0,0 +1,117 @@
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# 결과 컬럼 스키마. id 타입은 입력 데이터를 따르며, 여기의 string은 결과가 비었을 때만 쓴다.
+RESULT_SCHEMA = pa.schema([
+    ("user_id", pa.string()),
+    ("course_id", pa.string()),
+    ("score", pa.float64()),
+    ("rank", pa.int64()),
+])
+ID_COLUMNS = ["user_id", "course_id"]
+# 결과를 만든 카탈로그·설정 버전 (증분 실행에서 이전 결과를 재사용할 수 있는지 판단)
+RESULT_FINGERPRINT_KEY = "lxp.result_fingerprint"
+
+
+class ParquetResultWriter:
+    """추천 결과 청크를 도착하는 대로 Parquet row group으로 이어 쓴다.
+
+    청크마다 바로 기록하고 버리므로 결과 전체를 메모리에 모으지 않는다.
+    청크는 사용자 단위로 나뉘어 있다고 가정하고 user_count를 청크별 합으로 센다.
+    schema를 주지 않으면 user_id·course_id 타입은 첫 청크의 id 타입(정수·문자열 등, categorical은
+    값 타입)을 따르고, 이후 청크는 그 타입으로 변환한다. metadata는 Parquet 스키마 메타데이터로 함께 저장한다.
+    """
+
+    def __init__(
+        self,
+        where: Path | BinaryIO,
+        schema: pa.Schema | None = None,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        self._where = where if not isinstance(where, Path) else str(where)
+        self._metadata = metadata
+        self._schema = self._with_metadata(schema) if schema is not None else None
+        self._writer: pq.ParquetWriter | None = None
+        self.row_count = 0
+        self.user_count = 0
+        self.row_groups = 0
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        """청크 하나를 row group 하나로 기록한다."""
+        if chunk.empty:
+            return
+        table = _decode_dictionaries(pa.Table.from_pandas(chunk[RESULT_SCHEMA.names], preserve_index=False))
+        if self._schema is None:
+            self._schema = self._with_metadata(pa.schema([
+                table.schema.field(name) if name in ID_COLUMNS else RESULT_SCHEMA.field(name)
+                for name in RESULT_SCHEMA.names
+            ]))
+        self._open().write_table(table.cast(self._schema))
+        self.row_count += len(chunk)
+        self.user_count += int(chunk["user_id"].nunique())
+        self.row_groups += 1
+
+    def close(self) -> None:
+        if self._schema is None:
+            self._schema = self._with_metadata(RESULT_SCHEMA)
+        self._open().close()
+        logger.info("Result written: %d rows, %d users, %d row groups",
+                    self.row_count, self.user_count, self.row_groups)
+
+    def _open(self) -> pq.ParquetWriter:
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._where, self._schema)
+        return self._writer
+
+    def _with_metadata(self, schema: pa.Schema) -> pa.Schema:
+        if not self._metadata:
+            return schema
+        return schema.with_metadata({**(schema.metadata or {}), **self._metadata})
+
+    def __enter__(self) -> "ParquetResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _decode_dictionaries(table: pa.Table) -> pa.Table:
+    """categorical id에서 온 dictionary 컬럼을 값 타입으로 풀고 pandas 메타데이터는 버린다."""
+    columns = [
+        column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column
+        for column in table.columns
+    ]
+    return pa.table(columns, names=table.column_names)
+
+
+def read_result_metadata(file_path: Path) -> dict[str, str]:
+    """결과 Parquet 파일의 스키마 메타데이터를 문자열 dict로 읽는다."""
+    metadata = pq.read_schema(file_path).metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items()}
+
+
+def iter_result_row_groups(file_path: Path, keep_user_ids: np.ndarray) -> Iterator[pd.DataFrame]:
+    """이전 결과 파일을 row group 단위로 읽어 keep_user_ids 사용자의 행만 yield한다.
+
+    ParquetResultWriter가 쓴 row group은 사용자 단위로 나뉘어 있으므로
+    걸러낸 청크도 그대로 ParquetResultWriter.write에 넘길 수 있다.
+    keep_user_ids는 파일의 user_id 타입(정수·문자열 등)으로 변환해 비교한다.
+    """
+    parquet_file = pq.ParquetFile(file_path)
+    user_id_type = parquet_file.schema_arrow.field("user_id").type
+    value_set = pa.array(keep_user_ids, from_pandas=True).cast(user_id_type)
+    for i in range(parquet_file.num_row_groups):
+        table = parquet_file.read_row_group(i, columns=RESULT_SCHEMA.names)
+        table = table.filter(pc.is_in(table["user_id"], value_set=value_set))
+        if table.num_rows:
+            yield table.to_pandas()
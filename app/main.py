@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import json
@@ -9,6 +10,11 @@ from fastapi import FastAPI
 from app.config import settings
 from app.api.router import api_router
 from app.exceptions.handlers import register_exception_handlers
+from app.infra.callback import close_http_client, open_http_client
+from app.infra.storage import close_s3_client, open_s3_client, preconnect
+from app.services.bulk_service import close_bulk_batcher
+from app.services.executor import shutdown_pipeline_executor
+from app.services.online_service import close_catalog_refresher, open_catalog_refresher
 
 
 class JsonFormatter(logging.Formatter):
@@ -44,9 +50,19 @@ async def lifespan(app: FastAPI):
     setup_logging()
     logger = logging.getLogger(__name__)
     app.state.start_time = datetime.now(timezone.utc)
+    open_http_client(settings)
+    open_s3_client(settings)
+    if settings.STORAGE_PRECONNECT:
+        await asyncio.to_thread(preconnect, settings)
+    open_catalog_refresher(settings)
     logger.info("LXP-RecFlow engine starting up")
     yield
     logger.info("LXP-RecFlow engine shutting down")
+    await close_catalog_refresher()
+    await close_bulk_batcher()
+    await close_http_client()
+    close_s3_client()
+    shutdown_pipeline_executor()
 
 
 app = FastAPI(
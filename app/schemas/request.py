@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.config import settings
+from app.core.adjuster import MAX_LEVEL
 
 
 class ProcessRequest(BaseModel):
@@ -11,3 +12,47 @@ class ProcessRequest(BaseModel):
     courses_file_path: str = Field(..., description="R2 내 강의 데이터 경로")
     top_k: int = Field(default=settings.DEFAULT_TOP_K, description="사용자당 추천 개수")
     callback_url: str | None = Field(default=None, description="완료 통보 URL")
+    previous_result_file_path: str | None = Field(
+        default=None, description="증분 실행: 이전 배치 결과 Parquet의 R2 경로"
+    )
+    previous_users_file_path: str | None = Field(
+        default=None, description="증분 실행: 이전 결과를 만들 때 쓴 사용자 데이터의 R2 경로"
+    )
+
+    @model_validator(mode="after")
+    def check_previous_files(self) -> "ProcessRequest":
+        """증분 실행에 필요한 이전 결과·사용자 경로는 함께 지정해야 한다."""
+        if (self.previous_result_file_path is None) != (self.previous_users_file_path is None):
+            raise ValueError("previous_result_file_path and previous_users_file_path must be given together")
+        return self
+
+    @property
+    def incremental(self) -> bool:
+        return self.previous_result_file_path is not None
+
+
+class RecommendRequest(BaseModel):
+    """온라인 단일 사용자 추천 요청 모델."""
+
+    user_id: str | None = Field(default=None, description="사용자 식별자 (로그·응답용)")
+    interest_tags: list[int] = Field(default_factory=list, description="관심 태그 ID 목록")
+    level: int = Field(default=0, ge=0, le=MAX_LEVEL, description="사용자 레벨")
+    purchased_course_ids: list[str] = Field(default_factory=list, description="구매한 강의 ID 목록")
+    created_course_ids: list[str] = Field(default_factory=list, description="본인이 만든 강의 ID 목록")
+    top_k: int = Field(default=settings.DEFAULT_TOP_K, ge=1, le=100, description="추천 개수")
+
+
+class BulkUserProfile(BaseModel):
+    """bulk 추천 요청의 사용자 프로필 한 건."""
+
+    user_id: str = Field(..., description="사용자 식별자")
+    interest_tags: list[int] = Field(default_factory=list, description="관심 태그 ID 목록")
+    level: int = Field(default=0, ge=0, le=MAX_LEVEL, description="사용자 레벨")
+    purchased_course_ids: list[str] = Field(default_factory=list, description="구매한 강의 ID 목록")
+    created_course_ids: list[str] = Field(default_factory=list, description="본인이 만든 강의 ID 목록")
+
+
+class BulkRecommendRequest(BaseModel):
+    """온라인 bulk 추천 요청 모델 (JSON 본문). 추천 개수는 쿼리 파라미터 top_k로 받는다."""
+
+    users: list[BulkUserProfile] = Field(..., min_length=1, description="추천할 사용자 프로필 목록")
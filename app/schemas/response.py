@@ -11,6 +11,38 @@ class ProcessResponse(BaseModel):
     message: str = "Processing started"
 
 
+class JobStatusResponse(BaseModel):
+    """배치 작업 상태 조회 응답 모델."""
+
+    batch_id: str
+    state: str
+    stage: str | None = None
+    queue_position: int | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    queued_seconds: float | None = None
+    run_seconds: float | None = None
+    result_file_path: str | None = None
+    error_message: str | None = None
+
+
+class RecommendationItem(BaseModel):
+    """추천 강의 한 건."""
+
+    course_id: str
+    score: float
+    rank: int
+
+
+class RecommendResponse(BaseModel):
+    """온라인 단일 사용자 추천 응답 모델."""
+
+    user_id: str | None = None
+    catalog_version: str
+    recommendations: list[RecommendationItem]
+
+
 class HealthResponse(BaseModel):
     """헬스체크 응답 모델."""
 
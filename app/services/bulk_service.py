@@ -0,0 +1,283 @@
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.config import settings
+from app.core.adjuster import MAX_LEVEL
+from app.exceptions.handlers import CatalogNotReadyError, ParsingError, ScoringError
+from app.schemas.request import BulkRecommendRequest
+from app.services.online_service import OnlineRecommender, RankedBatch, online_recommender
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# bulk 요청 사용자 프로필 스키마 (배치 사용자 파일과 같은 컬럼 이름)
+BULK_USERS_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("interest_tags", pa.list_(pa.int64())),
+    ("level", pa.int64()),
+    ("purchased_course_ids", pa.list_(pa.string())),
+    ("created_course_ids", pa.list_(pa.string())),
+])
+BULK_REQUIRED_COLUMNS = {"id", "interest_tags", "level"}
+
+
+def profiles_from_json(request: BulkRecommendRequest) -> pa.Table:
+    """JSON bulk 요청을 BULK_USERS_SCHEMA 테이블로 변환한다."""
+    users = request.users
+    return pa.table({
+        "id": [user.user_id for user in users],
+        "interest_tags": [user.interest_tags for user in users],
+        "level": [user.level for user in users],
+        "purchased_course_ids": [user.purchased_course_ids for user in users],
+        "created_course_ids": [user.created_course_ids for user in users],
+    }, schema=BULK_USERS_SCHEMA)
+
+
+def profiles_from_arrow(body: bytes) -> pa.Table:
+    """Arrow IPC stream 본문을 BULK_USERS_SCHEMA 테이블로 변환한다.
+
+    제외 리스트 컬럼은 없으면 빈 리스트로 채운다. 태그 ID가 문자열이어도 정수로 바뀌면 받는다.
+
+    Raises:
+        ParsingError: 스트림을 읽을 수 없거나 컬럼·값이 스키마에 맞지 않을 때
+    """
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ParsingError(f"Invalid Arrow IPC stream: {e}") from e
+
+    missing = BULK_REQUIRED_COLUMNS - set(table.column_names)
+    if missing:
+        raise ParsingError(f"Bulk users missing columns: {missing}")
+    if table.num_rows == 0:
+        raise ParsingError("Bulk users stream has no rows")
+
+    columns = {}
+    for field in BULK_USERS_SCHEMA:
+        if field.name not in table.column_names:
+            columns[field.name] = pa.array([[]] * table.num_rows, type=field.type)
+            continue
+        try:
+            columns[field.name] = table[field.name].cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ParsingError(f"Invalid bulk users column {field.name}: {e}") from e
+
+    if columns["id"].null_count or columns["level"].null_count:
+        raise ParsingError("Bulk users id and level must not be null")
+    min_level, max_level = pc.min_max(columns["level"]).values()
+    if min_level.as_py() < 0 or max_level.as_py() > MAX_LEVEL:
+        raise ParsingError(f"Bulk users level must be in [0, {MAX_LEVEL}]")
+    return pa.table(columns, schema=BULK_USERS_SCHEMA)
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> pa.Table:
+    """요청 본문을 content-type에 맞게 프로필 테이블로 파싱·검증한다.
+
+    사용자 수천 명이면 수십 ms가 걸리므로 이벤트 루프가 아니라 스레드에서 호출한다.
+
+    Raises:
+        ParsingError: Arrow 본문이 잘못되었을 때
+        pydantic.ValidationError: JSON 본문이 BulkRecommendRequest에 맞지 않을 때
+    """
+    if content_type.startswith(ARROW_STREAM_MEDIA_TYPE):
+        return profiles_from_arrow(body)
+    return profiles_from_json(BulkRecommendRequest.model_validate_json(body))
+
+
+def users_frame(table: pa.Table) -> pd.DataFrame:
+    """프로필 테이블을 OnlineRecommender.recommend_many에 넘길 DataFrame으로 바꾼다 (Arrow 버퍼 유지)."""
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _ndjson_chunk(users: pa.Table, ranked: RankedBatch) -> bytes:
+    """조각 하나의 사용자별 추천을 RecommendResponse 형식 JSON 줄로 만든다."""
+    bounds = np.searchsorted(ranked.user_idx, np.arange(users.num_rows + 1)).tolist()
+    course_ids, scores, ranks = ranked.course_ids.tolist(), ranked.scores.tolist(), ranked.ranks.tolist()
+    lines = []
+    for i, user_id in enumerate(users["id"].to_pylist()):
+        lo, hi = bounds[i], bounds[i + 1]
+        lines.append(json.dumps({
+            "user_id": user_id,
+            "catalog_version": ranked.catalog_version,
+            "recommendations": [
+                {"course_id": str(c), "score": s, "rank": r}
+                for c, s, r in zip(course_ids[lo:hi], scores[lo:hi], ranks[lo:hi])
+            ],
+        }, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode()
+
+
+@dataclass
+class _Pending:
+    users: pa.Table
+    top_k: int
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """동시에 들어온 bulk 추천 요청을 짧게 모아 micro-batch 하나로 계산한다.
+
+    첫 요청이 도착한 뒤 max_wait_ms 동안(또는 사용자 수가 max_batch_users에 찰 때까지) 들어온 요청의
+    프로필을 이어 붙여 태그 벡터화·제외 행렬·역색인 조회를 micro-batch당 한 번만 실행한다.
+    계산과 NDJSON 직렬화는 스레드에서 돌리며, 그동안 도착한 요청은 대기열에 쌓여 다음 micro-batch가 된다.
+    micro-batch 계산이 실패하면 요청을 하나씩 다시 계산해 실패 원인이 된 요청만 예외를 받게 한다.
+    max_batch_users보다 큰 요청은 조각으로 나눠 넣고 조각이 끝나는 대로 결과를 돌려준다.
+    """
+
+    def __init__(self, recommender: OnlineRecommender, max_wait_ms: float, max_batch_users: int) -> None:
+        if max_batch_users <= 0:
+            raise ValueError(f"max_batch_users must be positive: {max_batch_users}")
+        self._recommender = recommender
+        self._max_wait = max_wait_ms / 1000
+        self._max_batch_users = max_batch_users
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[_Pending] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def recommender(self) -> OnlineRecommender:
+        return self._recommender
+
+    async def submit(self, users: pa.Table, top_k: int) -> AsyncIterator[tuple[pa.Table, bytes]]:
+        """요청 하나의 프로필을 대기열에 넣고, 조각별 (프로필, NDJSON 바이트)를 입력 순서대로 돌려준다."""
+        queue = self._ensure_running()
+        pending = []
+        for start in range(0, users.num_rows, self._max_batch_users):
+            item = _Pending(users.slice(start, self._max_batch_users), top_k, self._loop.create_future())
+            queue.put_nowait(item)
+            pending.append(item)
+        for item in pending:
+            yield item.users, await item.future
+
+    async def close(self) -> None:
+        """micro-batch 처리 태스크를 멈춘다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._queue = None
+            logger.info("Bulk micro-batcher stopped")
+
+    def _ensure_running(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        carry: _Pending | None = None
+        while True:
+            first = carry if carry is not None else await queue.get()
+            carry = None
+            batch, size = [first], first.users.num_rows
+            deadline = self._loop.time() + self._max_wait
+            while size < self._max_batch_users:
+                timeout = deadline - self._loop.time()
+                try:
+                    item = queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(queue.get(), timeout)
+                except (asyncio.QueueEmpty, TimeoutError):
+                    break
+                if size + item.users.num_rows > self._max_batch_users:
+                    carry = item
+                    break
+                batch.append(item)
+                size += item.users.num_rows
+            await self._dispatch(batch)
+
+    async def _dispatch(self, batch: list[_Pending]) -> None:
+        try:
+            results = await asyncio.to_thread(self._compute, batch)
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning("Bulk micro-batch failed, retrying %d requests separately: %s", len(batch), e)
+                for item in batch:
+                    await self._dispatch([item])
+                return
+            logger.exception("Bulk micro-batch failed: %s", e)
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+        for item, encoded in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(encoded)
+
+    def _compute(self, batch: list[_Pending]) -> list[bytes]:
+        """micro-batch의 프로필을 이어 붙여 한 번에 계산하고 요청 조각별 NDJSON 바이트로 나눈다."""
+        sizes = [item.users.num_rows for item in batch]
+        table = pa.concat_tables([item.users for item in batch])
+        top_k = np.repeat([item.top_k for item in batch], sizes)
+        ranked = self._recommender.recommend_many(users_frame(table), top_k)
+        logger.debug("Bulk micro-batch: %d requests, %d users", len(batch), table.num_rows)
+        bounds = np.concatenate([[0], np.cumsum(sizes)])
+        return [
+            _ndjson_chunk(item.users, ranked.slice_users(int(start), int(stop)))
+            for item, start, stop in zip(batch, bounds[:-1], bounds[1:])
+        ]
+
+
+bulk_batcher = MicroBatcher(online_recommender, settings.BULK_MAX_WAIT_MS, settings.BULK_MAX_BATCH_USERS)
+
+
+async def close_bulk_batcher() -> None:
+    """앱 lifespan 종료 시 bulk micro-batch 처리 태스크를 멈춘다."""
+    await bulk_batcher.close()
+
+
+async def open_bulk_stream(batcher: MicroBatcher, users: pa.Table, top_k: int) -> AsyncIterator[bytes]:
+    """bulk 요청을 micro-batch에 넣고, 첫 조각 결과가 나오면 NDJSON 스트림을 돌려준다.
+
+    첫 조각은 응답을 시작하기 전에 기다리므로 실패하면 일반 에러 응답(503/500)이 된다.
+    그 뒤 조각이 실패하면 200 응답을 잘라내지 않고 남은 사용자 id를 담은 에러 줄을 쓴 뒤 스트림을 끝낸다.
+    조각마다 그 시점 카탈로그로 계산하므로 큰 요청 도중 카탈로그가 바뀌면 줄마다 catalog_version이 다를 수 있다.
+
+    Raises:
+        CatalogNotReadyError: 카탈로그가 로드되지 않았을 때
+        ScoringError: 첫 조각 계산이 실패했을 때
+    """
+    chunks = batcher.submit(users, top_k)
+    try:
+        first = await anext(chunks)
+    except CatalogNotReadyError:
+        await chunks.aclose()
+        raise
+    except Exception as e:
+        await chunks.aclose()
+        raise ScoringError(f"Bulk recommendation failed: {e}") from e
+    return _stream_chunks(users, first, chunks)
+
+
+async def _stream_chunks(
+    users: pa.Table,
+    first: tuple[pa.Table, bytes],
+    chunks: AsyncIterator[tuple[pa.Table, bytes]],
+) -> AsyncIterator[bytes]:
+    chunk_users, encoded = first
+    yield encoded
+    done = chunk_users.num_rows
+    try:
+        async for chunk_users, encoded in chunks:
+            yield encoded
+            done += chunk_users.num_rows
+    except Exception as e:
+        logger.error("Bulk recommendation stream failed after %d of %d users: %s", done, users.num_rows, e)
+        yield (json.dumps({
+            "error": "SCORING_ERROR",
+            "detail": str(e),
+            "user_ids": users["id"].slice(done).to_pylist(),
+        }, ensure_ascii=False) + "\n").encode()
@@ -0,0 +1,43 @@
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pipeline_executor: ProcessPoolExecutor | None = None
+
+
+def _init_pipeline_process() -> None:
+    """파이프라인 프로세스에도 API 프로세스와 같은 JSON 로깅을 설정한다."""
+    # spawn된 자식에서만 호출되므로 app.main을 여기서 가져와도 순환 import가 생기지 않는다.
+    from app.main import setup_logging
+
+    setup_logging()
+
+
+def get_pipeline_executor() -> Executor:
+    """CPU 연산(로드·파이프라인·결과 업로드)을 돌릴 전용 프로세스 풀을 반환한다.
+
+    이벤트 루프가 있는 API 프로세스와 GIL을 공유하지 않도록 별도 프로세스에서 실행한다.
+    처음 호출될 때 만들고, 워커 프로세스는 배치가 끝나도 유지되어 모듈 수준 캐시를 재사용한다.
+    """
+    global _pipeline_executor
+    if _pipeline_executor is None:
+        _pipeline_executor = ProcessPoolExecutor(
+            max_workers=settings.PIPELINE_EXECUTOR_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_pipeline_process,
+        )
+        logger.info("Pipeline executor started: %d processes", settings.PIPELINE_EXECUTOR_PROCESSES)
+    return _pipeline_executor
+
+
+def shutdown_pipeline_executor() -> None:
+    """파이프라인 프로세스 풀을 종료한다 (실행 중인 작업은 끝날 때까지 기다린다)."""
+    global _pipeline_executor
+    if _pipeline_executor is not None:
+        _pipeline_executor.shutdown(wait=True, cancel_futures=True)
+        _pipeline_executor = None
+        logger.info("Pipeline executor stopped")
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+
+from app.config import settings
+from app.schemas.request import ProcessRequest
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+ACTIVE_STATES = {JobState.QUEUED, JobState.RUNNING}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class Job:
+    """batch_id 하나에 대한 추천 작업의 상태·단계·시각 기록."""
+
+    request: ProcessRequest
+    state: JobState = JobState.QUEUED
+    stage: str | None = None
+    created_at: datetime = field(default_factory=_now)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result_file_path: str | None = None
+    error_message: str | None = None
+
+    @property
+    def batch_id(self) -> str:
+        return self.request.batch_id
+
+    @property
+    def finished(self) -> bool:
+        return self.state not in ACTIVE_STATES
+
+    def set_stage(self, stage: str) -> None:
+        """현재 실행 단계를 기록한다."""
+        self.stage = stage
+        logger.info("[batch_id=%s] Stage: %s", self.batch_id, stage)
+
+    def succeed(self, result_file_path: str | None) -> None:
+        self.state = JobState.SUCCEEDED
+        self.result_file_path = result_file_path
+        self.finished_at = _now()
+
+    def fail(self, error: Exception) -> None:
+        self.state = JobState.FAILED
+        self.error_message = f"{type(error).__name__}: {error}"
+        self.finished_at = _now()
+
+
+JobRunner = Callable[[ProcessRequest, Job], Awaitable[None]]
+
+
+class JobManager:
+    """추천 작업을 batch_id로 중복 제거하고, 최대 max_concurrent개씩 FIFO 순서로 실행한다.
+
+    진행 중이거나 성공한 batch_id가 다시 들어오면 기존 작업을 그대로 돌려주고,
+    실패한 batch_id만 새 작업으로 다시 받는다. 끝난 작업은 최근 history_size개만 남긴다.
+    """
+
+    def __init__(self, max_concurrent: int, history_size: int = 1_000) -> None:
+        if max_concurrent <= 0:
+            raise ValueError(f"max_concurrent must be positive: {max_concurrent}")
+        self._max_concurrent = max_concurrent
+        self._history_size = history_size
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: deque[tuple[Job, JobRunner]] = deque()
+        self._running = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, request: ProcessRequest, runner: JobRunner) -> tuple[Job, bool]:
+        """작업을 등록하고 자리가 있으면 바로 시작한다. 이벤트 루프 안에서 호출해야 한다.
+
+        Args:
+            request: 추천 연산 요청
+            runner: (request, job)을 받아 작업을 실행하고 job.succeed/fail로 결과를 기록하는 코루틴 함수
+
+        Returns:
+            (작업, 새로 등록되었는지 여부)
+        """
+        existing = self._jobs.get(request.batch_id)
+        if existing is not None and existing.state != JobState.FAILED:
+            logger.info("[batch_id=%s] Duplicate request ignored (state=%s)", request.batch_id, existing.state.value)
+            return existing, False
+
+        job = Job(request=request)
+        self._jobs[request.batch_id] = job
+        self._jobs.move_to_end(request.batch_id)
+        self._queue.append((job, runner))
+        logger.info("[batch_id=%s] Job queued (%d queued, %d running)",
+                    job.batch_id, len(self._queue), self._running)
+        self._dispatch()
+        return job, True
+
+    def get(self, batch_id: str) -> Job | None:
+        return self._jobs.get(batch_id)
+
+    def queue_position(self, batch_id: str) -> int | None:
+        """대기 중인 작업의 대기열 순번(1부터). 대기 중이 아니면 None."""
+        for position, (job, _) in enumerate(self._queue, start=1):
+            if job.batch_id == batch_id:
+                return position
+        return None
+
+    @property
+    def running_count(self) -> int:
+        return self._running
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._queue)
+
+    def _dispatch(self) -> None:
+        while self._queue and self._running < self._max_concurrent:
+            job, runner = self._queue.popleft()
+            self._running += 1
+            task = asyncio.get_running_loop().create_task(self._run(job, runner))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: Job, runner: JobRunner) -> None:
+        job.state = JobState.RUNNING
+        job.started_at = _now()
+        try:
+            await runner(job.request, job)
+            if not job.finished:
+                job.succeed(job.result_file_path)
+        except Exception as e:
+            logger.exception("[batch_id=%s] Job crashed: %s", job.batch_id, e)
+            job.fail(e)
+        except asyncio.CancelledError:
+            job.fail(RuntimeError("job cancelled"))
+            raise
+        finally:
+            self._running -= 1
+            if job.started_at is not None and job.finished_at is not None:
+                logger.info("[batch_id=%s] Job %s in %.1fs", job.batch_id, job.state.value,
+                            (job.finished_at - job.started_at).total_seconds())
+            else:
+                # runner가 상태만 바꾸고 시각을 남기지 않은 경우에도 원래 예외를 가리지 않는다.
+                logger.info("[batch_id=%s] Job %s", job.batch_id, job.state.value)
+            self._evict_finished()
+            self._dispatch()
+
+    def _evict_finished(self) -> None:
+        finished = [batch_id for batch_id, job in self._jobs.items() if job.finished]
+        for batch_id in finished[:max(len(finished) - self._history_size, 0)]:
+            del self._jobs[batch_id]
+
+
+job_manager = JobManager(settings.JOB_MAX_CONCURRENT, settings.JOB_HISTORY_SIZE)
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy.sparse as sp
+
+from app.config import Settings, settings
+from app.core.adjuster import LevelWeightAdjuster, level_codes
+from app.core.filter import build_exclusion_matrix
+from app.core.pipeline import first_open_slots, top_k_per_user
+from app.core.vectorizer import CourseModel, build_course_model
+from app.exceptions.handlers import CatalogNotReadyError
+from app.infra.loader import DatasetLoader
+from app.infra.model_cache import catalog_fingerprint
+from app.infra.storage import StorageClient
+from app.schemas.request import RecommendRequest
+from app.schemas.response import RecommendationItem, RecommendResponse
+from app.services.process_service import course_model_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """온라인 추천에 쓰는 강의 카탈로그 한 버전. 만든 뒤에는 읽기만 하므로 요청 간에 공유한다."""
+
+    fingerprint: str
+    course_ids: np.ndarray
+    course_index: pd.Index
+    course_levels: np.ndarray
+    course_model: CourseModel
+    etag: str | None = None
+    loaded_at: datetime = field(default_factory=_now)
+
+    @property
+    def num_courses(self) -> int:
+        return len(self.course_ids)
+
+    @classmethod
+    def build(
+        cls,
+        courses: pd.DataFrame,
+        fingerprint: str,
+        etag: str | None = None,
+        course_model: CourseModel | None = None,
+    ) -> "CatalogSnapshot":
+        """강의 DataFrame으로 CourseModel·역색인·id 조회표를 미리 만들어 둔다."""
+        if course_model is None:
+            course_model = build_course_model(courses, fingerprint)
+        # 첫 요청이 역색인·해시 테이블 생성 비용을 떠안지 않도록 여기서 만든다.
+        _ = course_model.index
+        # 요청의 구매·개설 강의 id는 문자열이므로, 숫자 id 카탈로그도 문자열로 맞춰야 제외가 걸린다.
+        course_ids = courses["id"].astype(str).to_numpy(dtype=object)
+        course_index = pd.Index(course_ids)
+        course_index.get_indexer(course_ids[:1])
+        return cls(
+            fingerprint=fingerprint,
+            course_ids=course_ids,
+            course_index=course_index,
+            course_levels=level_codes(courses),
+            course_model=course_model,
+            etag=etag,
+        )
+
+
+@dataclass(frozen=True)
+class RankedBatch:
+    """여러 사용자의 추천 결과. 배열은 user_idx 오름차순, 같은 사용자 안에서는 rank 순이다."""
+
+    catalog_version: str
+    user_idx: np.ndarray
+    course_ids: np.ndarray
+    scores: np.ndarray
+    ranks: np.ndarray
+
+    def slice_users(self, start: int, stop: int) -> "RankedBatch":
+        """사용자 행 위치 [start, stop) 구간만 잘라 user_idx를 start 기준으로 다시 매긴다."""
+        lo, hi = np.searchsorted(self.user_idx, [start, stop])
+        return RankedBatch(
+            catalog_version=self.catalog_version,
+            user_idx=self.user_idx[lo:hi] - start,
+            course_ids=self.course_ids[lo:hi],
+            scores=self.scores[lo:hi],
+            ranks=self.ranks[lo:hi],
+        )
+
+
+class OnlineRecommender:
+    """미리 올려 둔 카탈로그 스냅샷으로 사용자 한 명(또는 몇천 명)의 추천을 바로 계산한다.
+
+    TF-IDF 점수 → 구매·제작 강의 제외 → 레벨 보정 → top_k 순서는 배치와 같고, 후보는 태그 역색인에서
+    보정 후 점수 기준으로 바로 찾는다. 다만 배치 결과와 항상 같지는 않다.
+    - IDF는 항상 카탈로그 강의만으로 학습한다. 배치는 COURSE_MODEL_CACHE_DIR을 설정했을 때만 같은 IDF를 쓰고,
+      기본값이면 배치 사용자+강의로 학습하므로 점수가 다르다.
+    - 추천이 top_k보다 적으면 점수 0으로 채우되, 배치처럼 배치 사용자의 구매 빈도순이 아니라
+      카탈로그 순서로 채운다 (온라인에는 구매 빈도를 낼 사용자 집합이 없다).
+    스냅샷 교체는 참조 한 번 바꾸기라 진행 중인 요청은 이전 스냅샷으로 끝난다.
+    """
+
+    def __init__(self, penalty_weights: list[float] | None = None) -> None:
+        self._adjuster = LevelWeightAdjuster(penalty_weights)
+        self._snapshot: CatalogSnapshot | None = None
+
+    @property
+    def snapshot(self) -> CatalogSnapshot | None:
+        return self._snapshot
+
+    def load(self, snapshot: CatalogSnapshot) -> None:
+        """새 카탈로그 스냅샷으로 교체한다."""
+        self._snapshot = snapshot
+        logger.info("Online catalog loaded: fingerprint=%s, %d courses", snapshot.fingerprint, snapshot.num_courses)
+
+    def recommend(self, request: RecommendRequest) -> RecommendResponse:
+        """사용자 프로필 하나에 대한 top_k 추천을 계산한다."""
+        snapshot = self._require_snapshot()
+        user_vectors = snapshot.course_model.vectorizer().transform(
+            pa.array([request.interest_tags], type=pa.list_(pa.int64()))
+        )
+        excluded = snapshot.course_index.get_indexer(request.purchased_course_ids + request.created_course_ids)
+        excluded = np.unique(excluded[excluded >= 0])
+        exclusions = sp.csr_matrix(
+            (np.ones(len(excluded), dtype=bool), (np.zeros(len(excluded), dtype=np.int64), excluded)),
+            shape=(1, snapshot.num_courses),
+        )
+        ranked = self._rank(
+            snapshot, user_vectors, np.array([request.level], dtype=np.int8), exclusions, np.array([request.top_k]),
+        )
+        return RecommendResponse(
+            user_id=request.user_id,
+            catalog_version=ranked.catalog_version,
+            recommendations=[
+                RecommendationItem(course_id=str(c), score=float(s), rank=int(r))
+                for c, s, r in zip(ranked.course_ids, ranked.scores, ranked.ranks)
+            ],
+        )
+
+    def recommend_many(self, users: pd.DataFrame, top_k: np.ndarray) -> RankedBatch:
+        """여러 사용자 프로필의 추천을 태그 벡터화·역색인 조회 한 번으로 계산한다.
+
+        Args:
+            users: 배치 사용자 파일과 같은 컬럼(interest_tags, level, purchased_course_ids, created_course_ids)
+            top_k: users 행 위치에 정렬된 사용자별 추천 개수
+
+        Returns:
+            users 행 위치 기준 RankedBatch
+        """
+        snapshot = self._require_snapshot()
+        user_vectors = snapshot.course_model.vectorizer().transform(users["interest_tags"])
+        exclusions = build_exclusion_matrix(users, snapshot.course_index)
+        return self._rank(snapshot, user_vectors, level_codes(users), exclusions, np.asarray(top_k, dtype=np.int64))
+
+    def _require_snapshot(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            raise CatalogNotReadyError("Online course catalog is not loaded yet")
+        return snapshot
+
+    def _rank(
+        self,
+        snapshot: CatalogSnapshot,
+        user_vectors: sp.csr_matrix,
+        user_levels: np.ndarray,
+        exclusions: sp.csr_matrix,
+        top_k: np.ndarray,
+    ) -> RankedBatch:
+        """역색인에서 보정 후 점수 상위 후보를 찾고, 모자란 사용자는 카탈로그 순서로 채운다."""
+
+        def adjust(scores: np.ndarray, user_idx: np.ndarray, course_idx: np.ndarray) -> np.ndarray:
+            return self._adjuster.apply_penalty(scores, user_idx, course_idx, user_levels, snapshot.course_levels)
+
+        max_k = int(top_k.max())
+        user_idx, course_idx, raw = snapshot.course_model.index.search(user_vectors, max_k, exclusions, adjust)
+        user_idx, course_idx, scores, ranks = top_k_per_user(
+            user_idx, course_idx, adjust(raw, user_idx, course_idx), max_k,
+        )
+        keep = ranks <= top_k[user_idx]
+        user_idx, course_idx, scores, ranks = user_idx[keep], course_idx[keep], scores[keep], ranks[keep]
+
+        fill_user, fill_course, fill_rank = _fill_catalog_order(
+            snapshot.num_courses, exclusions, user_idx, course_idx, top_k,
+        )
+        if len(fill_user):
+            user_idx = np.concatenate([user_idx, fill_user])
+            course_idx = np.concatenate([course_idx, fill_course])
+            scores = np.concatenate([scores, np.zeros(len(fill_user))])
+            ranks = np.concatenate([ranks, fill_rank])
+            order = np.lexsort((ranks, user_idx))
+            user_idx, course_idx, scores, ranks = user_idx[order], course_idx[order], scores[order], ranks[order]
+
+        return RankedBatch(
+            catalog_version=snapshot.fingerprint,
+            user_idx=user_idx,
+            course_ids=snapshot.course_ids[course_idx],
+            scores=scores,
+            ranks=ranks,
+        )
+
+
+def _fill_catalog_order(
+    num_courses: int,
+    exclusions: sp.csr_matrix,
+    user_idx: np.ndarray,
+    course_idx: np.ndarray,
+    top_k: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """추천이 top_k보다 적은 사용자에게 제외·이미 추천된 강의를 뺀 카탈로그 앞쪽 강의를 채운다.
+
+    Returns:
+        (user_idx, course_idx, rank) — 기존 추천 뒤에 이어지는 rank
+    """
+    counts = np.bincount(user_idx, minlength=len(top_k))
+    need = top_k - counts
+    needy = np.flatnonzero(need > 0)
+    if len(needy) == 0:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty
+
+    chosen = sp.csr_matrix(
+        (np.ones(len(user_idx), dtype=bool), (user_idx, course_idx)), shape=(len(top_k), num_courses),
+    )
+    blocked = (exclusions.astype(bool) + chosen)[needy].tocsr()
+    rows, cols, order = first_open_slots(np.diff(blocked.indptr), blocked.indices, need[needy], num_courses)
+    return needy[rows], cols.astype(np.int64), counts[needy][rows] + order
+
+
+online_recommender = OnlineRecommender(settings.PENALTY_WEIGHTS)
+
+
+def load_catalog_snapshot(storage: StorageClient, key: str, etag: str | None = None) -> CatalogSnapshot:
+    """R2의 강의 파일을 내려받아 카탈로그 스냅샷을 만든다. 블로킹 함수이므로 스레드에서 호출한다."""
+    loader = DatasetLoader(
+        arrow_lists=settings.LOADER_ARROW_LISTS,
+        compact_dtypes=settings.LOADER_COMPACT_DTYPES,
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = storage.download_file(key, Path(tmp_dir) / "courses.parquet")
+        courses = loader.load_courses(local_path)
+        fingerprint = catalog_fingerprint(local_path)
+    course_model = None
+    if course_model_cache is not None:
+        course_model = course_model_cache.get_or_build(fingerprint, courses)
+    return CatalogSnapshot.build(courses, fingerprint, etag=etag, course_model=course_model)
+
+
+async def refresh_catalog(recommender: OnlineRecommender, storage: StorageClient, key: str) -> bool:
+    """R2 카탈로그의 ETag가 바뀌었으면 새 스냅샷을 만들어 교체한다.
+
+    Returns:
+        스냅샷을 교체했으면 True
+    """
+    etag = await asyncio.to_thread(storage.head_etag, key)
+    current = recommender.snapshot
+    if current is not None and current.etag == etag:
+        return False
+    snapshot = await asyncio.to_thread(load_catalog_snapshot, storage, key, etag)
+    recommender.load(snapshot)
+    return True
+
+
+async def _poll_catalog(settings: Settings) -> None:
+    storage = StorageClient(settings)
+    while True:
+        try:
+            await refresh_catalog(online_recommender, storage, settings.ONLINE_CATALOG_KEY)
+        except Exception as e:
+            logger.exception("Online catalog refresh failed: %s", e)
+        await asyncio.sleep(settings.ONLINE_CATALOG_POLL_SEC)
+
+
+_refresh_task: asyncio.Task | None = None
+
+
+def open_catalog_refresher(settings: Settings) -> asyncio.Task | None:
+    """앱 lifespan 시작 시 온라인 카탈로그 로드·주기적 갱신 태스크를 시작한다."""
+    global _refresh_task
+    if settings.ONLINE_CATALOG_KEY and _refresh_task is None:
+        _refresh_task = asyncio.get_running_loop().create_task(_poll_catalog(settings))
+        logger.info("Online catalog refresher started: key=%s", settings.ONLINE_CATALOG_KEY)
+    return _refresh_task
+
+
+async def close_catalog_refresher() -> None:
+    """앱 lifespan 종료 시 카탈로그 갱신 태스크를 멈춘다."""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+        logger.info("Online catalog refresher stopped")
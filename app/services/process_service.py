@@ -1,77 +1,268 @@
+import asyncio
+import hashlib
+import json
 import logging
 import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from app.config import settings
 from app.core.adjuster import LevelWeightAdjuster
+from app.core.delta import changed_user_mask
 from app.core.filter import ExclusionFilter
 from app.core.pipeline import RecommendationPipeline
 from app.core.scorer import TfidfScorer
+from app.core.vectorizer import build_course_model
 from app.infra.callback import CallbackClient
+from app.infra.dataset_cache import DatasetCache, dataset_cache_key
 from app.infra.loader import DatasetLoader
+from app.infra.model_cache import CourseModelCache, catalog_fingerprint
 from app.infra.storage import StorageClient
+from app.infra.writer import RESULT_FINGERPRINT_KEY, ParquetResultWriter, iter_result_row_groups, read_result_metadata
 from app.schemas.request import ProcessRequest
 from app.schemas.response import CallbackFailurePayload, CallbackSuccessPayload
+from app.services.executor import get_pipeline_executor
+from app.services.job_manager import Job
 
 logger = logging.getLogger(__name__)
 
+course_model_cache: CourseModelCache | None = (
+    CourseModelCache(Path(settings.COURSE_MODEL_CACHE_DIR), settings.COURSE_MODEL_CACHE_MAX_ENTRIES)
+    if settings.COURSE_MODEL_CACHE_DIR
+    else None
+)
 
-async def run_recommendation_process(request: ProcessRequest) -> None:
+dataset_cache: DatasetCache | None = (
+    DatasetCache(
+        Path(settings.DATASET_CACHE_DIR),
+        settings.dataset_cache_max_bytes,
+        settings.DATASET_CACHE_MEMORY_ENTRIES,
+    )
+    if settings.DATASET_CACHE_DIR
+    else None
+)
+
+
+@dataclass(frozen=True)
+class DatasetSource:
+    """R2 입력 파일 하나. etag는 데이터셋 캐시를 쓸 때만 HEAD로 채운다."""
+
+    kind: str
+    key: str
+    local_path: Path
+    etag: str | None = None
+
+    @property
+    def cache_key(self) -> str | None:
+        """파싱 설정까지 포함한 데이터셋 캐시 키 (캐시를 쓰지 않으면 None)."""
+        if dataset_cache is None or self.etag is None:
+            return None
+        variant = f"{self.kind}:arrow_lists={settings.LOADER_ARROW_LISTS}:compact={settings.LOADER_COMPACT_DTYPES}"
+        return dataset_cache_key(self.key, self.etag, variant)
+
+
+def _load_dataset(source: DatasetSource, load: Callable[[Path], pd.DataFrame], storage: StorageClient) -> pd.DataFrame:
+    """캐시에 있으면 캐시에서, 없으면 로컬 파일을 파싱해 캐시에 넣고 반환한다."""
+
+    def parse() -> pd.DataFrame:
+        # 다운로드 여부를 정한 뒤 다른 작업이 캐시 항목을 지웠을 수 있으므로 파일이 없으면 받는다.
+        if not source.local_path.exists():
+            storage.download_file(source.key, source.local_path)
+        return load(source.local_path)
+
+    cache_key = source.cache_key
+    if cache_key is None:
+        return parse()
+    return dataset_cache.get_or_load(cache_key, parse)
+
+
+def result_fingerprint(catalog: str, top_k: int) -> str:
+    """카탈로그 버전과 추천 결과에 영향을 주는 설정으로 결과 fingerprint를 만든다.
+
+    후보 선정 방식(top_n·역색인·over-fetch)도 동점 처리와 후보 집합을 바꿀 수 있으므로 모두 포함한다.
+    """
+    config = {
+        "catalog": catalog,
+        "top_k": top_k,
+        "penalty_weights": settings.PENALTY_WEIGHTS,
+        "scorer_top_n": settings.SCORER_TOP_N,
+        "scorer_use_index": settings.SCORER_USE_INDEX,
+        "pipeline_overfetch": settings.PIPELINE_OVERFETCH,
+    }
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class PreviousRun:
+    """증분 실행에 쓰는 이전 배치의 결과 파일과 사용자 데이터."""
+
+    result_path: Path
+    users_source: DatasetSource
+
+
+def compute_recommendations(
+    request: ProcessRequest,
+    users_source: DatasetSource,
+    courses_source: DatasetSource,
+    previous: PreviousRun | None = None,
+) -> tuple[str, int]:
+    """입력 데이터셋을 로드해 파이프라인을 실행하고 결과를 R2로 스트리밍 업로드한다.
+
+    CPU를 오래 점유하는 동기 작업이므로 파이프라인 전용 프로세스에서 실행한다.
+    previous가 주어지고 이전 결과가 같은 카탈로그·설정으로 만들어졌으면 프로필이 바뀐 사용자와
+    새 사용자만 다시 계산하고, 나머지 사용자는 이전 결과 행을 그대로 이어 쓴다.
+
+    Returns:
+        (업로드된 결과 오브젝트 키, 추천을 받은 사용자 수)
+    """
+    storage = StorageClient(settings)
+    loader = DatasetLoader(
+        arrow_lists=settings.LOADER_ARROW_LISTS,
+        compact_dtypes=settings.LOADER_COMPACT_DTYPES,
+    )
+
+    # 2. DataFrame 로드 (데이터셋 캐시 우선)
+    users_df = _load_dataset(users_source, loader.load_users, storage)
+    courses_df = _load_dataset(courses_source, loader.load_courses, storage)
+
+    # 3. 파이프라인 실행
+    # 증분 실행은 IDF가 배치 사용자 구성에 따라 바뀌지 않도록 카탈로그 기준 CourseModel을 쓴다.
+    course_model = None
+    if course_model_cache is not None or previous is not None:
+        fingerprint = courses_source.cache_key or catalog_fingerprint(courses_source.local_path)
+        if course_model_cache is not None:
+            course_model = course_model_cache.get_or_build(fingerprint, courses_df)
+        else:
+            course_model = build_course_model(courses_df, fingerprint)
+
+    metadata = {}
+    if course_model is not None:
+        metadata[RESULT_FINGERPRINT_KEY] = result_fingerprint(course_model.fingerprint, request.top_k)
+
+    users_to_score, reused_user_ids = users_df, None
+    if previous is not None:
+        previous_fingerprint = read_result_metadata(previous.result_path).get(RESULT_FINGERPRINT_KEY)
+        if previous_fingerprint == metadata[RESULT_FINGERPRINT_KEY]:
+            previous_users = _load_dataset(previous.users_source, loader.load_users, storage)
+            changed = changed_user_mask(users_df, previous_users)
+            users_to_score = users_df.loc[changed].reset_index(drop=True)
+            reused_user_ids = np.asarray(users_df["id"], dtype=object)[~changed]
+        else:
+            logger.info("[batch_id=%s] Catalog or settings changed since previous result, recomputing all users",
+                        request.batch_id)
+
+    adjuster = LevelWeightAdjuster(settings.PENALTY_WEIGHTS)
+    pipeline = RecommendationPipeline(
+        scorer=TfidfScorer(
+            top_n=settings.SCORER_TOP_N,
+            block_size=settings.SCORER_BLOCK_SIZE,
+            course_model=course_model,
+            use_index=settings.SCORER_USE_INDEX,
+            rank_adjuster=adjuster,
+        ),
+        filter_=ExclusionFilter(),
+        adjuster=adjuster,
+        workers=settings.PIPELINE_WORKERS,
+        memory_budget_bytes=settings.pipeline_memory_budget_bytes,
+        overfetch=settings.PIPELINE_OVERFETCH,
+    )
+    # 4. 결과 Parquet을 청크마다 row group으로 만들어 R2 multipart 업로드로 바로 전송
+    today = datetime.utcnow().strftime("%Y/%m/%d")
+    result_key = f"results/{today}/{request.batch_id}/recommendations.parquet"
+    with storage.open_upload(result_key) as upload, ParquetResultWriter(upload, metadata=metadata) as writer:
+        if reused_user_ids is not None:
+            for chunk in iter_result_row_groups(previous.result_path, reused_user_ids):
+                writer.write(chunk)
+            logger.info("[batch_id=%s] Reused previous results for %d users, recomputing %d",
+                        request.batch_id, writer.user_count, len(users_to_score))
+        if len(users_to_score):
+            for chunk in pipeline.iter_results(users_to_score, courses_df, top_k=request.top_k,
+                                               popularity_users=users_df):
+                writer.write(chunk)
+    return result_key, writer.user_count
+
+
+async def run_recommendation_process(request: ProcessRequest, job: Job | None = None) -> None:
     """추천 프로세스 전체를 실행한다: download → pipeline → upload → callback.
 
+    이전 결과·사용자 경로가 있으면 이전 결과를 재사용하는 증분 실행을 한다.
+
+    블로킹 다운로드는 스레드에서, 로드·파이프라인·업로드는 파이프라인 프로세스에서 실행해
+    배치가 도는 동안에도 이벤트 루프가 다른 요청에 응답할 수 있게 한다.
+
     Args:
         request: 추천 연산 요청 정보
+        job: 진행 단계와 결과를 기록할 작업 (JobManager로 실행할 때)
     """
     batch_id = request.batch_id
     logger.info("[batch_id=%s] Process started", batch_id)
 
     storage = StorageClient(settings)
-    loader = DatasetLoader()
     callback = CallbackClient(settings)
+    loop = asyncio.get_running_loop()
 
     try:
-        # 1. R2에서 파일 다운로드
+        # 1. R2에서 파일 동시 다운로드 (데이터셋 캐시에 있는 ETag면 생략)
+        if job is not None:
+            job.set_stage("download")
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
-            users_path = storage.download_file(request.users_file_path, tmp_path / "users.parquet")
-            courses_path = storage.download_file(request.courses_file_path, tmp_path / "courses.parquet")
-
-            # 2. DataFrame 로드
-            users_df = loader.load_users(users_path)
-            courses_df = loader.load_courses(courses_path)
-
-            # 3. 파이프라인 실행
-            pipeline = RecommendationPipeline(
-                scorer=TfidfScorer(),
-                filter_=ExclusionFilter(),
-                adjuster=LevelWeightAdjuster(settings.PENALTY_WEIGHTS),
-            )
-            result_df = pipeline.run(users_df, courses_df, top_k=request.top_k)
+            sources = [
+                DatasetSource("users", request.users_file_path, tmp_path / "users.parquet"),
+                DatasetSource("courses", request.courses_file_path, tmp_path / "courses.parquet"),
+            ]
+            if request.incremental:
+                sources.append(DatasetSource("users", request.previous_users_file_path,
+                                             tmp_path / "previous_users.parquet"))
+            if dataset_cache is not None:
+                etags = await asyncio.gather(*(asyncio.to_thread(storage.head_etag, s.key) for s in sources))
+                sources = [replace(s, etag=etag) for s, etag in zip(sources, etags)]
+            targets = [
+                (s.key, s.local_path) for s in sources
+                if s.cache_key is None or not dataset_cache.contains(s.cache_key)
+            ]
+            previous = None
+            if request.incremental:
+                previous = PreviousRun(tmp_path / "previous_result.parquet", sources[2])
+                targets.append((request.previous_result_file_path, previous.result_path))
+            if targets:
+                await asyncio.to_thread(storage.download_files, targets)
+            users_source, courses_source = sources[:2]
 
-            # 4. 결과 Parquet 저장 & 업로드
-            result_path = tmp_path / "recommendations.parquet"
-            result_df.to_parquet(result_path, index=False)
+            # 2~4. 로드 → 파이프라인 → 결과 업로드
+            if job is not None:
+                job.set_stage("pipeline")
+            result_key, user_count = await loop.run_in_executor(
+                get_pipeline_executor(), compute_recommendations, request, users_source, courses_source, previous
+            )
 
-            today = datetime.utcnow().strftime("%Y/%m/%d")
-            result_key = f"results/{today}/{batch_id}/recommendations.parquet"
-            storage.upload_file(result_path, result_key)
+        if job is not None:
+            job.result_file_path = result_key
 
         # 5. 성공 콜백
         if request.callback_url:
+            if job is not None:
+                job.set_stage("callback")
             payload = CallbackSuccessPayload(
                 batch_id=batch_id,
                 result_file_path=result_key,
-                user_count=result_df["user_id"].nunique(),
+                user_count=user_count,
             )
             await callback.send_success(request.callback_url, payload)
 
+        if job is not None:
+            job.succeed(result_key)
         logger.info("[batch_id=%s] Process completed successfully", batch_id)
 
     except Exception as e:
         logger.exception("[batch_id=%s] Process failed: %s", batch_id, e)
+        if job is not None:
+            job.fail(e)
         if request.callback_url:
             error_code = type(e).__name__.upper()
             payload = CallbackFailurePayload(
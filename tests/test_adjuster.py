@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from app.core.adjuster import LevelWeightAdjuster
+from app.core.adjuster import LevelWeightAdjuster, level_codes
 
 
 class TestLevelWeightAdjuster:
@@ -43,3 +45,51 @@ class TestLevelWeightAdjuster:
         result = adjuster.adjust(scores, users, courses)
 
         assert abs(result.iloc[0]["score"] - 0.70) < 1e-9
+
+    def test_adjust_arrays_matches_adjust(self):
+        users = pd.DataFrame([{"id": "u1", "level": 0}, {"id": "u2", "level": 3}])
+        courses = pd.DataFrame([{"id": "c1", "level": 1}, {"id": "c2", "level": 3}])
+        user_idx = np.array([0, 0, 1, 1])
+        course_idx = np.array([0, 1, 0, 1])
+        scores = np.array([1.0, 1.0, 0.5, 0.5])
+
+        adjuster = LevelWeightAdjuster()
+        result = adjuster.adjust_arrays(scores, user_idx, course_idx, users, courses)
+
+        assert result == pytest.approx([0.85, 0.15, 0.25, 0.5])
+
+    def test_level_codes_downcasts_to_int8(self):
+        codes = level_codes(pd.DataFrame({"level": [0, 3, 127]}))
+
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [0, 3, 127]
+
+    @pytest.mark.parametrize("levels, message", [
+        ([0, 300], "int8 range"),
+        ([-200, 1], "int8 range"),
+        ([0.0, np.nan], "missing values"),
+    ])
+    def test_level_codes_rejects_values_int8_cannot_hold(self, levels, message):
+        with pytest.raises(ValueError, match=message):
+            level_codes(pd.DataFrame({"level": levels}))
+
+    def test_apply_penalty_uses_int8_level_lookup(self):
+        user_levels = np.array([0, 3], dtype=np.int8)
+        course_levels = np.array([1, 3, 0], dtype=np.int8)
+        user_idx = np.array([0, 1, 1])
+        course_idx = np.array([0, 1, 2])
+
+        adjuster = LevelWeightAdjuster()
+        result = adjuster.apply_penalty(np.ones(3), user_idx, course_idx, user_levels, course_levels)
+
+        assert result == pytest.approx([0.85, 1.0, 0.15])
+
+    def test_levels_above_default_range_are_clipped(self):
+        scores = pd.DataFrame([{"user_id": "u1", "course_id": "c1", "score": 1.0}])
+        users = pd.DataFrame([{"id": "u1", "level": 0}])
+        courses = pd.DataFrame([{"id": "c1", "level": 5}])
+
+        adjuster = LevelWeightAdjuster()
+        result = adjuster.adjust(scores, users, courses)
+
+        assert abs(result.iloc[0]["score"] - 0.15) < 1e-9
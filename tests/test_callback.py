@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import Settings
+from app.infra import callback as callback_module
+from app.infra.callback import CallbackClient
+from app.schemas.response import CallbackSuccessPayload
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(
+        R2_ENDPOINT_URL="http://r2.local",
+        R2_ACCESS_KEY_ID="key",
+        R2_SECRET_ACCESS_KEY="secret",
+        CALLBACK_TIMEOUT_SEC=5,
+        CALLBACK_TOTAL_TIMEOUT_SEC=30,
+    )
+
+
+def _payload() -> CallbackSuccessPayload:
+    return CallbackSuccessPayload(batch_id="batch_001", result_file_path="results/out.parquet", user_count=3)
+
+
+def _send(settings: Settings, handler, sleeps: list[float]) -> list[httpx.Request]:
+    """MockTransport로 success 콜백을 보내고 들어온 요청 목록을 반환한다."""
+    requests: list[httpx.Request] = []
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(len(requests))
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(record)) as http_client:
+            client = CallbackClient(settings, http_client=http_client)
+            with patch.object(callback_module.asyncio, "sleep", fake_sleep):
+                await client.send_success("http://spring/callback", _payload())
+
+    asyncio.run(scenario())
+    return requests
+
+
+class TestCallbackClient:
+    def test_retries_transient_errors_with_backoff(self, settings: Settings):
+        sleeps: list[float] = []
+
+        def handler(n: int) -> httpx.Response:
+            return httpx.Response(503) if n < 3 else httpx.Response(200)
+
+        with patch.object(callback_module, "backoff_delay", side_effect=[0.5, 1.0]):
+            requests = _send(settings, handler, sleeps)
+
+        assert len(requests) == 3
+        assert sleeps == [0.5, 1.0]
+        assert requests[0].extensions["timeout"]["read"] <= settings.CALLBACK_TIMEOUT_SEC
+
+    def test_client_errors_are_not_retried(self, settings: Settings):
+        sleeps: list[float] = []
+
+        with pytest.raises(httpx.HTTPStatusError):
+            _send(settings, lambda n: httpx.Response(400), sleeps)
+
+        assert sleeps == []
+
+    def test_attempt_timeout_shrinks_to_remaining_budget(self, settings: Settings):
+        sleeps: list[float] = []
+        budget = settings.model_copy(update={"CALLBACK_TOTAL_TIMEOUT_SEC": 2})
+
+        requests = _send(budget, lambda n: httpx.Response(200), sleeps)
+
+        assert requests[0].extensions["timeout"]["read"] <= 2
+
+    def test_reuses_shared_pooled_client(self, settings: Settings):
+        try:
+            first = CallbackClient(settings)
+            second = CallbackClient(settings)
+
+            assert first._http_client is second._http_client
+        finally:
+            asyncio.run(callback_module.close_http_client())
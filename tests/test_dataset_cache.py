@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.infra.dataset_cache import DatasetCache, dataset_cache_key
+from app.infra.loader import DatasetLoader
+
+
+@pytest.fixture
+def users_path(tmp_path: Path, sample_users: pd.DataFrame) -> Path:
+    path = tmp_path / "users.parquet"
+    sample_users.to_parquet(path)
+    return path
+
+
+def _compact_users(path: Path) -> pd.DataFrame:
+    return DatasetLoader(arrow_lists=True, compact_dtypes=True).load_users(path)
+
+
+class TestDatasetCacheKey:
+    def test_changes_with_etag_and_variant(self):
+        key = dataset_cache_key("exports/users.parquet", "etag-1", "users")
+
+        assert key != dataset_cache_key("exports/users.parquet", "etag-2", "users")
+        assert key != dataset_cache_key("exports/users.parquet", "etag-1", "courses")
+
+
+class TestDatasetCache:
+    def test_roundtrip_keeps_compact_dtypes(self, tmp_path: Path, users_path: Path):
+        expected = _compact_users(users_path)
+        DatasetCache(tmp_path / "cache", max_bytes=1 << 30).get_or_load("k1", lambda: expected)
+
+        load = MagicMock()
+        cached = DatasetCache(tmp_path / "cache", max_bytes=1 << 30).get_or_load("k1", load)
+
+        load.assert_not_called()
+        pd.testing.assert_frame_equal(cached, expected)
+
+    def test_object_lists_roundtrip(self, tmp_path: Path, users_path: Path):
+        expected = DatasetLoader().load_users(users_path)
+        DatasetCache(tmp_path, max_bytes=1 << 30).get_or_load("k1", lambda: expected)
+
+        cached = DatasetCache(tmp_path, max_bytes=1 << 30).get_or_load("k1", MagicMock())
+
+        assert [list(v) for v in cached["interest_tags"]] == [list(v) for v in expected["interest_tags"]]
+
+    def test_memory_hit_skips_disk(self, tmp_path: Path, users_path: Path):
+        cache = DatasetCache(tmp_path, max_bytes=1 << 30)
+        first = cache.get_or_load("k1", lambda: _compact_users(users_path))
+        for path in tmp_path.glob("*.arrow"):
+            path.unlink()
+
+        assert cache.get_or_load("k1", MagicMock()) is first
+        assert cache.contains("k1")
+
+    def test_evicts_least_recently_used_over_size_cap(self, tmp_path: Path, users_path: Path):
+        df = _compact_users(users_path)
+        probe = DatasetCache(tmp_path / "probe", max_bytes=1 << 30)
+        probe.get_or_load("probe", lambda: df)
+        entry_size = next((tmp_path / "probe").glob("*.arrow")).stat().st_size
+
+        cache = DatasetCache(tmp_path / "cache", max_bytes=entry_size * 2, memory_entries=0)
+        cache.get_or_load("k1", lambda: df)
+        cache.get_or_load("k2", lambda: df)
+        for path in (tmp_path / "cache").glob("*_k1.arrow"):
+            os.utime(path, (0, 0))
+        cache.get_or_load("k3", lambda: df)
+
+        assert not cache.contains("k1")
+        assert cache.contains("k2")
+        assert cache.contains("k3")
+
+    def test_eviction_skips_files_removed_concurrently(self, tmp_path: Path, users_path: Path):
+        df = _compact_users(users_path)
+        cache = DatasetCache(tmp_path / "cache", max_bytes=1, memory_entries=0)
+        glob = Path.glob
+
+        def glob_with_vanished_file(self, pattern):
+            yield from glob(self, pattern)
+            yield self / "dataset_v1_vanished.arrow"
+
+        with patch.object(Path, "glob", glob_with_vanished_file), \
+                patch.object(Path, "unlink", side_effect=FileNotFoundError):
+            loaded = cache.get_or_load("k1", lambda: df)
+
+        assert loaded is df
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.delta import changed_user_mask, profile_hashes
+from app.core.lists import to_arrow_list_series
+from app.schemas.request import ProcessRequest
+
+
+class TestChangedUserMask:
+    def test_hash_ignores_loader_dtypes(self, sample_users: pd.DataFrame):
+        compact = sample_users.copy()
+        for col in ["interest_tags", "purchased_course_ids", "created_course_ids"]:
+            compact[col] = to_arrow_list_series(sample_users[col])
+        compact["id"] = compact["id"].astype("category")
+        compact["level"] = compact["level"].astype(np.int8)
+
+        assert (profile_hashes(compact) == profile_hashes(sample_users)).all()
+
+    def test_detects_changed_and_new_users(self, sample_users: pd.DataFrame):
+        current = sample_users.copy()
+        current.at[0, "interest_tags"] = [1, 2]
+        current.at[1, "level"] = 3
+        current = pd.concat([current, pd.DataFrame([{
+            "id": "user_004", "interest_tags": [1], "level": 0,
+            "purchased_course_ids": [], "created_course_ids": [],
+        }])], ignore_index=True)
+
+        changed = changed_user_mask(current, sample_users)
+
+        assert changed.tolist() == [True, True, False, True]
+
+    def test_detects_purchase_changes(self, sample_users: pd.DataFrame):
+        current = sample_users.copy()
+        current.at[2, "purchased_course_ids"] = ["course_002"]
+
+        assert changed_user_mask(current, sample_users).tolist() == [False, False, True]
+
+
+class TestProcessRequestIncremental:
+    def test_previous_paths_must_be_given_together(self):
+        with pytest.raises(ValueError, match="together"):
+            ProcessRequest(
+                batch_id="b", users_file_path="u", courses_file_path="c",
+                previous_result_file_path="results/prev.parquet",
+            )
@@ -0,0 +1,20 @@
+import os
+
+from app.services import executor as executor_module
+from app.services.executor import get_pipeline_executor, shutdown_pipeline_executor
+
+
+class TestPipelineExecutor:
+    def test_runs_in_separate_reused_process(self):
+        try:
+            executor = get_pipeline_executor()
+
+            first = executor.submit(os.getpid).result(timeout=60)
+            second = get_pipeline_executor().submit(os.getpid).result(timeout=60)
+
+            assert first != os.getpid()
+            assert first == second
+        finally:
+            shutdown_pipeline_executor()
+
+        assert executor_module._pipeline_executor is None
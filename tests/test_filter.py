@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 
-from app.core.filter import ExclusionFilter
+from app.core.filter import ExclusionFilter, build_exclusion_matrix, mask_block
 
 
 class TestExclusionFilter:
@@ -38,3 +39,41 @@ class TestExclusionFilter:
         result = f.apply(scores, sample_users)
 
         assert len(result) == 2
+
+    def test_mask_matches_apply(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        user_idx = np.array([0, 0, 1, 1, 2])
+        course_idx = np.array([0, 1, 2, 3, 0])
+        scores = np.array([0.9, 0.8, 0.7, 0.6, 0.5])
+
+        f = ExclusionFilter()
+        keep = f.mask(user_idx, course_idx, scores, sample_users, sample_courses)
+
+        assert keep.tolist() == [False, True, False, True, True]
+
+
+class TestExclusionMatrix:
+    def test_builds_user_by_course_matrix(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        matrix = build_exclusion_matrix(sample_users, sample_courses["id"])
+
+        assert matrix.shape == (3, 5)
+        assert sorted(zip(*matrix.nonzero())) == [(0, 0), (1, 2)]
+
+    def test_handles_missing_lists_and_unknown_courses(self):
+        users = pd.DataFrame([
+            {"id": "u1", "purchased_course_ids": None, "created_course_ids": np.array(["c2"])},
+            {"id": "u2", "purchased_course_ids": ["c9", "c1", "c1"], "created_course_ids": []},
+        ])
+
+        matrix = build_exclusion_matrix(users, pd.Index(["c1", "c2"]))
+
+        assert matrix.nnz == 2
+        assert matrix[0, 1] and matrix[1, 0]
+
+    def test_mask_block_overwrites_excluded_cells_in_place(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        matrix = build_exclusion_matrix(sample_users, sample_courses["id"])
+        block = np.ones((2, 5))
+
+        mask_block(block, matrix, row_start=1)
+
+        assert block[0, 2] == 0.0
+        assert block.sum() == 9.0
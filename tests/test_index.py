@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import build_exclusion_matrix
+from app.core.index import TagIndex
+from app.core.vectorizer import TagTfidfVectorizer
+
+
+def _random_catalog(seed: int, num_users: int = 60, num_courses: int = 400, num_tags: int = 30):
+    rng = np.random.default_rng(seed)
+    course_ids = [f"c{i}" for i in range(num_courses)]
+    users = pd.DataFrame({
+        "id": [f"u{i}" for i in range(num_users)],
+        "interest_tags": [list(rng.choice(num_tags, rng.integers(0, 6), replace=False)) for _ in range(num_users)],
+        "level": rng.integers(0, 4, num_users),
+        "purchased_course_ids": [list(rng.choice(course_ids, 5, replace=False)) for _ in range(num_users)],
+        "created_course_ids": [[] for _ in range(num_users)],
+    })
+    courses = pd.DataFrame({
+        "id": course_ids,
+        "tags": [list(rng.choice(num_tags, rng.integers(1, 5), replace=False)) for _ in range(num_courses)],
+        "level": rng.integers(0, 4, num_courses),
+    })
+    return users, courses
+
+
+class TestTagIndex:
+    def test_postings_sorted_by_weight(self, sample_courses: pd.DataFrame):
+        (course_matrix,) = TagTfidfVectorizer().fit_transform(sample_courses["tags"])
+        index = TagIndex.build(course_matrix)
+
+        dense = course_matrix.toarray()
+        for term in range(index.num_terms):
+            lo, hi = index.indptr[term], index.indptr[term + 1]
+            assert set(index.courses[lo:hi]) == set(np.flatnonzero(dense[:, term]))
+            assert np.all(np.diff(index.weights[lo:hi]) <= 0)
+            assert index.max_weights[term] == pytest.approx(dense[:, term].max())
+
+    def test_pair_scores_match_dot_product(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        user_vectors, course_matrix = TagTfidfVectorizer().fit_transform(
+            sample_users["interest_tags"], sample_courses["tags"]
+        )
+        index = TagIndex.build(course_matrix)
+        user_idx, course_idx = (a.ravel() for a in np.indices((3, 5)))
+
+        scores = index.pair_scores(user_vectors, user_idx, course_idx)
+
+        expected = (user_vectors @ course_matrix.T).toarray()[user_idx, course_idx]
+        assert scores == pytest.approx(expected)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_search_matches_brute_force_adjusted_top_n(self, seed: int):
+        users, courses = _random_catalog(seed)
+        user_vectors, course_matrix = TagTfidfVectorizer().fit_transform(users["interest_tags"], courses["tags"])
+        exclusions = build_exclusion_matrix(users, courses["id"])
+        adjuster = LevelWeightAdjuster()
+
+        def adjust(scores, user_idx, course_idx):
+            return adjuster.adjust_arrays(scores, user_idx, course_idx, users, courses)
+
+        user_idx, course_idx, scores = TagIndex.build(course_matrix).search(
+            user_vectors, top_n=7, exclusions=exclusions, adjust=adjust, block_size=16
+        )
+
+        dense = (user_vectors @ course_matrix.T).toarray()
+        dense[exclusions.toarray()] = 0
+        assert scores == pytest.approx(dense[user_idx, course_idx])
+        assert not exclusions[user_idx, course_idx].any()
+        adjusted = adjust(scores, user_idx, course_idx)
+        for user in range(len(users)):
+            rows, cols = np.nonzero(dense[user:user + 1] > 0)
+            all_adjusted = adjust(dense[user, cols], np.full(len(cols), user), cols)
+            expected = np.sort(all_adjusted)[::-1][:7]
+            assert np.sort(adjusted[user_idx == user])[::-1] == pytest.approx(expected)
+
+    def test_search_with_per_user_limits_matches_brute_force(self):
+        users, courses = _random_catalog(3)
+        user_vectors, course_matrix = TagTfidfVectorizer().fit_transform(users["interest_tags"], courses["tags"])
+        limits = np.random.default_rng(3).integers(0, 12, len(users))
+
+        user_idx, course_idx, scores = TagIndex.build(course_matrix).search(user_vectors, limits, block_size=16)
+
+        dense = (user_vectors @ course_matrix.T).toarray()
+        assert scores == pytest.approx(dense[user_idx, course_idx])
+        for user in range(len(users)):
+            row = dense[user]
+            expected = np.sort(row[row > 0])[::-1][:limits[user]]
+            assert np.sort(scores[user_idx == user])[::-1] == pytest.approx(expected)
+
+    def test_search_rejects_score_increasing_adjustment(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        user_vectors, course_matrix = TagTfidfVectorizer().fit_transform(
+            sample_users["interest_tags"], sample_courses["tags"]
+        )
+
+        with pytest.raises(ValueError, match="never increases"):
+            TagIndex.build(course_matrix).search(user_vectors, top_n=2, adjust=lambda s, u, c: s * 2)
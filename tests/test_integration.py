@@ -1,6 +1,7 @@
 """통합 테스트: /engine/process 엔드포인트부터 파이프라인 실행까지."""
 
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -39,6 +40,13 @@ def mock_parquet_files():
 
 
 class TestEngineProcessEndpoint:
+    @pytest.fixture(autouse=True)
+    def job_manager(self):
+        from app.services.job_manager import JobManager
+
+        with patch("app.api.endpoints.engine.job_manager", JobManager(max_concurrent=1)) as manager:
+            yield manager
+
     @patch("app.api.endpoints.engine.run_recommendation_process", new_callable=AsyncMock)
     def test_process_returns_202(self, mock_run, client):
         response = client.post("/engine/process", json={
@@ -109,3 +117,199 @@ class TestFullPipelineIntegration:
         # 각 사용자당 최대 2개
         counts = result.groupby("user_id").size()
         assert (counts <= 2).all()
+
+
+class TestRecommendationProcess:
+    @pytest.fixture
+    def fake_storage(self, mock_parquet_files):
+        """로컬 Parquet 파일을 내려주고 업로드된 결과를 모아 두는 StorageClient Mock."""
+        import io
+        import shutil
+
+        users_path, courses_path = mock_parquet_files
+        sources = {"exports/users.parquet": users_path, "exports/courses.parquet": courses_path}
+        uploaded = {}
+
+        def download_files(targets):
+            for key, local_path in targets:
+                shutil.copy(sources[key], local_path)
+            return [local_path for _, local_path in targets]
+
+        class UploadStream(io.BytesIO):
+            def __init__(self, key):
+                super().__init__()
+                self.key = key
+
+            def __exit__(self, exc_type, *args):
+                if exc_type is None:
+                    uploaded[self.key] = pd.read_parquet(io.BytesIO(self.getvalue()))
+                    mock_storage.uploaded_bytes[self.key] = self.getvalue()
+                return super().__exit__(exc_type, *args)
+
+        mock_storage = MagicMock()
+        mock_storage.sources = sources
+        mock_storage.uploaded_bytes = {}
+        mock_storage.head_etag = MagicMock(return_value="etag-1")
+        mock_storage.download_files = MagicMock(side_effect=download_files)
+        mock_storage.open_upload = MagicMock(side_effect=UploadStream)
+        return mock_storage, uploaded
+
+    @staticmethod
+    def _run(batch_id: str, mock_storage, mock_callback=None, dataset_cache=None, **request_fields) -> None:
+        import asyncio
+
+        from app.schemas.request import ProcessRequest
+        from app.services.process_service import run_recommendation_process
+
+        request = ProcessRequest(**{
+            "batch_id": batch_id,
+            "users_file_path": "exports/users.parquet",
+            "courses_file_path": "exports/courses.parquet",
+            "top_k": 2,
+            "callback_url": "http://spring/callback" if mock_callback is not None else None,
+            **request_fields,
+        })
+        # Mock이 보이도록 파이프라인 프로세스 대신 스레드에서 실행한다.
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                patch("app.services.process_service.get_pipeline_executor", return_value=executor), \
+                patch("app.services.process_service.StorageClient", return_value=mock_storage), \
+                patch("app.services.process_service.CallbackClient", return_value=mock_callback), \
+                patch("app.services.process_service.dataset_cache", dataset_cache):
+            asyncio.run(run_recommendation_process(request))
+
+    def test_writes_and_uploads_result(self, fake_storage):
+        """다운로드 → 파이프라인 → 결과 업로드 → 성공 콜백까지 실행한다."""
+        mock_storage, uploaded = fake_storage
+        mock_callback = MagicMock()
+        mock_callback.send_success = AsyncMock()
+
+        self._run("batch_001", mock_storage, mock_callback)
+
+        (key, result), = uploaded.items()
+        assert key.endswith("batch_001/recommendations.parquet")
+        assert set(result["user_id"]) == {"u1", "u2"}
+        assert (result.groupby("user_id").size() == 2).all()
+
+        payload = mock_callback.send_success.call_args.args[1]
+        assert payload.user_count == 2
+        assert payload.result_file_path == key
+        mock_storage.head_etag.assert_not_called()
+
+    def test_dataset_cache_skips_download_for_same_etag(self, fake_storage, tmp_path):
+        from app.infra.dataset_cache import DatasetCache
+
+        mock_storage, uploaded = fake_storage
+        cache = DatasetCache(tmp_path / "datasets", max_bytes=1 << 30)
+
+        self._run("batch_001", mock_storage, dataset_cache=cache)
+        self._run("batch_002", mock_storage, dataset_cache=cache)
+        mock_storage.head_etag.return_value = "etag-2"
+        self._run("batch_003", mock_storage, dataset_cache=cache)
+
+        assert mock_storage.download_files.call_count == 2
+        assert mock_storage.head_etag.call_count == 6
+        results = [uploaded[key].sort_values(["user_id", "rank"]).reset_index(drop=True)
+                   for key in sorted(uploaded)]
+        pd.testing.assert_frame_equal(results[0], results[1])
+
+    def test_incremental_run_recomputes_only_changed_users(self, fake_storage, tmp_path):
+        from app.core.pipeline import RecommendationPipeline
+        from app.infra.model_cache import CourseModelCache
+
+        mock_storage, uploaded = fake_storage
+        users_path = mock_storage.sources["exports/users.parquet"]
+        changed_users = pd.read_parquet(users_path)
+        changed_users.at[0, "interest_tags"] = [3]
+        changed_users.to_parquet(tmp_path / "users_v2.parquet", index=False)
+        mock_storage.sources["exports/users_v2.parquet"] = tmp_path / "users_v2.parquet"
+
+        iter_results = RecommendationPipeline.iter_results
+        with patch("app.services.process_service.course_model_cache", CourseModelCache(tmp_path / "models", 2)), \
+                patch.object(RecommendationPipeline, "iter_results", autospec=True,
+                             side_effect=iter_results) as spy:
+            self._run("batch_001", mock_storage)
+            (previous_key,) = uploaded
+            (tmp_path / "previous.parquet").write_bytes(mock_storage.uploaded_bytes[previous_key])
+            mock_storage.sources["results/previous.parquet"] = tmp_path / "previous.parquet"
+
+            self._run("batch_002", mock_storage, users_file_path="exports/users_v2.parquet",
+                      previous_result_file_path="results/previous.parquet",
+                      previous_users_file_path="exports/users.parquet")
+
+        assert spy.call_args.args[1]["id"].tolist() == ["u1"]
+        previous, = (uploaded[key] for key in uploaded if "batch_001" in key)
+        current, = (uploaded[key] for key in uploaded if "batch_002" in key)
+        pd.testing.assert_frame_equal(
+            current[current["user_id"] == "u2"].reset_index(drop=True),
+            previous[previous["user_id"] == "u2"].reset_index(drop=True),
+        )
+        assert set(current["user_id"]) == {"u1", "u2"}
+        assert (current.groupby("user_id").size() == 2).all()
+
+    def test_incremental_run_without_matching_fingerprint_recomputes_all(self, fake_storage, tmp_path):
+        from app.core.pipeline import RecommendationPipeline
+
+        mock_storage, uploaded = fake_storage
+        self._run("batch_001", mock_storage)
+        (previous_key,) = uploaded
+        (tmp_path / "previous.parquet").write_bytes(mock_storage.uploaded_bytes[previous_key])
+        mock_storage.sources["results/previous.parquet"] = tmp_path / "previous.parquet"
+
+        iter_results = RecommendationPipeline.iter_results
+        with patch.object(RecommendationPipeline, "iter_results", autospec=True, side_effect=iter_results) as spy:
+            self._run("batch_002", mock_storage,
+                      previous_result_file_path="results/previous.parquet",
+                      previous_users_file_path="exports/users.parquet")
+
+        assert spy.call_args.args[1]["id"].tolist() == ["u1", "u2"]
+
+    @pytest.mark.parametrize("name, value", [
+        ("PENALTY_WEIGHTS", [0.0, 0.1, 0.2, 0.3]),
+        ("SCORER_TOP_N", 50),
+        ("SCORER_USE_INDEX", True),
+        ("PIPELINE_OVERFETCH", True),
+    ])
+    def test_result_fingerprint_covers_result_settings(self, name, value):
+        from app.services.process_service import result_fingerprint, settings
+
+        before = result_fingerprint("catalog-v1", 10)
+        with patch.object(settings, name, value):
+            assert result_fingerprint("catalog-v1", 10) != before
+
+    def test_event_loop_stays_responsive_while_pipeline_runs(self):
+        """파이프라인이 실행되는 동안에도 이벤트 루프가 다른 코루틴을 처리한다."""
+        import asyncio
+        import threading
+
+        from app.schemas.request import ProcessRequest
+        from app.services.process_service import run_recommendation_process
+
+        release = threading.Event()
+
+        def blocking_compute(request, users_path, courses_path, previous=None):
+            assert release.wait(timeout=5)
+            return "results/key", 1
+
+        mock_storage = MagicMock()
+        mock_storage.download_files = MagicMock(side_effect=lambda targets: [p for _, p in targets])
+        request = ProcessRequest(
+            batch_id="batch_002",
+            users_file_path="exports/users.parquet",
+            courses_file_path="exports/courses.parquet",
+        )
+
+        async def scenario():
+            task = asyncio.create_task(run_recommendation_process(request))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            release.set()
+            await task
+            return ticks
+
+        with ThreadPoolExecutor(max_workers=1) as executor, \
+                patch("app.services.process_service.get_pipeline_executor", return_value=executor), \
+                patch("app.services.process_service.compute_recommendations", side_effect=blocking_compute), \
+                patch("app.services.process_service.StorageClient", return_value=mock_storage):
+            assert asyncio.run(scenario()) == 5
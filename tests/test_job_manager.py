@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.request import ProcessRequest
+from app.services.job_manager import Job, JobManager, JobState
+
+
+def _request(batch_id: str) -> ProcessRequest:
+    return ProcessRequest(
+        batch_id=batch_id,
+        users_file_path="exports/users.parquet",
+        courses_file_path="exports/courses.parquet",
+    )
+
+
+class GatedRunner:
+    """batch_id별로 release될 때까지 끝나지 않는 테스트용 runner."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    async def __call__(self, request: ProcessRequest, job: Job) -> None:
+        self.started.append(request.batch_id)
+        gate = self.gates.setdefault(request.batch_id, asyncio.Event())
+        await gate.wait()
+        if request.batch_id.startswith("fail"):
+            raise RuntimeError("boom")
+        job.succeed(f"results/{request.batch_id}")
+
+    def release(self, batch_id: str) -> None:
+        self.gates.setdefault(batch_id, asyncio.Event()).set()
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestJobManager:
+    def test_runs_at_most_max_concurrent_in_fifo_order(self):
+        async def scenario():
+            manager, runner = JobManager(max_concurrent=2), GatedRunner()
+            for batch_id in ["b1", "b2", "b3", "b4"]:
+                manager.submit(_request(batch_id), runner)
+            await _settle()
+            assert runner.started == ["b1", "b2"]
+            assert manager.get("b3").state == JobState.QUEUED
+            assert manager.queue_position("b4") == 2
+
+            runner.release("b2")
+            await _settle()
+            assert runner.started == ["b1", "b2", "b3"]
+            assert manager.get("b2").state == JobState.SUCCEEDED
+            assert manager.running_count == 2
+
+            for batch_id in ["b1", "b3", "b4"]:
+                runner.release(batch_id)
+            await _settle()
+            assert manager.running_count == 0
+            assert manager.get("b4").result_file_path == "results/b4"
+
+        asyncio.run(scenario())
+
+    def test_deduplicates_batch_id_until_failure(self):
+        async def scenario():
+            manager, runner = JobManager(max_concurrent=1), GatedRunner()
+            job, created = manager.submit(_request("fail-1"), runner)
+            duplicate, duplicate_created = manager.submit(_request("fail-1"), runner)
+            assert created and not duplicate_created
+            assert duplicate is job
+
+            runner.release("fail-1")
+            await _settle()
+            assert job.state == JobState.FAILED
+            assert "boom" in job.error_message
+
+            retry, retry_created = manager.submit(_request("fail-1"), runner)
+            assert retry_created and retry is not job
+            await _settle()
+            assert runner.started == ["fail-1", "fail-1"]
+
+        asyncio.run(scenario())
+
+    def test_continues_when_runner_leaves_finished_at_unset(self):
+        async def mark_succeeded_without_timestamp(request: ProcessRequest, job: Job) -> None:
+            job.state = JobState.SUCCEEDED
+
+        async def scenario():
+            manager = JobManager(max_concurrent=1)
+            manager.submit(_request("b1"), mark_succeeded_without_timestamp)
+            second, _ = manager.submit(_request("b2"), AsyncMock())
+            await _settle()
+            assert manager.running_count == 0
+            assert second.state == JobState.SUCCEEDED
+
+        asyncio.run(scenario())
+
+    def test_keeps_limited_history(self):
+        async def scenario():
+            manager = JobManager(max_concurrent=1, history_size=2)
+            runner = AsyncMock()
+            for batch_id in ["b1", "b2", "b3"]:
+                manager.submit(_request(batch_id), runner)
+                await _settle()
+            assert manager.get("b1") is None
+            assert manager.get("b3").state == JobState.SUCCEEDED
+
+        asyncio.run(scenario())
+
+
+class TestJobEndpoints:
+    @pytest.fixture
+    def client(self):
+        with patch("app.api.endpoints.engine.job_manager", JobManager(max_concurrent=1)), \
+                patch("app.api.endpoints.engine.run_recommendation_process", new_callable=AsyncMock) as run:
+            with TestClient(app) as client:
+                yield client, run
+
+    def test_duplicate_process_request_runs_once(self, client):
+        client, run = client
+        body = {
+            "batch_id": "batch_dup",
+            "users_file_path": "exports/users.parquet",
+            "courses_file_path": "exports/courses.parquet",
+        }
+
+        first = client.post("/engine/process", json=body)
+        second = client.post("/engine/process", json=body)
+
+        assert first.json()["status"] == "ACCEPTED"
+        assert second.status_code == 202
+        assert second.json()["status"] in {"RUNNING", "SUCCEEDED"}
+        assert run.await_count == 1
+
+        status = client.get("/engine/jobs/batch_dup").json()
+        assert status["state"] == "SUCCEEDED"
+        assert status["run_seconds"] >= 0
+
+    def test_unknown_job_returns_404(self, client):
+        client, _ = client
+
+        assert client.get("/engine/jobs/missing").status_code == 404
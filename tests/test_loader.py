@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import ExclusionFilter
+from app.core.lists import parse_list_literals
+from app.core.pipeline import RecommendationPipeline
+from app.core.scorer import TfidfScorer
+from app.infra.loader import USERS_REQUIRED_COLUMNS, DatasetLoader
+
+USER_LIST_COLUMNS = ["interest_tags", "purchased_course_ids", "created_course_ids"]
+
+
+@pytest.fixture
+def dataset_files(tmp_path: Path, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+    """Parquet/CSV 두 형식의 사용자·강의 파일."""
+    files = {}
+    for fmt in ("parquet", "csv"):
+        users_path = tmp_path / f"users.{fmt}"
+        courses_path = tmp_path / f"courses.{fmt}"
+        # 파이프라인이 쓰지 않는 프로필 컬럼
+        sample_users = sample_users.assign(bio="long profile text", email="user@example.com")
+        if fmt == "parquet":
+            sample_users.to_parquet(users_path)
+            sample_courses.to_parquet(courses_path)
+        else:
+            sample_users.to_csv(users_path, index=False)
+            sample_courses.to_csv(courses_path, index=False)
+        files[fmt] = (users_path, courses_path)
+    return files
+
+
+class TestArrowListLoading:
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_list_columns_are_arrow_backed(self, dataset_files, fmt: str):
+        users_path, courses_path = dataset_files[fmt]
+        loader = DatasetLoader(arrow_lists=True)
+
+        users = loader.load_users(users_path)
+        courses = loader.load_courses(courses_path)
+
+        for col in USER_LIST_COLUMNS:
+            assert isinstance(users[col].dtype, pd.ArrowDtype)
+        assert isinstance(courses["tags"].dtype, pd.ArrowDtype)
+        assert not isinstance(users["id"].dtype, pd.ArrowDtype)
+        assert list(users["interest_tags"].iloc[0]) == [1, 2, 3]
+
+    def test_empty_csv_list_column(self, tmp_path: Path, sample_users: pd.DataFrame):
+        path = tmp_path / "users.csv"
+        sample_users.assign(created_course_ids=None).to_csv(path, index=False)
+
+        users = DatasetLoader(arrow_lists=True).load_users(path)
+
+        assert isinstance(users["created_course_ids"].dtype, pd.ArrowDtype)
+
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_pipeline_output_matches_object_lists(self, dataset_files, fmt: str):
+        users_path, courses_path = dataset_files[fmt]
+
+        def run(loader: DatasetLoader) -> pd.DataFrame:
+            pipeline = RecommendationPipeline(
+                scorer=TfidfScorer(),
+                filter_=ExclusionFilter(),
+                adjuster=LevelWeightAdjuster(),
+            )
+            return pipeline.run(loader.load_users(users_path), loader.load_courses(courses_path), top_k=3)
+
+        expected = run(DatasetLoader())
+        result = run(DatasetLoader(arrow_lists=True, compact_dtypes=True))
+
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestColumnProjection:
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_reads_only_pipeline_columns(self, dataset_files, fmt: str):
+        users_path, _ = dataset_files[fmt]
+
+        users = DatasetLoader().load_users(users_path)
+
+        assert set(users.columns) == USERS_REQUIRED_COLUMNS
+
+    def test_missing_column_is_reported(self, tmp_path: Path, sample_courses: pd.DataFrame):
+        path = tmp_path / "courses.parquet"
+        sample_courses.drop(columns=["level"]).to_parquet(path)
+
+        with pytest.raises(ValueError, match="level"):
+            DatasetLoader().load_courses(path)
+
+
+class TestCompactDtypes:
+    @pytest.mark.parametrize("fmt", ["parquet", "csv"])
+    def test_ids_are_categorical_and_level_is_int8(self, dataset_files, fmt: str):
+        users_path, courses_path = dataset_files[fmt]
+        loader = DatasetLoader(compact_dtypes=True)
+
+        users = loader.load_users(users_path)
+        courses = loader.load_courses(courses_path)
+
+        for frame in (users, courses):
+            assert isinstance(frame["id"].dtype, pd.CategoricalDtype)
+            assert frame["level"].dtype == np.int8
+        assert users["id"].tolist() == ["user_001", "user_002", "user_003"]
+
+    def test_level_out_of_range(self, tmp_path: Path, sample_courses: pd.DataFrame):
+        path = tmp_path / "courses.parquet"
+        sample_courses.assign(level=300).to_parquet(path)
+
+        with pytest.raises(ValueError, match="int8"):
+            DatasetLoader(compact_dtypes=True).load_courses(path)
+
+
+class TestParseListLiterals:
+    def test_int_and_string_lists(self):
+        tags = parse_list_literals(pd.Series(["[1, 2, 3]", "[]", None, " [4,] "]))
+        ids = parse_list_literals(pd.Series(["['course_001', \"course_002\"]", "['a,b']"]))
+
+        assert tags.type == pa.list_(pa.int64())
+        assert tags.to_pylist() == [[1, 2, 3], [], None, [4]]
+        assert ids.type == pa.list_(pa.string())
+        assert ids.to_pylist() == [["course_001", "course_002"], ["a,b"]]
+
+    def test_malformed_rows_are_reported_together(self):
+        values = pd.Series(["[1]", "oops", "[2]", "[3", "[4]", "['x']"], index=[10, 11, 12, 13, 14, 15])
+
+        with pytest.raises(ValueError, match=r"3 malformed .*\[11, 13, 15\]"):
+            parse_list_literals(values)
+
+    def test_csv_matches_parquet_types(self, dataset_files):
+        loader = DatasetLoader(arrow_lists=True)
+
+        from_csv = loader.load_users(dataset_files["csv"][0])
+        from_parquet = loader.load_users(dataset_files["parquet"][0])
+
+        for col in ["interest_tags", "purchased_course_ids"]:
+            assert from_csv[col].dtype == from_parquet[col].dtype
+            assert from_csv[col].tolist() == from_parquet[col].tolist()
+
+    def test_loader_reports_column(self, tmp_path: Path, sample_courses: pd.DataFrame):
+        path = tmp_path / "courses.csv"
+        sample_courses.assign(tags=["[1, 2]", "[2,", "[4, 5]", "{1}", "[3]"]).to_csv(path, index=False)
+
+        with pytest.raises(ValueError, match=r"tags: 2 malformed .*\[1, 3\]"):
+            DatasetLoader().load_courses(path)
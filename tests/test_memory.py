@@ -0,0 +1,86 @@
+from functools import partial
+
+import pandas as pd
+
+from app.core import memory
+from app.core import pipeline as pipeline_module
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import ExclusionFilter
+from app.core.memory import ChunkSizer, estimate_bytes_per_user
+from app.core.pipeline import RecommendationPipeline
+from app.core.scorer import TfidfScorer
+from app.core.vectorizer import build_course_model
+
+
+def _courses(num_courses: int, tags_per_course: int, vocab: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": [f"c{i}" for i in range(num_courses)],
+        "tags": [[(i + j) % vocab for j in range(tags_per_course)] for i in range(num_courses)],
+        "level": 0,
+    })
+
+
+class TestEstimateBytesPerUser:
+    def test_grows_with_catalog_size(self, sample_users: pd.DataFrame):
+        small = estimate_bytes_per_user(sample_users, _courses(500, 3, 50))
+        large = estimate_bytes_per_user(sample_users, _courses(50_000, 3, 50))
+
+        assert large > small * 50
+
+    def test_grows_with_tag_density(self, sample_users: pd.DataFrame):
+        sparse = estimate_bytes_per_user(sample_users, _courses(1_000, 1, 1_000))
+        dense = estimate_bytes_per_user(sample_users, _courses(1_000, 8, 10))
+
+        assert dense > sparse
+
+
+class TestChunkSizer:
+    def test_plans_within_budget(self, monkeypatch, sample_users: pd.DataFrame):
+        monkeypatch.setattr(memory, "current_rss_bytes", lambda: 0)
+        courses = _courses(1_000, 3, 50)
+        per_user = estimate_bytes_per_user(sample_users, courses)
+
+        sizer = ChunkSizer(per_user * 5_000, min_chunk_size=10)
+
+        assert sizer.plan(sample_users, courses) == 5_000
+
+    def test_splits_budget_across_workers(self, monkeypatch, sample_users: pd.DataFrame):
+        monkeypatch.setattr(memory, "current_rss_bytes", lambda: 0)
+        courses = _courses(1_000, 3, 50)
+        per_user = estimate_bytes_per_user(sample_users, courses)
+
+        sizer = ChunkSizer(per_user * 8_000, workers=4, min_chunk_size=10)
+
+        assert sizer.plan(sample_users, courses) == 2_000
+
+    def test_shrinks_when_peak_exceeds_estimate(self, monkeypatch, sample_users: pd.DataFrame):
+        monkeypatch.setattr(memory, "current_rss_bytes", lambda: 0)
+        courses = _courses(1_000, 3, 50)
+        per_user = estimate_bytes_per_user(sample_users, courses)
+        sizer = ChunkSizer(per_user * 5_000, min_chunk_size=10)
+        sizer.plan(sample_users, courses)
+
+        assert sizer.observe(5_000, per_user * 5_000 * 2) == 2_500
+        assert sizer.observe(2_500, per_user * 2_500) == 2_500
+
+
+class TestPipelineWithMemoryBudget:
+    def test_small_budget_chunks_and_matches_unbounded(
+        self, monkeypatch, sample_users: pd.DataFrame, sample_courses: pd.DataFrame
+    ):
+        monkeypatch.setattr(pipeline_module, "ChunkSizer", partial(ChunkSizer, min_chunk_size=1))
+
+        course_model = build_course_model(sample_courses, "v1")
+
+        def pipeline(budget):
+            return RecommendationPipeline(
+                scorer=TfidfScorer(course_model=course_model),
+                filter_=ExclusionFilter(),
+                adjuster=LevelWeightAdjuster(),
+                memory_budget_bytes=budget,
+            )
+
+        expected = pipeline(None).run(sample_users, sample_courses, top_k=3).sort_values(["user_id", "rank"])
+        result = pipeline(1).run(sample_users, sample_courses, top_k=3).sort_values(["user_id", "rank"])
+
+        pd.testing.assert_frame_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
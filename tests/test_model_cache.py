@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.scorer import TfidfScorer
+from app.core.vectorizer import build_course_model
+from app.infra.model_cache import CourseModelCache, catalog_fingerprint
+
+
+class TestCourseModelCache:
+    def test_builds_once_and_reloads_from_disk(self, tmp_path: Path, sample_courses: pd.DataFrame):
+        cache = CourseModelCache(tmp_path, max_entries=2)
+        built = cache.get_or_build("v1", sample_courses)
+
+        fresh = CourseModelCache(tmp_path, max_entries=2)
+        loaded = fresh.get_or_build("v1", sample_courses.iloc[:0])
+
+        assert loaded.num_courses == len(sample_courses)
+        assert np.array_equal(loaded.vocabulary, built.vocabulary)
+        assert (loaded.course_matrix != built.course_matrix).nnz == 0
+
+    def test_evicts_least_recently_used(self, tmp_path: Path, sample_courses: pd.DataFrame):
+        cache = CourseModelCache(tmp_path, max_entries=2, memory_entries=0)
+        cache.get_or_build("v1", sample_courses)
+        cache.get_or_build("v2", sample_courses)
+        for path in tmp_path.glob("*_v1.npz"):
+            os.utime(path, (0, 0))
+        cache.get_or_build("v3", sample_courses)
+
+        cached = sorted(p.name for p in tmp_path.glob("*.npz"))
+        assert len(cached) == 2
+        assert not any(name.endswith("_v1.npz") for name in cached)
+
+    def test_fingerprint_follows_file_content(self, tmp_path: Path):
+        path = tmp_path / "courses.parquet"
+        path.write_bytes(b"catalog-1")
+        first = catalog_fingerprint(path)
+        path.write_bytes(b"catalog-2")
+
+        assert catalog_fingerprint(path) != first
+
+
+class TestScorerWithCourseModel:
+    def test_idf_is_independent_of_batch_users(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        scorer = TfidfScorer(course_model=build_course_model(sample_courses, "v1"))
+
+        full = scorer.score(sample_users, sample_courses)
+        single = scorer.score(sample_users.iloc[:1], sample_courses)
+
+        expected = full[full["user_id"] == "user_001"].reset_index(drop=True)
+        pd.testing.assert_frame_equal(single, expected)
+
+    def test_rejects_mismatched_catalog(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        scorer = TfidfScorer(course_model=build_course_model(sample_courses.iloc[:2], "v1"))
+
+        with pytest.raises(ValueError):
+            scorer.score(sample_users, sample_courses)
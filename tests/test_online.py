@@ -0,0 +1,367 @@
+import asyncio
+import json
+import shutil
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import ExclusionFilter
+from app.core.pipeline import RecommendationPipeline
+from app.core.scorer import TfidfScorer
+from app.exceptions.handlers import CatalogNotReadyError, ParsingError
+from app.main import app
+from app.schemas.request import RecommendRequest
+from app.services.bulk_service import (
+    BULK_USERS_SCHEMA,
+    MicroBatcher,
+    _ndjson_chunk,
+    profiles_from_arrow,
+    users_frame,
+)
+from app.services.online_service import CatalogSnapshot, OnlineRecommender, refresh_catalog
+
+
+@pytest.fixture
+def recommender(sample_courses: pd.DataFrame) -> OnlineRecommender:
+    recommender = OnlineRecommender()
+    recommender.load(CatalogSnapshot.build(sample_courses, "catalog-v1"))
+    return recommender
+
+
+def _request(user: pd.Series, top_k: int) -> RecommendRequest:
+    return RecommendRequest(
+        user_id=user["id"],
+        interest_tags=list(user["interest_tags"]),
+        level=int(user["level"]),
+        purchased_course_ids=list(user["purchased_course_ids"]),
+        created_course_ids=list(user["created_course_ids"]),
+        top_k=top_k,
+    )
+
+
+class TestOnlineRecommender:
+    def test_matches_batch_pipeline_scores(self, recommender, sample_users: pd.DataFrame, sample_courses):
+        """카탈로그 IDF를 공유하는 배치와 점수가 있는 추천이 같다 (채움 순서는 서로 다르므로 비교하지 않는다)."""
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(course_model=recommender.snapshot.course_model),
+            filter_=ExclusionFilter(),
+            adjuster=LevelWeightAdjuster(),
+        )
+        batch = pipeline.run(sample_users, sample_courses, top_k=3)
+
+        for _, user in sample_users.iterrows():
+            response = recommender.recommend(_request(user, top_k=3))
+            expected = batch[(batch["user_id"] == user["id"]) & (batch["score"] > 0)].sort_values("rank")
+            scored = [item for item in response.recommendations if item.score > 0]
+            assert [item.course_id for item in scored] == expected["course_id"].tolist()
+            assert [item.score for item in scored] == pytest.approx(expected["score"].tolist())
+
+    def test_fills_with_catalog_order_and_skips_excluded(self, recommender):
+        response = recommender.recommend(RecommendRequest(
+            interest_tags=[999], purchased_course_ids=["course_001"], top_k=2,
+        ))
+
+        assert [item.course_id for item in response.recommendations] == ["course_002", "course_003"]
+        assert [item.rank for item in response.recommendations] == [1, 2]
+        assert all(item.score == 0 for item in response.recommendations)
+
+    def test_excludes_string_ids_from_numeric_catalog(self, sample_courses: pd.DataFrame, sample_users: pd.DataFrame):
+        courses = sample_courses.assign(id=range(10, 10 + len(sample_courses)))
+        recommender = OnlineRecommender()
+        recommender.load(CatalogSnapshot.build(courses, "catalog-v1"))
+
+        response = recommender.recommend(RecommendRequest(
+            interest_tags=[999], purchased_course_ids=["10"], created_course_ids=["11"], top_k=2,
+        ))
+        users = users_frame(profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users.assign(
+            purchased_course_ids=[["10"], [], []], created_course_ids=[["11"], [], []],
+        )))))
+        ranked = recommender.recommend_many(users.iloc[:1], np.array([len(courses)]))
+
+        assert [item.course_id for item in response.recommendations] == ["12", "13"]
+        assert sorted(ranked.course_ids.tolist()) == ["12", "13", "14"]
+
+    def test_refresh_reloads_only_when_etag_changes(self, sample_courses: pd.DataFrame, tmp_path: Path):
+        courses_path = tmp_path / "courses.parquet"
+        sample_courses.to_parquet(courses_path, index=False)
+        storage = MagicMock()
+        storage.head_etag = MagicMock(return_value="etag-1")
+        storage.download_file = MagicMock(side_effect=lambda key, local_path: shutil.copy(courses_path, local_path))
+        recommender = OnlineRecommender()
+
+        async def scenario():
+            results = [await refresh_catalog(recommender, storage, "catalog/courses.parquet") for _ in range(2)]
+            storage.head_etag.return_value = "etag-2"
+            results.append(await refresh_catalog(recommender, storage, "catalog/courses.parquet"))
+            return results
+
+        with patch("app.services.online_service.course_model_cache", None):
+            assert asyncio.run(scenario()) == [True, False, True]
+        assert storage.download_file.call_count == 2
+        assert recommender.snapshot.etag == "etag-2"
+        assert recommender.snapshot.num_courses == len(sample_courses)
+
+
+class TestRecommendEndpoint:
+    def test_returns_503_until_catalog_loaded(self):
+        with patch("app.api.endpoints.engine.online_recommender", OnlineRecommender()):
+            response = TestClient(app).post("/engine/recommend", json={"interest_tags": [1, 2]})
+
+        assert response.status_code == 503
+        assert response.json()["error"] == "CATALOG_NOT_READY"
+
+    def test_rejects_level_outside_int8_range(self, recommender):
+        with patch("app.api.endpoints.engine.online_recommender", recommender):
+            response = TestClient(app).post("/engine/recommend", json={"interest_tags": [1, 2], "level": 128})
+
+        assert response.status_code == 422
+
+    def test_returns_recommendations(self, recommender):
+        with patch("app.api.endpoints.engine.online_recommender", recommender):
+            response = TestClient(app).post("/engine/recommend", json={
+                "user_id": "user_001", "interest_tags": [1, 2], "level": 1,
+                "purchased_course_ids": ["course_001"], "top_k": 2,
+            })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["catalog_version"] == "catalog-v1"
+        assert [item["rank"] for item in body["recommendations"]] == [1, 2]
+        assert "course_001" not in [item["course_id"] for item in body["recommendations"]]
+        assert np.all(np.diff([item["score"] for item in body["recommendations"]]) <= 0)
+
+
+def _bulk_users(sample_users: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(sample_users, preserve_index=False)
+
+
+def _ipc_bytes(table: pa.Table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class TestRecommendMany:
+    def test_matches_single_user_recommendations(self, recommender, sample_users: pd.DataFrame):
+        users = users_frame(profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users))))
+        top_k = np.array([2, 3, 5])
+
+        ranked = recommender.recommend_many(users, top_k)
+
+        for pos, (_, user) in enumerate(sample_users.iterrows()):
+            single = recommender.recommend(_request(user, top_k=int(top_k[pos])))
+            part = ranked.slice_users(pos, pos + 1)
+            assert part.course_ids.tolist() == [item.course_id for item in single.recommendations]
+            assert part.scores.tolist() == pytest.approx([item.score for item in single.recommendations])
+            assert part.ranks.tolist() == [item.rank for item in single.recommendations]
+
+
+class TestProfilesFromArrow:
+    def test_fills_missing_exclusion_columns(self):
+        table = pa.table({"id": ["u1"], "interest_tags": [[1, 2]], "level": pa.array([1], pa.int8())})
+
+        users = profiles_from_arrow(_ipc_bytes(table))
+
+        assert users.schema == BULK_USERS_SCHEMA
+        assert users["purchased_course_ids"].to_pylist() == [[]]
+
+    @pytest.mark.parametrize("body", [
+        b"not arrow",
+        _ipc_bytes(pa.table({"id": ["u1"], "interest_tags": [[1]]})),
+        _ipc_bytes(pa.table({"id": ["u1"], "interest_tags": [[1]], "level": [-1]})),
+        _ipc_bytes(pa.table({"id": ["u1"], "interest_tags": [[1]], "level": [200]})),
+    ])
+    def test_rejects_invalid_body(self, body):
+        with pytest.raises(ParsingError):
+            profiles_from_arrow(body)
+
+
+def _ndjson_lines(encoded: bytes) -> list[dict]:
+    return [json.loads(line) for line in encoded.decode().splitlines()]
+
+
+class TestMicroBatcher:
+    def test_coalesces_concurrent_requests(self, recommender, sample_users: pd.DataFrame):
+        batcher = MicroBatcher(recommender, max_wait_ms=50, max_batch_users=100)
+        users = profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users)))
+
+        async def collect(table, top_k):
+            return [encoded async for _, encoded in batcher.submit(table, top_k)]
+
+        async def scenario():
+            results = await asyncio.gather(collect(users.slice(0, 1), 2), collect(users.slice(1), 3))
+            await batcher.close()
+            return results
+
+        with patch.object(recommender, "recommend_many", wraps=recommender.recommend_many) as spy:
+            (first,), (second,) = asyncio.run(scenario())
+
+        assert spy.call_count == 1
+        assert spy.call_args.args[1].tolist() == [2, 3, 3]
+        assert [len(line["recommendations"]) for line in _ndjson_lines(first)] == [2]
+        assert [len(line["recommendations"]) for line in _ndjson_lines(second)] == [3, 3]
+
+    def test_splits_requests_larger_than_batch(self, recommender, sample_users: pd.DataFrame):
+        batcher = MicroBatcher(recommender, max_wait_ms=1, max_batch_users=2)
+        users = profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users)))
+
+        async def scenario():
+            chunks = [(table["id"].to_pylist(), encoded) async for table, encoded in batcher.submit(users, 1)]
+            await batcher.close()
+            return chunks
+
+        with patch.object(recommender, "recommend_many", wraps=recommender.recommend_many) as spy:
+            chunks = asyncio.run(scenario())
+
+        assert spy.call_count == 2
+        assert [ids for ids, _ in chunks] == [["user_001", "user_002"], ["user_003"]]
+        assert [[line["user_id"] for line in _ndjson_lines(encoded)] for _, encoded in chunks] == [
+            ["user_001", "user_002"], ["user_003"],
+        ]
+
+    def test_serializes_results_off_the_event_loop(self, recommender, sample_users: pd.DataFrame):
+        batcher = MicroBatcher(recommender, max_wait_ms=1, max_batch_users=10)
+        users = profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users)))
+        threads = []
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return _ndjson_chunk(*args)
+
+        async def scenario():
+            chunks = [encoded async for _, encoded in batcher.submit(users, 1)]
+            await batcher.close()
+            return threading.get_ident(), chunks
+
+        with patch("app.services.bulk_service._ndjson_chunk", side_effect=record_thread):
+            loop_thread, (encoded,) = asyncio.run(scenario())
+
+        assert len(_ndjson_lines(encoded)) == 3
+        assert threads and loop_thread not in threads
+
+    def test_failed_batch_only_fails_offending_request(self, recommender, sample_users: pd.DataFrame):
+        batcher = MicroBatcher(recommender, max_wait_ms=50, max_batch_users=100)
+        users = profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users)))
+        recommend_many = recommender.recommend_many
+
+        def fail_on_user_002(frame, top_k):
+            if "user_002" in frame["id"].tolist():
+                raise ValueError("bad profile")
+            return recommend_many(frame, top_k)
+
+        async def collect(table):
+            return [encoded async for _, encoded in batcher.submit(table, 2)]
+
+        async def scenario():
+            results = await asyncio.gather(collect(users.slice(0, 1)), collect(users.slice(1, 1)),
+                                           return_exceptions=True)
+            await batcher.close()
+            return results
+
+        with patch.object(recommender, "recommend_many", side_effect=fail_on_user_002):
+            (ok,), failed = asyncio.run(scenario())
+
+        assert [len(line["recommendations"]) for line in _ndjson_lines(ok)] == [2]
+        assert isinstance(failed, ValueError)
+
+    def test_propagates_errors_to_waiting_requests(self, sample_users: pd.DataFrame):
+        batcher = MicroBatcher(OnlineRecommender(), max_wait_ms=1, max_batch_users=10)
+        users = profiles_from_arrow(_ipc_bytes(_bulk_users(sample_users)))
+
+        async def scenario():
+            try:
+                return [encoded async for _, encoded in batcher.submit(users, 1)]
+            finally:
+                await batcher.close()
+
+        with pytest.raises(CatalogNotReadyError):
+            asyncio.run(scenario())
+
+
+class TestRecommendBulkEndpoint:
+    @staticmethod
+    def _post(recommender, **kwargs):
+        batcher = MicroBatcher(recommender, max_wait_ms=1, max_batch_users=2)
+        with patch("app.api.endpoints.engine.bulk_batcher", batcher):
+            return TestClient(app).post("/engine/recommend/bulk", **kwargs)
+
+    def test_streams_one_line_per_user_from_json(self, recommender):
+        response = self._post(recommender, params={"top_k": 2}, json={"users": [
+            {"user_id": "a", "interest_tags": [1, 2], "level": 1, "purchased_course_ids": ["course_001"]},
+            {"user_id": "b", "interest_tags": [4, 5]},
+            {"user_id": "c", "interest_tags": [999]},
+        ]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["user_id"] for line in lines] == ["a", "b", "c"]
+        assert all(len(line["recommendations"]) == 2 for line in lines)
+        assert all(line["catalog_version"] == "catalog-v1" for line in lines)
+        assert "course_001" not in [item["course_id"] for item in lines[0]["recommendations"]]
+
+    def test_accepts_arrow_ipc_body(self, recommender, sample_users: pd.DataFrame):
+        response = self._post(
+            recommender,
+            content=_ipc_bytes(_bulk_users(sample_users)),
+            headers={"content-type": "application/vnd.apache.arrow.stream"},
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["user_id"] for line in lines] == sample_users["id"].tolist()
+
+    def test_rejects_invalid_bodies(self, recommender):
+        assert self._post(recommender, json={"users": []}).status_code == 422
+        response = self._post(recommender, content=b"garbage",
+                              headers={"content-type": "application/vnd.apache.arrow.stream"})
+        assert response.status_code == 422
+        assert response.json()["error"] == "PARSING_ERROR"
+
+    def test_rejects_level_outside_int8_range(self, recommender):
+        response = self._post(recommender, json={"users": [{"user_id": "a", "level": 200}]})
+
+        assert response.status_code == 422
+
+    def test_returns_500_when_first_chunk_fails(self, recommender):
+        with patch.object(recommender, "recommend_many", side_effect=ValueError("boom")):
+            response = self._post(recommender, json={"users": [{"user_id": "a"}]})
+
+        assert response.status_code == 500
+        assert response.json()["error"] == "SCORING_ERROR"
+
+    def test_ends_stream_with_error_line_when_later_chunk_fails(self, recommender):
+        recommend_many = recommender.recommend_many
+        outcomes = iter([recommend_many, ValueError("boom")])
+
+        def first_chunk_only(frame, top_k):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome(frame, top_k)
+
+        with patch.object(recommender, "recommend_many", side_effect=first_chunk_only):
+            response = self._post(recommender, json={"users": [
+                {"user_id": "a", "interest_tags": [1]},
+                {"user_id": "b", "interest_tags": [2]},
+                {"user_id": "c", "interest_tags": [3]},
+            ]})
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["user_id"] for line in lines[:2]] == ["a", "b"]
+        assert lines[2]["error"] == "SCORING_ERROR"
+        assert lines[2]["user_ids"] == ["c"]
+
+    def test_returns_503_until_catalog_loaded(self):
+        response = self._post(OnlineRecommender(), json={"users": [{"user_id": "a"}]})
+
+        assert response.status_code == 503
@@ -0,0 +1,101 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+from app.core import pipeline as pipeline_module
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import ExclusionFilter
+from app.core.parallel import _trim_categories, courses_from_shared, share_courses
+from app.core.pipeline import RecommendationPipeline
+from app.core.scorer import TfidfScorer
+from app.core.vectorizer import build_course_model
+
+
+def _pipeline(workers: int, course_model=None) -> RecommendationPipeline:
+    return RecommendationPipeline(
+        scorer=TfidfScorer(course_model=course_model),
+        filter_=ExclusionFilter(),
+        adjuster=LevelWeightAdjuster(),
+        workers=workers,
+    )
+
+
+class TestSharedCourses:
+    def test_round_trip(self, sample_courses: pd.DataFrame):
+        model = build_course_model(sample_courses, "v1")
+        shared = share_courses(sample_courses, model)
+        try:
+            courses, restored = courses_from_shared(shared, "v1")
+
+            assert courses["id"].tolist() == sample_courses["id"].tolist()
+            assert [list(t) for t in courses["tags"]] == sample_courses["tags"].tolist()
+            assert courses["level"].tolist() == sample_courses["level"].tolist()
+            assert (restored.course_matrix != model.course_matrix).nnz == 0
+        finally:
+            shared.close()
+
+    @pytest.mark.parametrize("ids", [
+        pd.Series([101, 102, 103, 104, 105]),
+        pd.Series(["course_001", "course_002", "course_003", "course_004", "course_005"], dtype="category"),
+    ])
+    def test_round_trip_keeps_id_type(self, sample_courses: pd.DataFrame, ids: pd.Series):
+        courses = sample_courses.assign(id=ids)
+        shared = share_courses(courses, None)
+        try:
+            restored, _ = courses_from_shared(shared, None)
+
+            pd.testing.assert_series_equal(restored["id"], courses["id"])
+        finally:
+            shared.close()
+
+
+class TestTrimCategories:
+    def test_keeps_only_categories_used_by_chunk(self):
+        users = pd.DataFrame({
+            "id": pd.Series([f"user_{i:04d}" for i in range(1_000)], dtype="category"),
+            "level": range(1_000),
+        })
+        chunk = users.iloc[500:503]
+
+        trimmed = _trim_categories(chunk)
+
+        assert trimmed["id"].cat.categories.tolist() == ["user_0500", "user_0501", "user_0502"]
+        assert trimmed["id"].tolist() == chunk["id"].tolist()
+        assert trimmed["level"].tolist() == chunk["level"].tolist()
+        assert len(pickle.dumps(trimmed)) < len(pickle.dumps(chunk)) // 10
+
+    def test_keeps_missing_values(self):
+        chunk = pd.DataFrame({"id": pd.Categorical(["b", None, "c"], categories=["a", "b", "c", "d"])})
+
+        trimmed = _trim_categories(chunk)
+
+        assert trimmed["id"].cat.categories.tolist() == ["b", "c"]
+        assert trimmed["id"].tolist()[0] == "b" and pd.isna(trimmed["id"].tolist()[1])
+        assert trimmed["id"].tolist()[2] == "c"
+
+
+class TestParallelChunks:
+    @pytest.mark.parametrize("with_model", [False, True])
+    def test_matches_sequential(self, monkeypatch, sample_users: pd.DataFrame, sample_courses: pd.DataFrame, with_model):
+        monkeypatch.setattr(pipeline_module, "CHUNK_SIZE", 1)
+        model = build_course_model(sample_courses, "v1") if with_model else None
+
+        sequential = _pipeline(1, model).run(sample_users, sample_courses, top_k=3)
+        parallel = _pipeline(2, model).run(sample_users, sample_courses, top_k=3)
+
+        pd.testing.assert_frame_equal(parallel, sequential)
+
+    def test_keeps_integer_course_ids(self, monkeypatch, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        monkeypatch.setattr(pipeline_module, "CHUNK_SIZE", 1)
+        to_int = {f"course_{i:03d}": i for i in range(1, 6)}
+        courses = sample_courses.assign(id=sample_courses["id"].map(to_int))
+        users = sample_users.assign(
+            purchased_course_ids=sample_users["purchased_course_ids"].map(lambda ids: [to_int[i] for i in ids]),
+            created_course_ids=sample_users["created_course_ids"].map(lambda ids: [to_int[i] for i in ids]),
+        )
+
+        sequential = _pipeline(1).run(users, courses, top_k=3)
+        parallel = _pipeline(2).run(users, courses, top_k=3)
+
+        pd.testing.assert_frame_equal(parallel, sequential)
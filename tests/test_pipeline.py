@@ -1,11 +1,78 @@
+from unittest.mock import patch
+
+import numpy as np
 import pandas as pd
+import pytest
 
 from app.core.adjuster import LevelWeightAdjuster
 from app.core.filter import ExclusionFilter
-from app.core.pipeline import RecommendationPipeline
+from app.core.interfaces import BaseAdjuster, BaseFilter, BaseScorer
+from app.core.pipeline import RecommendationPipeline, first_open_slots, top_k_per_user
 from app.core.scorer import TfidfScorer
 
 
+class DropCourseFilter(BaseFilter):
+    """DataFrame API만 구현한 테스트용 필터."""
+
+    def __init__(self, course_id: str) -> None:
+        self._course_id = course_id
+
+    def apply(self, scores: pd.DataFrame, users: pd.DataFrame) -> pd.DataFrame:
+        return scores[scores["course_id"] != self._course_id].reset_index(drop=True)
+
+
+class DropCourseAdjuster(BaseAdjuster):
+    """DataFrame API만 구현하고 adjust()에서 강의 하나를 빼는 테스트용 보정기."""
+
+    def __init__(self, course_id: str) -> None:
+        self._course_id = course_id
+
+    def adjust(self, scores: pd.DataFrame, users: pd.DataFrame, courses: pd.DataFrame) -> pd.DataFrame:
+        return scores[scores["course_id"] != self._course_id].assign(score=lambda df: df["score"] / 2)
+
+
+class TestTopKPerUser:
+    def test_ranks_by_score_within_user(self):
+        user_idx = np.array([1, 0, 1, 0, 1])
+        course_idx = np.array([0, 1, 2, 3, 4])
+        scores = np.array([0.2, 0.5, 0.9, 0.7, 0.4])
+
+        u, c, s, rank = top_k_per_user(user_idx, course_idx, scores, top_k=2)
+
+        assert u.tolist() == [0, 0, 1, 1]
+        assert c.tolist() == [3, 1, 2, 4]
+        assert rank.tolist() == [1, 2, 1, 2]
+
+    def test_empty_input(self):
+        empty = np.array([], dtype=np.int64)
+        u, c, s, rank = top_k_per_user(empty, empty, np.array([]), top_k=3)
+
+        assert len(u) == len(c) == len(s) == len(rank) == 0
+
+
+class TestFirstOpenSlots:
+    def test_matches_brute_force_with_heavily_blocked_row(self):
+        rng = np.random.default_rng(0)
+        num_slots = 200
+        blocked = [rng.choice(num_slots, size, replace=False) for size in [0, 3, 150, 7, 0]]
+        need = np.array([2, 5, 10, 0, 3])
+
+        rows, slots, order = first_open_slots(
+            np.array([len(b) for b in blocked]), np.concatenate(blocked), need, num_slots,
+        )
+
+        for row, row_blocked in enumerate(blocked):
+            expected = [slot for slot in range(num_slots) if slot not in set(row_blocked)][:need[row]]
+            assert slots[rows == row].tolist() == expected
+            assert order[rows == row].tolist() == list(range(1, need[row] + 1))
+
+    def test_returns_fewer_slots_when_all_blocked(self):
+        rows, slots, order = first_open_slots(np.array([3]), np.array([2, 0, 1]), np.array([2]), 4)
+
+        assert slots.tolist() == [3]
+        assert order.tolist() == [1]
+
+
 class TestRecommendationPipeline:
     def test_pipeline_returns_expected_columns(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
         pipeline = RecommendationPipeline(
@@ -76,3 +143,164 @@ class TestRecommendationPipeline:
 
         user_recs = result[result["user_id"] == "u1"]
         assert len(user_recs) == 3
+
+    def test_dataframe_only_filter_is_supported(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(),
+            filter_=DropCourseFilter("course_004"),
+        )
+        result = pipeline.run(sample_users, sample_courses, top_k=2)
+
+        scored = result[result["score"] > 0]
+        assert "course_004" not in scored["course_id"].values
+
+    def test_adjust_arrays_marks_pairs_dropped_by_adjust(self):
+        users = pd.DataFrame([{"id": "u1"}])
+        courses = pd.DataFrame([{"id": "c1"}, {"id": "c2"}, {"id": "c3"}])
+
+        result = DropCourseAdjuster("c3").adjust_arrays(
+            np.array([0.8, 0.6, 0.4]), np.array([0, 0, 0]), np.array([0, 1, 2]), users, courses,
+        )
+
+        assert result[:2].tolist() == [0.4, 0.3]
+        assert np.isnan(result[2])
+
+    @pytest.mark.parametrize("overfetch, top_n", [(False, None), (True, None), (False, 2)])
+    def test_pairs_dropped_by_adjuster_are_not_ranked(
+        self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame, overfetch: bool, top_n: int | None,
+    ):
+        adjuster = DropCourseAdjuster("course_004")
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(top_n=top_n, rank_adjuster=adjuster if top_n else None),
+            filter_=ExclusionFilter(),
+            adjuster=adjuster,
+            overfetch=overfetch,
+        )
+        result = pipeline.run(sample_users, sample_courses, top_k=2)
+
+        scored = result[result["score"] > 0]
+        assert not scored.empty
+        assert "course_004" not in scored["course_id"].values
+        assert not result["score"].isna().any()
+
+    def test_fallback_orders_by_popularity_and_skips_excluded(self):
+        users = pd.DataFrame([
+            {"id": "u1", "interest_tags": [999], "level": 0,
+             "purchased_course_ids": ["c3"], "created_course_ids": ["c2"]},
+            {"id": "u2", "interest_tags": [998], "level": 0,
+             "purchased_course_ids": ["c3", "c1"], "created_course_ids": []},
+            {"id": "u3", "interest_tags": [997], "level": 0,
+             "purchased_course_ids": ["c3"], "created_course_ids": []},
+        ])
+        courses = pd.DataFrame([
+            {"id": "c1", "tags": [1], "level": 0},
+            {"id": "c2", "tags": [2], "level": 0},
+            {"id": "c3", "tags": [3], "level": 0},
+            {"id": "c4", "tags": [4], "level": 0},
+        ])
+
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(),
+            filter_=ExclusionFilter(),
+        )
+        result = pipeline.run(users, courses, top_k=2)
+
+        recs = result.sort_values(["user_id", "rank"]).groupby("user_id")["course_id"].apply(list).to_dict()
+        assert recs == {"u1": ["c1", "c4"], "u2": ["c2", "c4"], "u3": ["c1", "c2"]}
+
+    def test_fallback_continues_ranks_after_scored_courses(self):
+        users = pd.DataFrame([
+            {"id": "u1", "interest_tags": [1], "level": 0,
+             "purchased_course_ids": [], "created_course_ids": []},
+        ])
+        courses = pd.DataFrame([
+            {"id": "c1", "tags": [1], "level": 0},
+            {"id": "c2", "tags": [2], "level": 0},
+            {"id": "c3", "tags": [3], "level": 0},
+        ])
+
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(),
+            filter_=ExclusionFilter(),
+        )
+        result = pipeline.run(users, courses, top_k=3).sort_values("rank")
+
+        assert result["course_id"].tolist() == ["c1", "c2", "c3"]
+        assert result["rank"].tolist() == [1, 2, 3]
+
+
+def _random_batch(seed: int, num_users: int = 80, num_courses: int = 300, num_tags: int = 12):
+    rng = np.random.default_rng(seed)
+    course_ids = [f"c{i}" for i in range(num_courses)]
+    users = pd.DataFrame({
+        "id": [f"u{i}" for i in range(num_users)],
+        "interest_tags": [list(rng.choice(num_tags, rng.integers(1, 4), replace=False)) for _ in range(num_users)],
+        "level": rng.integers(0, 4, num_users),
+        "purchased_course_ids": [list(rng.choice(course_ids, rng.integers(0, 6), replace=False))
+                                 for _ in range(num_users)],
+        "created_course_ids": [[] for _ in range(num_users)],
+    })
+    courses = pd.DataFrame({
+        "id": course_ids,
+        "tags": [list(rng.choice(num_tags, rng.integers(1, 4), replace=False)) for _ in range(num_courses)],
+        "level": rng.integers(0, 4, num_courses),
+    })
+    return users, courses
+
+
+class TestRankAdjustedTopN:
+    @pytest.mark.parametrize("use_index", [False, True])
+    def test_top_n_matches_full_pipeline_scores(self, use_index):
+        users, courses = _random_batch(2)
+        adjuster = LevelWeightAdjuster([0.0, 0.5, 0.8, 0.95])
+
+        full = RecommendationPipeline(scorer=TfidfScorer(), filter_=ExclusionFilter(), adjuster=adjuster)
+        top_n = RecommendationPipeline(
+            scorer=TfidfScorer(top_n=5, block_size=16, use_index=use_index, rank_adjuster=adjuster),
+            filter_=ExclusionFilter(),
+            adjuster=adjuster,
+        )
+        expected = full.run(users, courses, top_k=5).sort_values(["user_id", "rank"])
+        result = top_n.run(users, courses, top_k=5).sort_values(["user_id", "rank"])
+
+        assert result["user_id"].tolist() == expected["user_id"].tolist()
+        np.testing.assert_allclose(result["score"].to_numpy(), expected["score"].to_numpy())
+
+
+class TestOverfetch:
+    def test_matches_full_pipeline_scores(self):
+        users, courses = _random_batch(0)
+        adjuster = LevelWeightAdjuster([0.0, 0.5, 0.8, 0.95])
+
+        full = RecommendationPipeline(scorer=TfidfScorer(), filter_=ExclusionFilter(), adjuster=adjuster)
+        overfetch = RecommendationPipeline(
+            scorer=TfidfScorer(block_size=16), filter_=ExclusionFilter(), adjuster=adjuster, overfetch=True
+        )
+        expected = full.run(users, courses, top_k=5).sort_values(["user_id", "rank"])
+        result = overfetch.run(users, courses, top_k=5).sort_values(["user_id", "rank"])
+
+        assert result["user_id"].tolist() == expected["user_id"].tolist()
+        np.testing.assert_allclose(result["score"].to_numpy(), expected["score"].to_numpy())
+
+    def test_filter_sees_only_the_window(self):
+        users, courses = _random_batch(1)
+        exclusion_filter = ExclusionFilter()
+        pipeline = RecommendationPipeline(
+            scorer=TfidfScorer(), filter_=exclusion_filter, adjuster=LevelWeightAdjuster(), overfetch=True
+        )
+
+        with patch.object(exclusion_filter, "mask", wraps=exclusion_filter.mask) as mask:
+            pipeline.run(users, courses, top_k=3)
+
+        first_round = len(mask.call_args_list[0].args[0])
+        window = 3 * len(users) + sum(len(c) for c in users["purchased_course_ids"])
+        assert first_round <= window
+        assert sum(len(call.args[0]) for call in mask.call_args_list) < len(users) * len(courses) / 4
+
+    def test_requires_candidate_scorer(self):
+        class PlainScorer(BaseScorer):
+            def score(self, users, courses):
+                return pd.DataFrame(columns=["user_id", "course_id", "score"])
+
+        with pytest.raises(ValueError, match="over-fetch"):
+            RecommendationPipeline(scorer=PlainScorer(), filter_=ExclusionFilter(), overfetch=True)
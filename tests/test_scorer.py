@@ -1,6 +1,14 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
 import pandas as pd
 
+from app.core.adjuster import LevelWeightAdjuster
+from app.core.filter import build_exclusion_matrix
+from app.core.index import TagIndex
 from app.core.scorer import TfidfScorer
+from app.core.vectorizer import build_course_model
 
 
 class TestTfidfScorer:
@@ -34,3 +42,88 @@ class TestTfidfScorer:
         result = scorer.score(users, courses)
 
         assert len(result) == 0
+
+    def test_top_n_limits_candidates_per_user(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        scorer = TfidfScorer(top_n=2, block_size=2)
+        result = scorer.score(sample_users, sample_courses)
+
+        counts = result.groupby("user_id").size()
+        assert (counts <= 2).all()
+        assert (result["score"] > 0).all()
+
+    def test_top_n_matches_exhaustive_top_scores(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        exhaustive = TfidfScorer().score(sample_users, sample_courses)
+        blocked = TfidfScorer(top_n=2, block_size=2).score(sample_users, sample_courses)
+
+        for user_id, group in blocked.groupby("user_id"):
+            expected = exhaustive.loc[exhaustive["user_id"] == user_id, "score"].nlargest(2).values
+            assert sorted(group["score"].values, reverse=True) == pytest.approx(expected)
+
+    def test_top_n_larger_than_catalog_returns_all_pairs(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        exhaustive = TfidfScorer().score(sample_users, sample_courses)
+        blocked = TfidfScorer(top_n=100).score(sample_users, sample_courses)
+
+        assert len(blocked) == len(exhaustive)
+
+    def test_top_n_skips_excluded_courses(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        exclusions = build_exclusion_matrix(sample_users, sample_courses["id"])
+        scorer = TfidfScorer(top_n=2)
+
+        user_idx, course_idx, _ = scorer.score_arrays(sample_users, sample_courses, exclusions=exclusions)
+
+        pairs = set(zip(user_idx.tolist(), course_idx.tolist()))
+        assert (0, 0) not in pairs
+        assert (1, 2) not in pairs
+        assert (user_idx == 0).sum() == 2
+
+    def test_index_mode_matches_top_n(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        exclusions = build_exclusion_matrix(sample_users, sample_courses["id"])
+        blocked = TfidfScorer(top_n=2).score_arrays(sample_users, sample_courses, exclusions=exclusions)
+        indexed = TfidfScorer(top_n=2, use_index=True).score_arrays(sample_users, sample_courses, exclusions=exclusions)
+
+        for user in range(len(sample_users)):
+            expected = np.sort(blocked[2][blocked[0] == user])
+            assert np.sort(indexed[2][indexed[0] == user]) == pytest.approx(expected)
+
+    def test_index_mode_reuses_course_model_index(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        model = build_course_model(sample_courses, "fp")
+        adjuster = LevelWeightAdjuster()
+        scorer = TfidfScorer(top_n=2, use_index=True, course_model=model, rank_adjuster=adjuster)
+
+        with patch.object(TagIndex, "build", wraps=TagIndex.build) as build:
+            first = scorer.score_arrays(sample_users, sample_courses)
+            index = model.index
+            second = scorer.score_arrays(sample_users, sample_courses)
+
+        assert build.call_count == 1
+        assert model.index is index
+        for a, b in zip(first, second):
+            np.testing.assert_array_equal(a, b)
+
+        user_idx, course_idx, scores = TfidfScorer(course_model=model).score_arrays(sample_users, sample_courses)
+        adjusted = adjuster.adjust_arrays(scores, user_idx, course_idx, sample_users, sample_courses)
+        for user in range(len(sample_users)):
+            expected = np.sort(adjusted[user_idx == user])[::-1][:2]
+            mine = first[0] == user
+            got = adjuster.adjust_arrays(first[2][mine], first[0][mine], first[1][mine], sample_users, sample_courses)
+            assert np.sort(got)[::-1] == pytest.approx(expected)
+
+    def test_score_candidates_uses_index(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        exclusions = build_exclusion_matrix(sample_users, sample_courses["id"])
+        limits = np.array([1, 0, 3])
+        dense = TfidfScorer(top_n=2).score_candidates(sample_users, sample_courses, limits, exclusions=exclusions)
+
+        with patch.object(TagIndex, "search", autospec=True, side_effect=TagIndex.search) as search:
+            indexed = TfidfScorer(top_n=2, use_index=True).score_candidates(
+                sample_users, sample_courses, limits, exclusions=exclusions,
+            )
+
+        assert search.call_count == 1
+        for user in range(len(sample_users)):
+            expected = np.sort(dense[2][dense[0] == user])
+            assert np.sort(indexed[2][indexed[0] == user]) == pytest.approx(expected)
+        assert not (indexed[0] == 1).any()
+
+    def test_index_mode_requires_top_n(self):
+        with pytest.raises(ValueError, match="top_n"):
+            TfidfScorer(use_index=True)
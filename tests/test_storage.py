@@ -0,0 +1,169 @@
+import io
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.config import Settings
+from app.exceptions.handlers import StorageError
+from app.infra import storage as storage_module
+from app.infra.retry import backoff_delay
+from app.infra.storage import StorageClient
+from app.infra.writer import ParquetResultWriter
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(
+        R2_ENDPOINT_URL="http://r2.local",
+        R2_ACCESS_KEY_ID="key",
+        R2_SECRET_ACCESS_KEY="secret",
+        STORAGE_MULTIPART_CHUNK_MB=16,
+        STORAGE_MAX_CONCURRENCY=4,
+    )
+
+
+def _client(settings: Settings, s3: MagicMock) -> StorageClient:
+    return StorageClient(settings, s3_client=s3)
+
+
+class TestBackoffDelay:
+    def test_grows_exponentially_up_to_cap(self):
+        with patch("app.infra.retry.random.uniform", side_effect=lambda low, high: high):
+            assert [backoff_delay(n, base=1.0, cap=5.0) for n in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+    def test_is_jittered(self):
+        delays = {backoff_delay(3, base=1.0, cap=10.0) for _ in range(20)}
+
+        assert len(delays) > 1
+        assert all(0.0 <= d <= 4.0 for d in delays)
+
+
+class TestStorageClient:
+    def test_download_uses_transfer_config(self, settings: Settings, tmp_path: Path):
+        s3 = MagicMock()
+        client = _client(settings, s3)
+
+        client.download_file("exports/users.parquet", tmp_path / "users.parquet")
+
+        config = s3.download_file.call_args.kwargs["Config"]
+        assert config.multipart_chunksize == 16 * 1024 * 1024
+        assert config.max_concurrency == 4
+
+    def test_download_files_runs_concurrently(self, settings: Settings, tmp_path: Path):
+        names = ["users", "courses", "previous_users", "previous_result"]
+        barrier = threading.Barrier(len(names), timeout=5)
+        s3 = MagicMock()
+        s3.download_file.side_effect = lambda *args, **kwargs: barrier.wait()
+        client = _client(settings, s3)
+
+        paths = client.download_files([(f"exports/{name}.parquet", tmp_path / f"{name}.parquet") for name in names])
+
+        assert paths == [tmp_path / f"{name}.parquet" for name in names]
+
+    def test_download_files_respects_file_concurrency_setting(self, settings: Settings, tmp_path: Path):
+        settings = settings.model_copy(update={"STORAGE_MAX_CONCURRENT_FILES": 1})
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def download(*args, **kwargs):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.01)
+            with lock:
+                active[0] -= 1
+
+        s3 = MagicMock()
+        s3.download_file.side_effect = download
+        client = _client(settings, s3)
+
+        client.download_files([(f"k{i}", tmp_path / f"f{i}") for i in range(3)])
+
+        assert peak[0] == 1
+
+    def test_retries_with_backoff_then_raises(self, settings: Settings, tmp_path: Path):
+        s3 = MagicMock()
+        s3.download_file.side_effect = ConnectionError("reset")
+        client = _client(settings, s3)
+
+        with patch.object(storage_module.time, "sleep") as sleep, \
+                patch.object(storage_module, "backoff_delay", side_effect=[0.1, 0.2]) as delay:
+            with pytest.raises(StorageError, match="reset"):
+                client.download_file("exports/users.parquet", tmp_path / "users.parquet")
+
+        assert s3.download_file.call_count == storage_module.MAX_RETRIES
+        assert [c.args[0] for c in delay.call_args_list] == [1, 2]
+        assert [c.args[0] for c in sleep.call_args_list] == [0.1, 0.2]
+
+
+class TestMultipartUploadStream:
+    def _s3(self) -> MagicMock:
+        s3 = MagicMock()
+        s3.create_multipart_upload.return_value = {"UploadId": "up-1"}
+        s3.upload_part.side_effect = lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+        return s3
+
+    def test_streams_fixed_size_parts_and_completes(self, settings: Settings):
+        s3 = self._s3()
+        client = _client(settings.model_copy(update={"STORAGE_MULTIPART_CHUNK_MB": 5}), s3)
+        part_size = 5 * 1024 * 1024
+
+        with client.open_upload("results/out.parquet") as upload:
+            upload.write(b"a" * (part_size - 1))
+            assert s3.upload_part.call_count == 0
+            upload.write(b"b" * (part_size + 10))
+            assert s3.upload_part.call_count == 2
+
+        bodies = [c.kwargs["Body"] for c in s3.upload_part.call_args_list]
+        assert [len(b) for b in bodies] == [part_size, part_size, 9]
+        parts = s3.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+        assert parts == [{"PartNumber": n, "ETag": f"etag-{n}"} for n in (1, 2, 3)]
+        s3.abort_multipart_upload.assert_not_called()
+
+    def test_aborts_on_failure(self, settings: Settings):
+        s3 = self._s3()
+        client = _client(settings, s3)
+
+        with pytest.raises(RuntimeError):
+            with client.open_upload("results/out.parquet") as upload:
+                upload.write(b"partial")
+                raise RuntimeError("pipeline failed")
+
+        s3.abort_multipart_upload.assert_called_once_with(
+            Bucket=settings.R2_BUCKET_NAME, Key="results/out.parquet", UploadId="up-1"
+        )
+        s3.complete_multipart_upload.assert_not_called()
+
+    def test_parquet_writer_streams_into_upload(self, settings: Settings):
+        s3 = self._s3()
+        client = _client(settings, s3)
+        chunk = pd.DataFrame({"user_id": ["u1"], "course_id": ["c1"], "score": [0.5], "rank": [1]})
+
+        with client.open_upload("results/out.parquet") as upload, ParquetResultWriter(upload) as writer:
+            writer.write(chunk)
+
+        body = b"".join(c.kwargs["Body"] for c in s3.upload_part.call_args_list)
+        pd.testing.assert_frame_equal(pd.read_parquet(io.BytesIO(body)), chunk)
+
+
+class TestSharedS3Client:
+    def test_clients_share_one_s3_client(self, settings: Settings):
+        try:
+            first = StorageClient(settings)
+            second = StorageClient(settings)
+
+            assert first._client is second._client
+            assert first._client.meta.config.max_pool_connections == settings.STORAGE_MAX_POOL_CONNECTIONS
+        finally:
+            storage_module.close_s3_client()
+
+    def test_preconnect_failure_is_not_fatal(self, settings: Settings):
+        s3 = MagicMock()
+        s3.head_bucket.side_effect = ConnectionError("refused")
+
+        with patch.object(storage_module, "open_s3_client", return_value=s3):
+            storage_module.preconnect(settings)
+
+        s3.head_bucket.assert_called_once_with(Bucket=settings.R2_BUCKET_NAME)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.core.vectorizer import TagTfidfVectorizer
+
+
+def _sklearn_dense(*tag_columns: pd.Series) -> np.ndarray:
+    """태그를 문자열로 바꿔 sklearn TfidfVectorizer로 계산한 dense 행렬 (열은 태그 ID 순)."""
+    docs = pd.concat(tag_columns, ignore_index=True).apply(
+        lambda tags: " ".join(f"tag_{t}" for t in tags) if isinstance(tags, (list, np.ndarray)) else ""
+    )
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(docs).toarray()
+    order = np.argsort([int(term[len("tag_"):]) for term in vectorizer.get_feature_names_out()])
+    return matrix[:, order]
+
+
+class TestTagTfidfVectorizer:
+    def test_matches_sklearn(self, sample_users: pd.DataFrame, sample_courses: pd.DataFrame):
+        user_vectors, course_vectors = TagTfidfVectorizer().fit_transform(
+            sample_users["interest_tags"], sample_courses["tags"]
+        )
+
+        expected = _sklearn_dense(sample_users["interest_tags"], sample_courses["tags"])
+        actual = np.vstack([user_vectors.toarray(), course_vectors.toarray()])
+        assert actual == pytest.approx(expected, abs=1e-12)
+
+    def test_counts_duplicates_and_handles_empty_rows(self):
+        tags = pd.Series([[1, 1, 2], [], None, [2, 30]], dtype=object)
+
+        (matrix,) = TagTfidfVectorizer().fit_transform(tags)
+
+        expected = _sklearn_dense(tags)
+        assert matrix.toarray() == pytest.approx(expected, abs=1e-12)
+        assert matrix[1].nnz == 0 and matrix[2].nnz == 0
+
+    def test_transform_ignores_unseen_tags(self):
+        vectorizer = TagTfidfVectorizer().fit(pd.Series([[1, 2], [2, 3]]))
+
+        matrix = vectorizer.transform(pd.Series([[3, 99], [99]]))
+
+        assert matrix.shape == (2, 3)
+        assert matrix[0].nnz == 1
+        assert matrix[1].nnz == 0
+
+    def test_transform_requires_fit(self):
+        with pytest.raises(ValueError):
+            TagTfidfVectorizer().transform(pd.Series([[1]]))
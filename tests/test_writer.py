@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from app.infra.writer import ParquetResultWriter, iter_result_row_groups, read_result_metadata
+
+
+def _chunk(user_id: str, courses: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "user_id": user_id,
+        "course_id": courses,
+        "score": [0.5] * len(courses),
+        "rank": list(range(1, len(courses) + 1)),
+    })
+
+
+class TestParquetResultWriter:
+    def test_each_chunk_becomes_a_row_group(self, tmp_path: Path):
+        path = tmp_path / "recommendations.parquet"
+        with ParquetResultWriter(path) as writer:
+            writer.write(_chunk("u1", ["c1", "c2"]))
+            writer.write(_chunk("u2", ["c3"]))
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 2
+        assert writer.row_count == 3
+        assert writer.user_count == 2
+
+        result = pd.read_parquet(path)
+        assert result["course_id"].tolist() == ["c1", "c2", "c3"]
+        assert result["rank"].tolist() == [1, 2, 1]
+
+    def test_empty_result_still_writes_schema(self, tmp_path: Path):
+        path = tmp_path / "recommendations.parquet"
+        with ParquetResultWriter(path) as writer:
+            writer.write(_chunk("u1", []))
+
+        result = pd.read_parquet(path)
+        assert list(result.columns) == ["user_id", "course_id", "score", "rank"]
+        assert result.empty
+
+    def test_keeps_integer_and_categorical_ids(self, tmp_path: Path):
+        path = tmp_path / "recommendations.parquet"
+        first = pd.DataFrame({"user_id": [1, 1], "course_id": [10, 20], "score": [0.5, 0.4], "rank": [1, 2]})
+        second = first.assign(user_id=2, course_id=pd.Categorical([30, 40]))
+        with ParquetResultWriter(path, metadata={"lxp.result_fingerprint": "abc"}) as writer:
+            writer.write(first)
+            writer.write(second)
+
+        result = pd.read_parquet(path)
+        assert result["user_id"].tolist() == [1, 1, 2, 2]
+        assert result["course_id"].tolist() == [10, 20, 30, 40]
+        assert result["course_id"].dtype == np.int64
+        assert read_result_metadata(path)["lxp.result_fingerprint"] == "abc"
+
+    def test_metadata_and_filtered_row_groups(self, tmp_path: Path):
+        path = tmp_path / "recommendations.parquet"
+        with ParquetResultWriter(path, metadata={"lxp.result_fingerprint": "abc"}) as writer:
+            writer.write(_chunk("u1", ["c1", "c2"]))
+            writer.write(_chunk("u2", ["c3"]))
+            writer.write(_chunk("u3", ["c4"]))
+
+        assert read_result_metadata(path)["lxp.result_fingerprint"] == "abc"
+        chunks = list(iter_result_row_groups(path, np.array(["u1", "u3"], dtype=object)))
+        assert [chunk["user_id"].tolist() for chunk in chunks] == [["u1", "u1"], ["u3"]]
+
+    def test_filters_row_groups_with_integer_user_ids(self, tmp_path: Path):
+        path = tmp_path / "recommendations.parquet"
+        with ParquetResultWriter(path) as writer:
+            for user_id in [1, 2, 3]:
+                writer.write(pd.DataFrame({"user_id": [user_id], "course_id": [10], "score": [0.5], "rank": [1]}))
+
+        chunks = list(iter_result_row_groups(path, np.array([1, 3], dtype=object)))
+
+        assert [chunk["user_id"].tolist() for chunk in chunks] == [[1], [3]]